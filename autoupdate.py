@@ -4,6 +4,7 @@ import time
 import shutil
 import requests
 import threading
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk, messagebox
 from pathlib import Path
@@ -391,4 +392,6 @@ def main():
         sys.exit(0)
 
 if __name__ == "__main__":
+    # Required for the detector worker process in frozen builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# async_runtime.py - asyncio Runtime for the Fishing Bot
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from launcher_logging import get_logger
+
+
+class AsyncBotRuntime:
+    """
+    Runs FiveMFishingBot's capture/detect cycle as asyncio tasks.
+
+    The event loop lives on its own thread (Tk keeps the main thread).
+    Blocking work — window capture and BotCore.step — is offloaded to a
+    small executor, and every wait is a deadline on the loop, so stop()
+    cancels the tasks immediately instead of waiting out a sleep. Capture
+    and the window check both use window_manager.fivem_window, so they
+    never run at the same time. Neither start() nor stop() blocks the
+    caller; a runtime that fails to start or crashes is reported through
+    `on_error` (the bot posts it to the GUI bus).
+    """
+
+    WINDOW_CHECK_INTERVAL = 0.5
+
+    def __init__(self, bot, max_workers: int = 2, on_error: Optional[Callable[[str], None]] = None):
+        self.bot = bot
+        self.max_workers = max_workers
+        self.on_error = on_error
+        self.window_lock: Optional[asyncio.Lock] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.tasks = []
+        self.stop_requested_at = None
+        self.stopped_at = None
+        self.idle = threading.Event()
+        self.idle.set()
+        self.lock = threading.Lock()
+        self.restart_pending = False
+        self.logger = get_logger('async_runtime')
+
+    @property
+    def running(self) -> bool:
+        return not self.idle.is_set()
+
+    def start(self) -> None:
+        """
+        Start the event loop thread and the bot tasks; returns immediately.
+
+        If a previous run is still winding down after stop(), the exiting
+        thread starts the new run itself, so a quick stop/start never ends
+        up stopped and the caller (the Tk thread) never waits.
+        """
+        with self.lock:
+            if self.running:
+                if self.stop_requested_at is not None:
+                    self.restart_pending = True
+                return
+            error = self._start_locked()
+        if error is not None:
+            self._report_failure(error)
+
+    def _start_locked(self) -> Optional[Exception]:
+        """Spawn the loop thread (lock held); returns the error if it could not start"""
+        self.idle.clear()
+        self.restart_pending = False
+        self.stop_requested_at = None
+        self.stopped_at = None
+        self.thread = threading.Thread(target=self._thread_main, name="AsyncBotRuntime", daemon=True)
+        try:
+            self.thread.start()
+        except RuntimeError as e:
+            self.idle.set()
+            return e
+        return None
+
+    def _report_failure(self, error: Exception) -> None:
+        self.logger.error('runtime_failed', "🚨 asyncio runtime failed: %s", error, error=str(error))
+        if self.on_error is not None:
+            self.on_error(f"Bot runtime failed: {error}")
+
+    def stop(self) -> None:
+        """Cancel all bot tasks; returns without waiting"""
+        with self.lock:
+            self.restart_pending = False
+        self.stop_requested_at = time.perf_counter()
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._cancel_tasks)
+            except RuntimeError:
+                pass
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        return self.idle.wait(timeout)
+
+    @property
+    def stop_latency(self) -> Optional[float]:
+        """Seconds between stop() and all tasks being finished"""
+        if self.stop_requested_at is None or self.stopped_at is None:
+            return None
+        return self.stopped_at - self.stop_requested_at
+
+    def _thread_main(self) -> None:
+        failure = None
+        try:
+            self.loop = asyncio.new_event_loop()
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bot-async")
+            self.loop.run_until_complete(self._main())
+        except Exception as e:
+            failure = e
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.executor = None
+            if self.loop is not None:
+                self.loop.close()
+                self.loop = None
+            with self.lock:
+                self.idle.set()
+                if failure is None and self.restart_pending and self.bot.is_running:
+                    failure = self._start_locked()
+        if failure is not None:
+            self._report_failure(failure)
+
+    async def _main(self) -> None:
+        self.window_lock = asyncio.Lock()
+        self.tasks = [
+            asyncio.ensure_future(self._frame_task()),
+            asyncio.ensure_future(self._window_task()),
+        ]
+        try:
+            await asyncio.gather(*self.tasks)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for task in self.tasks:
+                task.cancel()
+            self.stopped_at = time.perf_counter()
+
+    def _cancel_tasks(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+
+    async def _offload(self, func, *args) -> Any:
+        return await self.loop.run_in_executor(self.executor, func, *args)
+
+    async def _frame_task(self) -> None:
+        """Capture a frame, step the core, then wait for the next deadline"""
+        bot = self.bot
+        bot.core.reset()
+        self.logger.info('loop_started', "🤖 Bot Started (asyncio runtime) - Initializing intelligent detection...",
+                         runtime='asyncio')
+
+        while bot.is_running:
+            deadline = self.loop.time()
+            try:
+                async with self.window_lock:
+                    screen = await self._offload(bot.get_current_screen)
+                if screen is None:
+                    delay = max(bot.capture_backoff, bot.NO_SCREEN_DELAY)
+                else:
+                    delay = max(await self._offload(bot.core.step, screen), bot.capture_backoff)
+                    bot.publish_stats()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.exception('loop_error', "🚨 Bot error: %s", e)
+                delay = 1.0
+
+            await asyncio.sleep(max(0.0, deadline + delay - self.loop.time()))
+        self._cancel_tasks()
+
+    async def _window_task(self) -> None:
+        """Watch the FiveM window and end the runtime if it is lost"""
+        bot = self.bot
+        while bot.is_running:
+            # Serialized with capture: both touch window_manager.fivem_window
+            async with self.window_lock:
+                delay = await self._offload(bot._validate_fivem_connection)
+            if delay is None:
+                break
+            await asyncio.sleep(self.WINDOW_CHECK_INTERVAL)
+        self._cancel_tasks()
+
+
+def benchmark_runtimes(bot, run_seconds: float = 5.0) -> Dict[str, Dict[str, float]]:
+    """
+    Run the threaded loop and the asyncio runtime for `run_seconds` each
+    and measure stop-to-idle latency and process CPU usage.
+
+    The bot must already be able to start (window and templates found).
+    """
+    results = {}
+
+    # Threaded loop
+    bot.is_running = True
+    thread = threading.Thread(target=bot.bot_loop, daemon=True)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    thread.start()
+    time.sleep(run_seconds)
+    cpu_used, wall_used = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    stop_at = time.perf_counter()
+    bot.is_running = False
+    thread.join()
+    results['thread'] = {
+        'stop_latency': time.perf_counter() - stop_at,
+        'cpu_percent': 100.0 * cpu_used / wall_used,
+    }
+
+    # asyncio runtime
+    runtime = AsyncBotRuntime(bot)
+    bot.is_running = True
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    runtime.start()
+    time.sleep(run_seconds)
+    cpu_used, wall_used = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    bot.is_running = False
+    runtime.stop()
+    runtime.wait_idle()
+    results['asyncio'] = {
+        'stop_latency': runtime.stop_latency or 0.0,
+        'cpu_percent': 100.0 * cpu_used / wall_used,
+    }
+    return results
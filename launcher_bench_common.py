@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# bench_common.py - Helpers Shared by the Benchmark, Evaluation and Tuning Harnesses
+import math
+import os
+import platform
+from concurrent.futures import Future
+from typing import Any, Dict, Sequence
+
+
+class InlineExecutor:
+    """Runs submitted work immediately on the calling thread (no pool)"""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        pass
+
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, float]:
+    """fps, mean, p50 and p99 (ms) of per-frame durations in seconds"""
+    if not samples:
+        return {'count': 0, 'fps': 0.0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0}
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, math.ceil(p / 100.0 * len(ordered)) - 1))
+        return ordered[index]
+
+    total = sum(ordered)
+    return {
+        'count': len(ordered),
+        'fps': len(ordered) / total if total > 0 else 0.0,
+        'mean_ms': 1000.0 * total / len(ordered),
+        'p50_ms': 1000.0 * percentile(50),
+        'p99_ms': 1000.0 * percentile(99),
+    }
+
+
+def machine_info() -> Dict[str, Any]:
+    try:
+        import cv2
+        cv2_version = cv2.__version__
+        cv2_threads = cv2.getNumThreads()
+    except Exception:
+        cv2_version, cv2_threads = None, None
+    return {
+        'node': platform.node(),
+        'system': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'opencv': cv2_version,
+        'opencv_threads': cv2_threads,
+    }
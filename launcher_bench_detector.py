@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# bench_detector.py - Detection Hot Path Benchmark Suite
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# ⏱️ FiveM Fishing Bot - Synthetic Detector Benchmark
+# Description: Times auto_detect_minigame_area and detect_key_sequence on synthetic
+#              frames per resolution, condition, engine and execution backend
+# Usage: python launcher_bench_detector.py [--frames 20] [--out bench_detector.json]
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from launcher_bench_common import InlineExecutor, latency_summary, machine_info
+from launcher_key_detector import KeyDetector
+from launcher_synthetic_frames import CONDITIONS, RESOLUTIONS, FrameRenderer, area_covers
+
+ENGINES = ('inprocess', 'process')
+EXECUTORS = ('pool', 'inline')
+
+
+def build_detector(engine: str, executor: str, templates: Dict[str, Any]):
+    """Returns (detector, close) for one engine/backend combination"""
+    if engine == 'process':
+        from launcher_detector_process import RemoteKeyDetector
+        detector = RemoteKeyDetector(templates)
+        return detector, detector.close
+
+    pool = ThreadPoolExecutor(max_workers=4) if executor == 'pool' else InlineExecutor()
+    detector = KeyDetector(templates, executor=pool)
+    return detector, lambda: pool.shutdown(wait=False)
+
+
+def _padded(area, width: int, height: int, margin: int = 10):
+    x, y, w, h = area
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    return (x0, y0, min(width - x0, w + 2 * margin), min(height - y0, h + 2 * margin))
+
+
+def run_case(detector, renderer: FrameRenderer, width: int, height: int, condition,
+             frames: int, clock: Callable[[], float] = time.perf_counter,
+             keep_samples: bool = False) -> Dict[str, Any]:
+    """Time acquisition and sequence reads on `frames` freshly rendered frames
+
+    With `keep_samples` each stage also carries its raw per-frame durations
+    (seconds) under 'samples', for statistical comparisons.
+    """
+    acquire_times: List[float] = []
+    sequence_times: List[float] = []
+    acquired = 0
+    exact = 0
+    keys_right = 0
+    keys_total = 0
+
+    for _ in range(frames):
+        sample = renderer.render(width, height, condition)
+
+        detector.key_sequence_area = None
+        start = clock()
+        found = detector.auto_detect_minigame_area(sample.image)
+        acquire_times.append(clock() - start)
+
+        area = detector.get_detection_area() if found else None
+        if area_covers(area, sample.area):
+            acquired += 1
+        else:
+            # Measure sequence reads on the true area so the two stages are independent
+            area = _padded(sample.area, width, height)
+        detector.key_sequence_area = area
+
+        start = clock()
+        sequence = detector.detect_key_sequence(sample.image)
+        sequence_times.append(clock() - start)
+
+        exact += sequence == sample.sequence
+        keys_total += len(sample.sequence)
+        keys_right += sum(a == b for a, b in zip(sequence, sample.sequence))
+
+    result = {
+        'acquire': dict(latency_summary(acquire_times), accuracy=acquired / frames if frames else 0.0),
+        'sequence': dict(latency_summary(sequence_times),
+                         accuracy=exact / frames if frames else 0.0,
+                         key_accuracy=keys_right / keys_total if keys_total else 0.0),
+    }
+    if keep_samples:
+        result['acquire']['samples'] = acquire_times
+        result['sequence']['samples'] = sequence_times
+    return result
+
+
+def run_suite(templates: Dict[str, Any], resolutions: Sequence[str], conditions: Sequence[str],
+              engines: Sequence[str] = ENGINES, executors: Sequence[str] = EXECUTORS,
+              frames: int = 20, seed: int = 1234,
+              progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    results = []
+    for engine in engines:
+        for executor in (executors if engine == 'inprocess' else ('worker',)):
+            detector, close = build_detector(engine, executor, templates)
+            try:
+                for resolution in resolutions:
+                    width, height = RESOLUTIONS[resolution]
+                    for condition_name in conditions:
+                        # Same seed per case: every engine sees identical frames
+                        renderer = FrameRenderer(templates, seed=seed)
+                        stats = run_case(detector, renderer, width, height,
+                                         CONDITIONS[condition_name], frames)
+                        results.append({
+                            'engine': engine,
+                            'executor': executor,
+                            'resolution': resolution,
+                            'condition': condition_name,
+                            **stats,
+                        })
+                        if progress:
+                            progress(f"{engine:>9}/{executor:<6} {resolution:>5} {condition_name:<12} "
+                                     f"acquire p50 {stats['acquire']['p50_ms']:7.2f}ms "
+                                     f"({100 * stats['acquire']['accuracy']:3.0f}%)  "
+                                     f"sequence p50 {stats['sequence']['p50_ms']:6.2f}ms "
+                                     f"({100 * stats['sequence']['accuracy']:3.0f}%)")
+            finally:
+                close()
+
+    return {
+        'benchmark': 'detector',
+        'generated_at': time.time(),
+        'machine': machine_info(),
+        'parameters': {'frames': frames, 'seed': seed, 'resolutions': list(resolutions),
+                       'conditions': list(conditions)},
+        'results': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the key detector on synthetic frames")
+    parser.add_argument('--frames', type=int, default=20, help="frames per case")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--resolutions', nargs='+', default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument('--conditions', nargs='+', default=list(CONDITIONS), choices=list(CONDITIONS))
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--executors', nargs='+', default=list(EXECUTORS), choices=list(EXECUTORS))
+    parser.add_argument('--out', default='bench_detector.json', help="JSON results file")
+    args = parser.parse_args(argv)
+
+    from launcher_template_manager import TemplateManager
+    manager = TemplateManager()
+    if not manager.auto_load_templates():
+        print("Templates (assets/W.png, A.png, S.png, D.png) not found", file=sys.stderr)
+        return 1
+
+    report = run_suite(manager.get_templates(), args.resolutions, args.conditions,
+                       args.engines, args.executors, args.frames, args.seed, progress=print)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+# bench_primitives.py - Detector Post-Processing Micro-Benchmarks
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 🔬 FiveM Fishing Bot - Primitive Benchmarks
+# Description: Times _apply_nms, _calculate_iou, _intelligent_filter and the per-frame
+#              sequence comparison against alternative implementations, in ns per
+#              candidate, on seeded random candidates from 10 to 100k
+# Usage: python launcher_bench_primitives.py [--counts 10 100 1000] [--out bench.json]
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from launcher_config import BotConfig
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+COUNTS = (10, 100, 1000, 10000, 100000)
+CLUSTERS = 20               # Distinct glyph positions the hits gather around
+KEYS = ('W', 'A', 'S', 'D')
+
+
+# ─── Seeded candidates ─────────────────────────────────────────────────────────────────
+
+def make_matches(count: int, seed: int = 0, clusters: int = CLUSTERS) -> List[Tuple]:
+    """
+    Template-match hits as produced by _match_template_multiscale:
+    (x, y, w, h, confidence, scale), a few pixels around each glyph position.
+    """
+    rng = random.Random(seed)
+    centers = [(rng.randint(0, 1800), rng.randint(0, 1000), rng.choice((0.8, 1.0, 1.2)))
+               for _ in range(min(count, clusters))]
+    matches = []
+    for i in range(count):
+        cx, cy, scale = centers[i % len(centers)]
+        size = int(48 * scale)
+        matches.append((cx + rng.randint(-3, 3), cy + rng.randint(-3, 3), size, size,
+                        rng.uniform(0.7, 1.0), scale))
+    return matches
+
+
+def make_detections(count: int, seed: int = 0, clusters: int = CLUSTERS) -> List[Dict[str, Any]]:
+    """Per-key hits as produced by _detect_single_key, sorted by x like detect_key_sequence"""
+    rng = random.Random(seed)
+    spacing = BotConfig.MIN_DISTANCE * 2
+    slots = [(i * spacing, rng.choice(KEYS)) for i in range(min(count, clusters))]
+    detections = []
+    for i in range(count):
+        x, key = slots[i % len(slots)]
+        detections.append({'key': key, 'x': x + rng.randint(-3, 3), 'y': rng.randint(0, 6),
+                           'confidence': rng.uniform(0.7, 1.0), 'scale': 1.0, 'width': 48, 'height': 48})
+    detections.sort(key=lambda k: k['x'])
+    return detections
+
+
+# ─── Alternative implementations ───────────────────────────────────────────────────────
+
+def iou_inline(box1, box2) -> float:
+    """_calculate_iou with the same arithmetic and no slicing"""
+    x1, y1, w1, h1 = box1[0], box1[1], box1[2], box1[3]
+    x2, y2, w2, h2 = box2[0], box2[1], box2[2], box2[3]
+    xi1 = x1 if x1 > x2 else x2
+    yi1 = y1 if y1 > y2 else y2
+    xi2 = x1 + w1 if x1 + w1 < x2 + w2 else x2 + w2
+    yi2 = y1 + h1 if y1 + h1 < y2 + h2 else y2 + h2
+    if xi2 <= xi1 or yi2 <= yi1:
+        return 0
+    intersection = (xi2 - xi1) * (yi2 - yi1)
+    union = w1 * h1 + w2 * h2 - intersection
+    return intersection / union if union > 0 else 0
+
+
+def iou_one_to_many(box, boxes) -> Any:
+    """IoU of one box against an (N, 4) array of x, y, w, h"""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[0] + box[2], boxes[:, 0] + boxes[:, 2])
+    y2 = np.minimum(box[1] + box[3], boxes[:, 1] + boxes[:, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    union = box[2] * box[3] + boxes[:, 2] * boxes[:, 3] - intersection
+    return np.where(union > 0, intersection / np.where(union > 0, union, 1), 0.0)
+
+
+def nms_flags(matches, overlap_threshold: float = 0.3) -> List[Tuple]:
+    """
+    _apply_nms without pop(0) and list rebuilding: one sorted pass with a
+    suppressed flag per candidate. Same order and result.
+    """
+    ordered = sorted(matches, key=lambda m: m[4], reverse=True)
+    suppressed = [False] * len(ordered)
+    keep = []
+    for i, current in enumerate(ordered):
+        if suppressed[i]:
+            continue
+        keep.append(current)
+        for j in range(i + 1, len(ordered)):
+            if not suppressed[j] and iou_inline(current, ordered[j]) >= overlap_threshold:
+                suppressed[j] = True
+    return keep
+
+
+def nms_numpy(matches, overlap_threshold: float = 0.3) -> List[Tuple]:
+    """Vectorised NMS: each kept box suppresses all remaining overlaps in one step"""
+    if not matches:
+        return []
+    boxes = np.array([m[:4] for m in matches], dtype=np.float64)
+    # Stable descending sort keeps sorted(..., reverse=True) tie order
+    order = np.argsort(-np.array([m[4] for m in matches], dtype=np.float64), kind='stable')
+    keep = []
+    while order.size:
+        current = order[0]
+        keep.append(matches[current])
+        rest = order[1:]
+        order = rest[iou_one_to_many(boxes[current], boxes[rest]) < overlap_threshold]
+    return keep
+
+
+def filter_sweep(detected_keys, min_distance: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    _intelligent_filter for x-sorted input (as detect_key_sequence passes it).
+
+    With ascending x the distance to a group is the distance to its last
+    member, and a group that falls more than min_distance behind can never
+    match again, so only the open groups are scanned. Same groups, same
+    winners (first maximum on ties).
+    """
+    if not detected_keys:
+        return []
+    min_distance = BotConfig.MIN_DISTANCE if min_distance is None else min_distance
+    groups = []             # [last_x, best]
+    open_from = 0
+    for key_info in detected_keys:
+        x = key_info['x']
+        while open_from < len(groups) and x - groups[open_from][0] >= min_distance:
+            open_from += 1
+        for group in groups[open_from:]:
+            if x - group[0] < min_distance:
+                group[0] = x
+                if key_info['confidence'] > group[1]['confidence']:
+                    group[1] = key_info
+                break
+        else:
+            groups.append([x, key_info])
+    return [best for _, best in groups]
+
+
+# ─── Harness ───────────────────────────────────────────────────────────────────────────
+
+def time_call(fn: Callable[[], Any], min_time: float = 0.2, repeat: int = 3) -> float:
+    """Best mean seconds per call over `repeat` batches of at least `min_time`"""
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    loops = max(1, int(min_time / once)) if once > 0 else 1000
+    best = once
+    for _ in range(repeat if once < min_time else 0):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def _detector():
+    from launcher_bench_common import InlineExecutor
+    from launcher_key_detector import KeyDetector
+    return KeyDetector({}, executor=InlineExecutor())
+
+
+def primitive_cases(count: int, seed: int) -> Dict[str, Dict[str, Callable[[], Any]]]:
+    """{primitive: {implementation: call}} for one candidate count"""
+    detector = _detector()
+    matches = make_matches(count, seed)
+    detections = make_detections(count, seed)
+    probe = matches[0]
+    sequence = [random.Random(seed).choice(KEYS) for _ in range(count)]
+    previous = list(sequence)
+    previous_str = ' '.join(previous)
+    previous_tuple = tuple(previous)
+
+    cases = {
+        'nms': {
+            'current': lambda: detector._apply_nms(matches),
+            'flags': lambda: nms_flags(matches),
+        },
+        'iou': {
+            'current': lambda: [detector._calculate_iou(probe, m) for m in matches],
+            'inline': lambda: [iou_inline(probe, m) for m in matches],
+        },
+        'filter': {
+            'current': lambda: detector._intelligent_filter(detections),
+            'sweep': lambda: filter_sweep(detections),
+        },
+        'sequence_compare': {
+            # BotCore joins every read and compares strings
+            'current': lambda: ' '.join(sequence) != previous_str,
+            'tuple': lambda: tuple(sequence) != previous_tuple,
+            'list': lambda: sequence != previous,
+        },
+    }
+    if NUMPY_AVAILABLE:
+        boxes = np.array([m[:4] for m in matches], dtype=np.float64)
+        cases['nms']['numpy'] = lambda: nms_numpy(matches)
+        cases['iou']['numpy'] = lambda: iou_one_to_many(probe, boxes)
+    return cases
+
+
+def _same_result(a, b) -> bool:
+    if NUMPY_AVAILABLE and isinstance(b, np.ndarray):
+        return bool(np.allclose(np.asarray(a, dtype=np.float64), b))
+    return a == b
+
+
+def run_suite(counts: Sequence[int] = COUNTS, seed: int = 1234, min_time: float = 0.2,
+              max_seconds: float = 5.0, progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Time every implementation of every primitive at each count.
+
+    An implementation whose single call at the previous count already took
+    longer than `max_seconds` is skipped for larger counts.
+    """
+    results = []
+    too_slow = set()
+    for count in counts:
+        for primitive, implementations in primitive_cases(count, seed).items():
+            # Without the current result (too slow at this count) outputs are not cross-checked
+            check = (primitive, 'current') not in too_slow
+            reference = implementations['current']() if check else None
+            row = {'primitive': primitive, 'count': count, 'ns_per_candidate': {}, 'matches_current': {}}
+            for name, fn in implementations.items():
+                if (primitive, name) in too_slow:
+                    continue
+                seconds = time_call(fn, min_time)
+                if seconds > max_seconds:
+                    too_slow.add((primitive, name))
+                row['ns_per_candidate'][name] = 1e9 * seconds / count
+                if check and name != 'current':
+                    row['matches_current'][name] = _same_result(reference, fn())
+            results.append(row)
+            if progress:
+                timings = '  '.join(f"{name} {ns:10.1f}" for name, ns in row['ns_per_candidate'].items())
+                progress(f"{primitive:<16} n={count:<7} ns/candidate: {timings}")
+            for name, same in row['matches_current'].items():
+                if not same and progress:
+                    progress(f"  ⚠️ {primitive}/{name} differs from the current implementation")
+
+    from launcher_bench_common import machine_info
+    return {
+        'benchmark': 'primitives',
+        'generated_at': time.time(),
+        'machine': machine_info(),
+        'parameters': {'counts': list(counts), 'seed': seed, 'clusters': CLUSTERS,
+                       'min_distance': BotConfig.MIN_DISTANCE},
+        'results': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark the detector post-processing primitives")
+    parser.add_argument('--counts', type=int, nargs='+', default=list(COUNTS), help="candidates per call")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timing batch")
+    parser.add_argument('--max-seconds', type=float, default=5.0,
+                        help="stop growing an implementation once one call takes this long")
+    parser.add_argument('--out', default='bench_primitives.json', help="JSON results file")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.counts, args.seed, args.min_time, args.max_seconds, progress=print)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
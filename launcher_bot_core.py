@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+# bot_core.py - Fishing Bot State Machine Core
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 🧠 FiveM Fishing Bot - Detection/Execution State Machine
+# Description: Frame-driven bot logic with explicit states, timings and an injectable clock
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from launcher_config import BotConfig
+from launcher_metrics import metrics
+from launcher_logging import EventLogger, get_logger
+from launcher_completion_verifier import (
+    CompletionVerifier, VERIFY_PENDING, VERIFY_RETRY, VERIFY_ESCALATE
+)
+
+
+class BotState(Enum):
+    """Bot lifecycle states"""
+    SEARCHING = 'searching'      # Looking for the minigame area
+    VALIDATING = 'validating'    # Testing a candidate area
+    ARMED = 'armed'              # Area locked, waiting for a stable sequence
+    COMMITTING = 'committing'    # Sequence stable, waiting out SEQUENCE_STABLE_TIME
+    EXECUTING = 'executing'      # Keys handed to the execution worker
+    VERIFYING = 'verifying'      # Waiting for the prompt to clear
+
+
+# Metric span name per state handler
+STATE_SPANS = {state: f"core.{state.value}" for state in BotState}
+
+
+@dataclass
+class StateTransition:
+    """One recorded state change"""
+    source: BotState
+    target: BotState
+    at: float
+    dwell: float
+    reason: str = ""
+
+
+class DwellStats:
+    """Running dwell-time statistics for one state"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def add(self, dwell: float) -> None:
+        self.count += 1
+        self.total += dwell
+        self.min = min(self.min, dwell)
+        self.max = max(self.max, dwell)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+        }
+
+
+class BotStateMachine:
+    """
+    Tracks the current BotState, timestamps every transition against an
+    injectable clock and keeps per-state dwell statistics.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, history: int = 256):
+        self.clock = clock
+        self.state = BotState.SEARCHING
+        self.entered_at = clock()
+        self.history: Deque[StateTransition] = deque(maxlen=history)
+        self.dwell: Dict[BotState, DwellStats] = {state: DwellStats() for state in BotState}
+        self.listeners: List[Callable[[StateTransition], None]] = []
+
+    def transition(self, target: BotState, reason: str = "", now: Optional[float] = None) -> StateTransition:
+        """Move to `target`, recording how long the previous state lasted"""
+        now = self.clock() if now is None else now
+        record = StateTransition(self.state, target, now, now - self.entered_at, reason)
+        self.dwell[self.state].add(record.dwell)
+        self.history.append(record)
+        self.state = target
+        self.entered_at = now
+        for listener in self.listeners:
+            listener(record)
+        return record
+
+    def time_in_state(self, now: Optional[float] = None) -> float:
+        now = self.clock() if now is None else now
+        return now - self.entered_at
+
+    def reset(self) -> None:
+        self.state = BotState.SEARCHING
+        self.entered_at = self.clock()
+
+    def dwell_stats(self) -> Dict[str, Dict[str, float]]:
+        """Dwell-time statistics keyed by state name"""
+        return {state.value: stats.as_dict() for state, stats in self.dwell.items()}
+
+
+class BotCore:
+    """
+    🧠 Frame-driven fishing logic
+
+    Each call to step() consumes one screenshot, advances the state machine
+    and returns how long the caller should wait before the next frame. The
+    core never sleeps itself, so it can be driven by a thread, an event loop
+    or a simulator with a virtual clock.
+    """
+
+    # Timing constants
+    MAIN_LOOP_DELAY = 0.15          # Delay between frames
+    AREA_TEST_DURATION = 1.5        # Area validation window
+    AREA_RETRY_DELAY = 1.0          # Back-off after a failed area validation
+    MAX_VALIDATION_FAILURES = 3     # Failed validation executions before the area is dropped
+    PROFILE_RETRY_INTERVAL = 1.0    # Minimum time between warm-start attempts while searching
+    POST_EXECUTION_DELAY = 1.5      # Former fixed delay after execution (verifier baseline)
+
+    def __init__(self,
+                 execution_worker,
+                 hwnd_provider: Callable[[], Any],
+                 key_detector=None,
+                 logger: Optional[EventLogger] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 verifier: Optional[CompletionVerifier] = None,
+                 acquisition_gate=None,
+                 profile_store=None,
+                 profile_key_provider: Optional[Callable[[], Optional[str]]] = None,
+                 flight_recorder=None):
+        self.execution_worker = execution_worker
+        self.hwnd_provider = hwnd_provider
+        self.key_detector = key_detector
+        self.logger = logger or get_logger('core')
+        self.clock = clock
+        self.verifier = verifier or CompletionVerifier(baseline_delay=self.POST_EXECUTION_DELAY)
+        self.machine = BotStateMachine(clock)
+        # Optional shared gate that staggers full-frame acquisitions between bots
+        self.acquisition_gate = acquisition_gate
+        # Optional persisted detection profiles for warm start
+        self.profile_store = profile_store
+        self.profile_key_provider = profile_key_provider
+        # Optional ring of recent frames, dumped when a read goes wrong
+        self.flight_recorder = flight_recorder
+        self.reset()
+
+    @property
+    def state(self) -> BotState:
+        return self.machine.state
+
+    def reset(self) -> None:
+        """Return to SEARCHING with a clean slate (keeps the detected area)"""
+        self.machine.reset()
+        self.last_sequence_str = ""
+        self.consecutive_same_detections = 0
+        self.test_success_count = 0
+        self.validation_started_at = None
+        self.validation_failures = 0
+        self.pending_execution = None
+        self.last_sequence: List[str] = []
+        self.last_verified_frame = None
+        self.frames_observed = 0
+        self.frames_gated = 0
+        self.verifier.cancel()
+        self.started_at = self.clock()
+        self.time_to_armed = None
+        self.profile_key = None
+        self.profile_tried_at = float('-inf')
+
+    # ─── Frame dispatch ──────────────────────────────────────────────────────────────
+
+    def step(self, screen: Any, now: Optional[float] = None) -> float:
+        """Process one frame; returns the delay before the next step"""
+        now = self.clock() if now is None else now
+        if not self.key_detector:
+            return self.MAIN_LOOP_DELAY
+
+        handler = {
+            BotState.SEARCHING: self._step_searching,
+            BotState.VALIDATING: self._step_validating,
+            BotState.ARMED: self._step_armed,
+            BotState.COMMITTING: self._step_committing,
+            BotState.EXECUTING: self._step_executing,
+            BotState.VERIFYING: self._step_verifying,
+        }[self.machine.state]
+        state = self.machine.state
+        with metrics.span(STATE_SPANS[state]):
+            delay = handler(screen, now)
+        if self.flight_recorder is not None:
+            self.flight_recorder.record(screen, now, state.value,
+                                        getattr(self.key_detector, 'last_detections', None),
+                                        self.key_detector.get_detection_area())
+        return self.MAIN_LOOP_DELAY if delay is None else delay
+
+    def dump_flight_recorder(self, reason: str, force: bool = False) -> Optional[str]:
+        """Write the recent frames and decisions to disk (no-op without a recorder)"""
+        if self.flight_recorder is None:
+            return None
+        transitions = [{
+            'source': t.source.value,
+            'target': t.target.value,
+            'at': t.at,
+            'dwell': t.dwell,
+            'reason': t.reason,
+        } for t in list(self.machine.history)[-32:]]
+        return self.flight_recorder.dump(reason, {
+            'state': self.machine.state.value,
+            'transitions': transitions,
+            'last_sequence': self.last_sequence,
+            'last_sequence_str': self.last_sequence_str,
+            'test_success_count': self.test_success_count,
+        }, force=force)
+
+    # ─── Area acquisition ────────────────────────────────────────────────────────────
+
+    def _step_searching(self, screen: Any, now: float) -> Optional[float]:
+        if self.key_detector.get_detection_area():
+            self._begin_validation(now, "area already set")
+            return None
+
+        if self._try_profile(screen, now):
+            return None
+
+        if self.acquisition_gate is not None:
+            wait = self.acquisition_gate.try_acquire(now)
+            if wait > 0:
+                return wait
+        try:
+            found = self.key_detector.auto_detect_minigame_area(screen)
+        finally:
+            if self.acquisition_gate is not None:
+                self.acquisition_gate.release()
+
+        if found:
+            area = self.key_detector.get_detection_area()
+            self.logger.debug('area_found', "🎯 Found potential area: %s - Initiating validation...", area, area=area)
+            self._begin_validation(now, "area found")
+        return None
+
+    def _begin_validation(self, now: float, reason: str) -> None:
+        self.test_success_count = 0
+        # Re-entering VALIDATING after a failed execution keeps this window
+        self.validation_started_at = now
+        self.validation_failures = 0
+        self.machine.transition(BotState.VALIDATING, reason, now)
+        self.logger.debug('validation_started', "🧪 Testing detection area reliability...")
+
+    def _step_validating(self, screen: Any, now: float) -> Optional[float]:
+        sequence = self.key_detector.detect_key_sequence(screen)
+        sequence_str = ' '.join(sequence)
+
+        if sequence_str and len(sequence) >= BotConfig.TARGET_SEQUENCE_LENGTH:
+            self.test_success_count += 1
+            self.logger.debug('validation_reading', "🧪 Test reading: %s (Success: %d)",
+                              sequence_str, self.test_success_count)
+            # No new test executions once the window is over, so failed ones cannot extend it
+            if (now - self.validation_started_at < self.AREA_TEST_DURATION and
+                    self._submit_execution(sequence, sequence_str, now, validation=True)):
+                return None
+
+        if now - self.validation_started_at < self.AREA_TEST_DURATION:
+            return None
+
+        self.logger.info('validation_completed', "📊 Area test completed: %d successful readings",
+                         self.test_success_count, readings=self.test_success_count)
+        if self.test_success_count >= 2:
+            self.logger.debug('validation_passed', "✅ Area validation PASSED! Proceeding with automation.")
+            self._save_profile()
+            self._arm(now, "validation readings")
+            return None
+
+        self.logger.debug('validation_failed', "❌ Area validation FAILED (%d successful readings)",
+                          self.test_success_count)
+        self.dump_flight_recorder('validation failed')
+        return self._reset_area_detection(now, "validation failed")
+
+    # ─── Detection profiles ──────────────────────────────────────────────────────────
+
+    def _current_profile_key(self) -> Optional[str]:
+        if self.profile_store is None or self.profile_key_provider is None:
+            return None
+        if self.profile_key is None:
+            try:
+                self.profile_key = self.profile_key_provider()
+            except Exception:
+                return None
+        return self.profile_key
+
+    def _try_profile(self, screen: Any, now: float) -> bool:
+        """Arm straight from a persisted area if one frame reads a full sequence (rate-limited)"""
+        if self.profile_store is None or now - self.profile_tried_at < self.PROFILE_RETRY_INTERVAL:
+            return False
+        profile = self.profile_store.get(self._current_profile_key())
+        if profile is None:
+            return False
+        self.profile_tried_at = now
+
+        # Read the saved area at the saved scale only; a miss falls back to a full search
+        self.key_detector.key_sequence_area = tuple(profile['area'])
+        self.key_detector.scale_lock = profile.get('scale')
+        sequence = self.key_detector.detect_key_sequence(screen)
+        if len(sequence) >= BotConfig.TARGET_SEQUENCE_LENGTH:
+            self.logger.debug('profile_validated', "💾 Detection profile validated: %s (scale %s)",
+                              profile['area'], profile.get('scale'))
+            self._arm(now, "profile validated")
+            return True
+
+        self.key_detector.key_sequence_area = None
+        self.key_detector.scale_lock = None
+        return False
+
+    def _save_profile(self) -> None:
+        key = self._current_profile_key()
+        area = self.key_detector.get_detection_area()
+        if key is None or not area:
+            return
+        profile = {'area': [int(v) for v in area]}
+        acquisition = getattr(self.key_detector, 'last_acquisition', None)
+        if acquisition:
+            profile.update(scale=float(acquisition['scale']),
+                           slots=[[int(v) for v in slot] for slot in acquisition['slots']],
+                           threshold=float(acquisition['threshold']))
+        try:
+            self.profile_store.save(key, profile)
+        except Exception as e:
+            self.logger.warning('profile_save_failed', "⚠️ Could not save detection profile: %s", e)
+
+    def _reset_area_detection(self, now: float, reason: str) -> float:
+        """Drop the area and search again after a short back-off"""
+        if self.key_detector:
+            self.key_detector.key_sequence_area = None
+            self.key_detector.scale_lock = None
+        self.test_success_count = 0
+        self.validation_started_at = None
+        self.validation_failures = 0
+        self._reset_sequence_state()
+        self.machine.transition(BotState.SEARCHING, reason, now)
+        return self.AREA_RETRY_DELAY
+
+    # ─── Sequence tracking ───────────────────────────────────────────────────────────
+
+    def _arm(self, now: float, reason: str) -> None:
+        self._reset_sequence_state()
+        self.machine.transition(BotState.ARMED, reason, now)
+        if self.time_to_armed is None:
+            self.time_to_armed = now - self.started_at
+            self.logger.info('first_armed', "⏱️ Time to first armed state: %.2fs (%s)",
+                             self.time_to_armed, reason, seconds=self.time_to_armed, reason=reason)
+
+    def _step_armed(self, screen: Any, now: float) -> Optional[float]:
+        sequence = self.key_detector.detect_key_sequence(screen)
+        sequence_str = ' '.join(sequence)
+
+        if not sequence_str:
+            self._reset_sequence_state()
+            return None
+
+        if sequence_str != self.last_sequence_str:
+            self.last_sequence_str = sequence_str
+            self.consecutive_same_detections = 0
+            return None
+
+        self.consecutive_same_detections += 1
+        if (self.consecutive_same_detections >= BotConfig.MIN_CONSECUTIVE_DETECTIONS and
+                len(sequence) >= BotConfig.TARGET_SEQUENCE_LENGTH):
+            self.logger.debug('sequence_stable', "⏳ Sequence stabilizing: %s", sequence_str)
+            self.machine.transition(BotState.COMMITTING, "sequence stable", now)
+        return None
+
+    def _step_committing(self, screen: Any, now: float) -> Optional[float]:
+        sequence = self.key_detector.detect_key_sequence(screen)
+        sequence_str = ' '.join(sequence)
+
+        if sequence_str != self.last_sequence_str:
+            # Prompt changed or vanished before the stability window elapsed
+            self._reset_sequence_state()
+            if sequence_str:
+                self.last_sequence_str = sequence_str
+            self.machine.transition(BotState.ARMED, "sequence changed", now)
+            return None
+
+        self.consecutive_same_detections += 1
+        if self.machine.time_in_state(now) >= BotConfig.SEQUENCE_STABLE_TIME:
+            self.logger.debug('sequence_commit', "🎯 Executing sequence: %s", sequence_str)
+            if not self._submit_execution(sequence, sequence_str, now, validation=False):
+                self._arm(now, "execution queue full")
+        return None
+
+    def _reset_sequence_state(self) -> None:
+        self.last_sequence_str = ""
+        self.consecutive_same_detections = 0
+
+    # ─── Execution and verification ──────────────────────────────────────────────────
+
+    def _submit_execution(self, sequence: list, sequence_str: str, now: float,
+                          validation: bool, retry: bool = False) -> bool:
+        """Hand a sequence to the execution worker without blocking"""
+        future = self.execution_worker.submit(sequence, self.hwnd_provider())
+        if future is None:
+            self.logger.debug('execution_queue_full', "⚠️ Execution queue full - sequence skipped")
+            return False
+
+        self.pending_execution = {
+            'future': future,
+            'sequence': list(sequence),
+            'sequence_str': sequence_str,
+            'validation': validation
+        }
+        self.last_sequence = list(sequence)
+        self.verifier.begin(sequence_str, now, retry=retry)
+        self.machine.transition(BotState.EXECUTING, "validation" if validation else "commit", now)
+        return True
+
+    def _step_executing(self, screen: Any, now: float) -> Optional[float]:
+        pending = self.pending_execution
+        if not pending['future'].done():
+            self._observe(screen, now)
+            return None
+
+        self.pending_execution = None
+        try:
+            success = pending['future'].result()
+        except Exception as e:
+            self.logger.warning('execution_error', "❌ Execution error: %s", e)
+            success = False
+
+        if success:
+            self.verifier.mark_sent(now)
+            if pending['validation']:
+                self.logger.debug('validation_passed', "✅ Area validation PASSED! (Execution successful: %s)",
+                                  pending['sequence_str'])
+                self._save_profile()
+            else:
+                self.logger.debug('execution_complete', "✅ Execution complete: %d keys executed successfully",
+                                  len(pending['sequence']))
+            self.machine.transition(BotState.VERIFYING, "keys sent", now)
+            return None
+
+        self.verifier.cancel()
+        self.dump_flight_recorder('execution failed')
+        if pending['validation']:
+            self.validation_failures += 1
+            self.logger.debug('validation_execution_failed', "❌ Validation execution failed (%d/%d)",
+                              self.validation_failures, self.MAX_VALIDATION_FAILURES)
+            if self.validation_failures >= self.MAX_VALIDATION_FAILURES:
+                return self._reset_area_detection(now, "validation executions failed")
+            self.machine.transition(BotState.VALIDATING, "validation execution failed", now)
+        else:
+            self.logger.warning('execution_failed', "❌ Execution failed - Key executor returned False")
+            self._arm(now, "execution failed")
+        return None
+
+    def _observe(self, screen: Any, now: float) -> Optional[str]:
+        """Feed a new frame to the verifier; cached frames are skipped"""
+        self.frames_observed += 1
+        if screen is self.last_verified_frame:
+            self.frames_gated += 1
+            return None
+        self.last_verified_frame = screen
+        sequence_str = ' '.join(self.key_detector.detect_key_sequence(screen))
+        return self.verifier.observe(sequence_str, now)
+
+    def _step_verifying(self, screen: Any, now: float) -> Optional[float]:
+        result = self._observe(screen, now)
+        if result is None or result == VERIFY_PENDING:
+            return None
+
+        if result == VERIFY_RETRY:
+            self.logger.debug('verify_retry', "🔁 Prompt still visible, retrying: %s", self.verifier.sequence_str)
+            if not self._submit_execution(self.last_sequence, self.verifier.sequence_str, now,
+                                          validation=False, retry=True):
+                self._arm(now, "retry rejected")
+            return None
+
+        if result == VERIFY_ESCALATE:
+            self.logger.info('verify_escalate', "⚠️ Prompt stuck after retries - re-detecting area")
+            self.dump_flight_recorder('prompt stuck')
+            if self.profile_store is not None and self._current_profile_key():
+                self.profile_store.remove(self.profile_key)
+            return self._reset_area_detection(now, "prompt stuck")
+
+        if self.logger.is_enabled(logging.INFO):
+            stats = self.verifier.summary(now)
+            self.logger.info('catch', "✅ Prompt %s - armed again (%.0f/h, saved %.2fs/catch)",
+                             result, stats['catches_per_hour'], stats['saved_per_catch'], result=result)
+        self._arm(now, f"prompt {result}")
+        return None
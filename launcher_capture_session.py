@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# capture_session.py - Persistent GDI Capture Context
+import cv2
+import numpy as np
+
+try:
+    import win32gui
+    import win32ui
+    from ctypes import windll
+except ImportError:
+    win32gui = None
+    win32ui = None
+    windll = None
+
+# PrintWindow flag: PW_CLIENTONLY | PW_RENDERFULLCONTENT
+PRINT_WINDOW_FLAGS = 3
+
+
+class Win32CaptureApi:
+    """Thin wrapper over the win32 calls used for capture (injectable for tests)"""
+
+    def get_window_rect(self, hwnd):
+        return win32gui.GetWindowRect(hwnd)
+
+    def get_window_dc(self, hwnd):
+        return win32gui.GetWindowDC(hwnd)
+
+    def create_dc_from_handle(self, hdc):
+        return win32ui.CreateDCFromHandle(hdc)
+
+    def create_bitmap(self):
+        return win32ui.CreateBitmap()
+
+    def print_window(self, hwnd, hdc):
+        return windll.user32.PrintWindow(hwnd, hdc, PRINT_WINDOW_FLAGS)
+
+    def delete_object(self, handle):
+        win32gui.DeleteObject(handle)
+
+    def release_dc(self, hwnd, hdc):
+        win32gui.ReleaseDC(hwnd, hdc)
+
+
+class CaptureSession:
+    """
+    Holds the window DC, memory DC and bitmap for one window.
+
+    Resources are created on the first frame, reused for every following
+    frame and only rebuilt when GetWindowRect reports a new size.
+    """
+
+    def __init__(self, hwnd, api=None):
+        self.hwnd = hwnd
+        self.api = api if api is not None else Win32CaptureApi()
+        self.size = None
+
+        self._window_dc = None
+        self._mfc_dc = None
+        self._save_dc = None
+        self._bitmap = None
+
+        # Allocation counters (per session and for the last frame)
+        self.allocations = 0
+        self.frame_allocations = 0
+        self.frames = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def capture(self):
+        """Capture one frame as a BGR image, or None on failure"""
+        self.frame_allocations = 0
+        x, y, x2, y2 = self.api.get_window_rect(self.hwnd)
+        width, height = x2 - x, y2 - y
+        if width <= 0 or height <= 0:
+            return None
+
+        if self.size != (width, height):
+            self._allocate(width, height)
+
+        result = self.api.print_window(self.hwnd, self._save_dc.GetSafeHdc())
+        if result != 1:
+            return None
+
+        bmpstr = self._bitmap.GetBitmapBits(True)
+        im = np.frombuffer(bmpstr, dtype='uint8')
+        im.shape = (height, width, 4)
+
+        self.frames += 1
+        return cv2.cvtColor(im, cv2.COLOR_BGRA2BGR)
+
+    def _allocate(self, width, height):
+        """(Re)create DCs and bitmap for the given client size"""
+        self.close()
+        try:
+            self._window_dc = self.api.get_window_dc(self.hwnd)
+            self._mfc_dc = self.api.create_dc_from_handle(self._window_dc)
+            self._save_dc = self._mfc_dc.CreateCompatibleDC()
+
+            self._bitmap = self.api.create_bitmap()
+            self._bitmap.CreateCompatibleBitmap(self._mfc_dc, width, height)
+            self._save_dc.SelectObject(self._bitmap)
+        except Exception:
+            self.close()
+            raise
+
+        self.size = (width, height)
+        self.allocations += 1
+        self.frame_allocations += 1
+
+    def close(self):
+        """Release all GDI resources; safe to call more than once"""
+        bitmap, save_dc, mfc_dc, window_dc = (
+            self._bitmap, self._save_dc, self._mfc_dc, self._window_dc
+        )
+        self._bitmap = self._save_dc = self._mfc_dc = self._window_dc = None
+        self.size = None
+
+        if bitmap is not None:
+            try:
+                self.api.delete_object(bitmap.GetHandle())
+            except Exception:
+                pass
+        if save_dc is not None:
+            try:
+                save_dc.DeleteDC()
+            except Exception:
+                pass
+        if mfc_dc is not None:
+            try:
+                mfc_dc.DeleteDC()
+            except Exception:
+                pass
+        if window_dc is not None:
+            try:
+                self.api.release_dc(self.hwnd, window_dc)
+            except Exception:
+                pass
+
+    def __del__(self):
+        if hasattr(self, '_bitmap'):
+            self.close()
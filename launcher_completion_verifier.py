@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# completion_verifier.py - Visual Check that an Executed Prompt Was Accepted
+from typing import Any, Dict, Optional
+
+from launcher_config import BotConfig
+
+# Observation results
+VERIFY_PENDING = 'pending'
+VERIFY_CLEARED = 'cleared'
+VERIFY_CHANGED = 'changed'
+VERIFY_RETRY = 'retry'
+VERIFY_ESCALATE = 'escalate'
+
+
+class CompletionVerifier:
+    """
+    Watches the locked ROI after a sequence is sent.
+
+    The prompt counts as accepted once it is gone for `clear_frames`
+    consecutive frames, or a different full sequence replaces it. If the
+    same prompt is still visible `timeout` seconds after the keys went
+    out, the caller is told to retry, and after `max_retries` to escalate.
+    """
+
+    def __init__(self,
+                 timeout: Optional[float] = None,
+                 clear_frames: Optional[int] = None,
+                 max_retries: Optional[int] = None,
+                 baseline_delay: float = 0.0):
+        self.timeout = BotConfig.VERIFY_TIMEOUT if timeout is None else timeout
+        self.clear_frames = BotConfig.VERIFY_CLEAR_FRAMES if clear_frames is None else clear_frames
+        self.max_retries = BotConfig.VERIFY_MAX_RETRIES if max_retries is None else max_retries
+        # Fixed delay this verifier replaces, used to report time saved
+        self.baseline_delay = baseline_delay
+
+        self.active = False
+        self.sequence_str = ""
+        self.started_at = None
+        self.sent_at = None
+        self.clear_count = 0
+        self.retries = 0
+
+        self.session_start = None
+        self.catches = 0
+        self.escalations = 0
+        self.total_retries = 0
+        self.total_verify_time = 0.0
+
+    def begin(self, sequence_str: str, now: float, retry: bool = False) -> None:
+        """Start watching a prompt whose keys have just been submitted"""
+        if self.session_start is None:
+            self.session_start = now
+        if not retry:
+            self.retries = 0
+        self.active = True
+        self.sequence_str = sequence_str
+        self.started_at = now
+        self.sent_at = None
+        self.clear_count = 0
+
+    def mark_sent(self, now: float) -> None:
+        """Keys finished sending; the timeout runs from here"""
+        self.sent_at = now
+
+    def cancel(self) -> None:
+        self.active = False
+        self.sent_at = None
+
+    def observe(self, sequence_str: str, now: float) -> str:
+        """Feed the sequence read from a new frame; returns a VERIFY_* result"""
+        if not self.active:
+            return VERIFY_CLEARED
+
+        if not sequence_str:
+            self.clear_count += 1
+            if self.clear_count >= self.clear_frames:
+                return self._resolve(now, VERIFY_CLEARED)
+            return VERIFY_PENDING
+
+        self.clear_count = 0
+        if (sequence_str != self.sequence_str and
+                len(sequence_str.split()) >= BotConfig.TARGET_SEQUENCE_LENGTH):
+            return self._resolve(now, VERIFY_CHANGED)
+
+        if self.sent_at is not None and now - self.sent_at >= self.timeout:
+            self.active = False
+            if self.retries < self.max_retries:
+                self.retries += 1
+                self.total_retries += 1
+                return VERIFY_RETRY
+            self.escalations += 1
+            return VERIFY_ESCALATE
+
+        return VERIFY_PENDING
+
+    def _resolve(self, now: float, result: str) -> str:
+        if self.sent_at is None:
+            # Prompt went away while keys were still being sent
+            return VERIFY_PENDING
+        self.active = False
+        self.catches += 1
+        self.total_verify_time += now - self.sent_at
+        return result
+
+    def summary(self, now: float) -> Dict[str, Any]:
+        """Catch rate and cycle time saved against the fixed delay"""
+        elapsed = now - self.session_start if self.session_start is not None else 0.0
+        mean_verify = self.total_verify_time / self.catches if self.catches else 0.0
+        return {
+            'catches': self.catches,
+            'retries': self.total_retries,
+            'escalations': self.escalations,
+            'catches_per_hour': self.catches * 3600.0 / elapsed if elapsed > 0 else 0.0,
+            'mean_verify_time': mean_verify,
+            'saved_per_catch': self.baseline_delay - mean_verify if self.catches else 0.0,
+        }
@@ -1,4 +1,5 @@
 # config.py - Configuration Settings
+import json
 import os
 import sys
 
@@ -11,6 +12,12 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+def data_path(*parts):
+    """ คืน path ในโฟลเดอร์ข้อมูลของผู้ใช้ (สร้างโฟลเดอร์ให้ถ้ายังไม่มี) """
+    base_path = os.path.join(os.path.expanduser("~"), ".fivem_fishing")
+    os.makedirs(base_path, exist_ok=True)
+    return os.path.join(base_path, *parts)
+
 # Bot Configuration
 class BotConfig:
     # Key mappings for minigame
@@ -35,9 +42,80 @@ class BotConfig:
     SEQUENCE_STABLE_TIME = 0.3
     SENSITIVITY = 0.8
     REACTION_DELAY = 0.01
+    KEY_HOLD_TIME = 0.01
+    KEY_JITTER_RANGE = (0.02, 0.05)
+    KEY_SEQUENCE_TAIL = 0.1
+    
+    # Input backend: 'postmessage', 'sendinput' (timed) or 'sendinput_batch' (prebuilt, one call per KEY_HOLD_TIME phase)
+    INPUT_BACKEND = 'postmessage'
+    FOCUS_RESTORE_DELAY = 0.05  # Input settle time before focus returns to the previous window
     MIN_CONSECUTIVE_DETECTIONS = 3
     MIN_DISTANCE = 20
     
+    # Template pyramid and adaptive area threshold (offsets from SENSITIVITY)
+    TEMPLATE_SCALES = (0.8, 1.0, 1.2)
+    LOW_CONTRAST_THRESHOLD_OFFSET = -0.15
+    DARK_THRESHOLD_OFFSET = -0.1
+    BRIGHT_THRESHOLD_OFFSET = 0.1
+    
+    # Tuned detection settings (written by launcher_tune.py, loaded at startup)
+    TUNING_PROFILE_ENABLED = True
+    TUNING_PROFILE_FILE = "detection_tuning.json"
+    
+    # Completion verification after sending keys
+    VERIFY_TIMEOUT = 2.0
+    VERIFY_CLEAR_FRAMES = 2
+    VERIFY_MAX_RETRIES = 1
+    
+    # Out-of-process detection (shared memory frame ring)
+    DETECTOR_OUT_OF_PROCESS = False
+    DETECTOR_RING_SLOTS = 2
+    DETECTOR_MAX_FRAME_SIZE = (3840, 2160)
+    
+    # Bot runtime: 'thread' (bot_loop thread) or 'asyncio' (AsyncBotRuntime)
+    RUNTIME = 'thread'
+    
+    # Multi-window mode: one lane per detected FiveM window
+    MULTI_INSTANCE = False
+    MULTI_INSTANCE_MAX_ACQUISITIONS = 1
+    MULTI_INSTANCE_ACQUISITION_SPACING = 0.1
+    
+    # Per-window detection profiles (warm start)
+    DETECTION_PROFILES_ENABLED = True
+    DETECTION_PROFILES_FILE = "detection_profiles.json"
+    
+    # Per-stage latency instrumentation (exported when the bot stops)
+    METRICS_ENABLED = False
+    METRICS_TRACE = False
+    METRICS_TRACE_CAPACITY = 100000
+    
+    # Live performance panel (enables metric spans while the GUI is open)
+    PERF_PANEL_ENABLED = True
+    PERF_PANEL_INTERVAL = 1.0
+    
+    # Logging (JSON lines in the user data folder, written by a background thread)
+    LOG_FILE = "bot.log"
+    LOG_MAX_BYTES = 1024 * 1024
+    LOG_BACKUP_COUNT = 3
+    LOG_RING_CAPACITY = 2000
+    LOG_QUEUE_SIZE = 10000
+    
+    # Session recording (memory-mapped frame datasets for benchmarks and tuning)
+    FRAME_RECORDING_ENABLED = False
+    FRAME_RECORDING_DIR = None          # Default: <data folder>/recordings/<start time>
+    FRAME_RECORDING_FULL_FRAMES = False # Also record frames while no area is locked
+    FRAME_RECORDING_MARGIN = 20         # Pixels kept around the locked area
+    FRAME_RECORDING_CHUNK_FRAMES = 256
+    
+    # Flight recorder (recent frames dumped when validation or execution fails)
+    FLIGHT_RECORDER_ENABLED = True
+    FLIGHT_RECORDER_FRAMES = 48         # Ring slots (~7s at MAIN_LOOP_DELAY)
+    FLIGHT_RECORDER_STRIDE = 4          # Keep every Nth pixel in each direction
+    FLIGHT_RECORDER_DIR = "flight_recorder"
+    FLIGHT_RECORDER_MIN_INTERVAL = 5.0  # Seconds between automatic dumps
+    FLIGHT_RECORDER_MAX_DUMPS = 20
+    FLIGHT_RECORDER_HOTKEY = 'f7'       # Manual dump (None disables)
+    
     # Window settings
     FIVEM_WINDOW_TITLE = "FiveM® by Cfx.re - GOOD TOWN BY GOOD TEAM"
     
@@ -53,4 +131,74 @@ class BotConfig:
     
     # Windows Messages
     WM_KEYDOWN = 0x100
-    WM_KEYUP = 0x101
\ No newline at end of file
+    WM_KEYUP = 0x101
+
+
+# Settings a tuning profile may override: name -> (type, minimum, maximum)
+TUNABLE_SETTINGS = {
+    'SENSITIVITY': (float, 0.3, 0.99),
+    'MIN_DISTANCE': (int, 1, 200),
+    'MIN_CONSECUTIVE_DETECTIONS': (int, 1, 30),
+    'SEQUENCE_STABLE_TIME': (float, 0.0, 5.0),
+    'TEMPLATE_SCALES': (tuple, 0.25, 4.0),      # Bounds apply to every scale
+    'LOW_CONTRAST_THRESHOLD_OFFSET': (float, -0.5, 0.5),
+    'DARK_THRESHOLD_OFFSET': (float, -0.5, 0.5),
+    'BRIGHT_THRESHOLD_OFFSET': (float, -0.5, 0.5),
+}
+
+def tunable_settings():
+    """ Current values of the tunable settings """
+    return {name: getattr(BotConfig, name) for name in TUNABLE_SETTINGS}
+
+def _number(name, value, kind, low, high):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    if kind is int and value != int(value):
+        raise ValueError(f"{name} must be a whole number, got {value!r}")
+    if not low <= value <= high:
+        raise ValueError(f"{name}={value!r} outside [{low}, {high}]")
+    return kind(value)
+
+def validate_tuning_settings(settings):
+    """ Checked and normalised copy of tuning settings; raises ValueError on unknown names or bad values """
+    if not isinstance(settings, dict):
+        raise ValueError("settings must be an object")
+    checked = {}
+    for name, value in settings.items():
+        if name not in TUNABLE_SETTINGS:
+            raise ValueError(f"{name} is not a tunable setting")
+        kind, low, high = TUNABLE_SETTINGS[name]
+        if kind is tuple:
+            if not isinstance(value, (list, tuple)) or not value:
+                raise ValueError(f"{name} must be a non-empty list, got {value!r}")
+            checked[name] = tuple(_number(name, v, float, low, high) for v in value)
+        else:
+            checked[name] = _number(name, value, kind, low, high)
+    return checked
+
+def load_tuning_profile(path=None):
+    """
+    Apply the settings of a tuning profile to BotConfig and return them.
+
+    Returns None when there is no profile (or profiles are disabled and
+    no path is given); raises ValueError for an unreadable or invalid
+    profile, in which case nothing is applied.
+    """
+    if path is None:
+        if not BotConfig.TUNING_PROFILE_ENABLED:
+            return None
+        path = data_path(BotConfig.TUNING_PROFILE_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"cannot read {path}: {e}")
+    if not isinstance(profile, dict):
+        raise ValueError(f"{path} is not a tuning profile")
+
+    settings = validate_tuning_settings(profile.get('settings', {}))
+    for name, value in settings.items():
+        setattr(BotConfig, name, value)
+    return settings
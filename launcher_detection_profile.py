@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# detection_profile.py - Persisted Per-Window Detection Profiles
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from launcher_config import BotConfig, data_path
+
+
+class DetectionProfileStore:
+    """
+    JSON store of validated detection settings keyed by window title and
+    client size.
+
+    A profile holds the validated key_sequence_area plus the winning
+    template scale, slot boxes and threshold of its acquisition, so the
+    next start can read that area at that scale before a full acquisition.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or data_path(BotConfig.DETECTION_PROFILES_FILE)
+        self.lock = threading.Lock()
+        self.profiles: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @staticmethod
+    def make_key(title: str, width: int, height: int) -> str:
+        return f"{title}|{width}x{height}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.profiles is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.profiles = json.load(f)
+            except (OSError, ValueError):
+                self.profiles = {}
+        return self.profiles
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not key:
+            return None
+        with self.lock:
+            profile = self._load().get(key)
+        if not profile or len(profile.get('area') or ()) != 4:
+            return None
+        return profile
+
+    def save(self, key: Optional[str], profile: Dict[str, Any]) -> None:
+        if not key:
+            return
+        with self.lock:
+            profiles = self._load()
+            profiles[key] = dict(profile, saved_at=time.time())
+            self._write(profiles)
+
+    def remove(self, key: Optional[str]) -> None:
+        with self.lock:
+            profiles = self._load()
+            if key in profiles:
+                del profiles[key]
+                self._write(profiles)
+
+    def _write(self, profiles: Dict[str, Dict[str, Any]]) -> None:
+        """Write atomically so a crash never leaves a truncated file"""
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(profiles, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+# detector_process.py - Out-of-Process Key Detection over Shared Memory
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+from launcher_config import BotConfig, tunable_settings
+from launcher_key_detector import KeyDetector
+from launcher_logging import get_logger
+
+logger = get_logger('detector_process')
+
+# Worker operations
+OP_AREA = 'area'
+OP_SEQUENCE = 'sequence'
+OP_STOP = 'stop'
+
+# Result id the worker sends once it is ready for requests
+READY = -1
+
+
+class SharedFrameRing:
+    """
+    Fixed-size ring of frame slots inside one shared memory block.
+
+    Frames are copied straight into a slot; only the slot index and frame
+    shape travel over the request queue, so no pixel data is pickled.
+    """
+
+    def __init__(self, slots, slot_bytes, name=None):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+    def view(self, slot, shape):
+        """Zero-copy uint8 view of a slot with the given shape"""
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf,
+                          offset=slot * self.slot_bytes)
+
+    def write(self, slot, frame):
+        """Copy a frame into a slot and return its shape"""
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {frame.nbytes} bytes exceeds slot size {self.slot_bytes}")
+        self.view(slot, frame.shape)[...] = frame
+        return frame.shape
+
+    def close(self):
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except Exception:
+            pass
+
+
+def _detector_worker(shm_name, slots, slot_bytes, templates, requests, results, settings):
+    """Worker process entry point: run KeyDetector on frames from the ring"""
+    # A spawned process starts from the BotConfig defaults; carry over tuned values
+    for name, value in settings.items():
+        setattr(BotConfig, name, value)
+    ring = SharedFrameRing(slots, slot_bytes, name=shm_name)
+    detector = KeyDetector(templates)
+    results.put((READY, None, None, None, None))
+    frame = None
+    try:
+        while True:
+            request_id, op, slot, shape, area, scale_lock = requests.get()
+            if op == OP_STOP:
+                break
+
+            frame = ring.view(slot, shape)
+            detector.key_sequence_area = area
+            detector.scale_lock = scale_lock
+            try:
+                if op == OP_AREA:
+                    found = detector.auto_detect_minigame_area(frame)
+                    results.put((request_id, slot, found, detector.key_sequence_area,
+                                 detector.last_acquisition if found else None))
+                else:
+                    sequence = detector.detect_key_sequence(frame)
+                    results.put((request_id, slot, sequence, area, detector.last_detections))
+            except Exception:
+                results.put((request_id, slot, None, area, None))
+    finally:
+        # Views must be dropped before the shared block can be closed
+        frame = None
+        ring.close()
+
+
+class RemoteKeyDetector:
+    """
+    KeyDetector facade that runs detection in a worker process.
+
+    Exposes the same methods, settings (key_sequence_area, scale_lock) and
+    result attributes (last_acquisition, last_detections; detection
+    coordinates are relative to the area) the
+    bot uses on KeyDetector so it can be swapped in when
+    BotConfig.DETECTOR_OUT_OF_PROCESS is enabled. A worker
+    that died or missed RESULT_TIMEOUT is replaced (with fresh queues, so
+    late replies from the old one never arrive) and every slot is
+    reclaimed; the failed call reports nothing found. A frame too large
+    for a ring slot is logged once and detected in-process instead.
+    """
+
+    RESULT_TIMEOUT = 2.0
+    STARTUP_TIMEOUT = 30.0      # Spawning, imports and template loading
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, templates, slots=None, max_frame_size=None):
+        self.templates = templates
+        self.key_sequence_area = None
+        self.scale_lock = None
+        self.last_acquisition = None
+        self.last_detections = []
+        # In-process detector for frames that do not fit a ring slot
+        self.local_detector = None
+
+        self.slot_count = slots or BotConfig.DETECTOR_RING_SLOTS
+        width, height = max_frame_size or BotConfig.DETECTOR_MAX_FRAME_SIZE
+        self.ring = SharedFrameRing(self.slot_count, width * height * 3)
+        self.next_request_id = 0
+        self.restarts = 0
+        self.process = None
+        self._spawn()
+
+    def _spawn(self):
+        ctx = mp.get_context('spawn')
+        self.requests = ctx.Queue()
+        self.results = ctx.Queue()
+        self.free_slots = list(range(self.slot_count))
+        self.in_flight = {}     # request id -> slot
+        self.ready = False
+        self.process = ctx.Process(
+            target=_detector_worker,
+            args=(self.ring.name, self.slot_count, self.ring.slot_bytes, self.templates,
+                  self.requests, self.results, tunable_settings()),
+            daemon=True,
+        )
+        self.process.start()
+
+    def _restart(self, reason):
+        """Replace the worker process; slots and pending requests start over"""
+        self.restarts += 1
+        logger.warning('detector_restart', "⚠️ Restarting detector worker (%s)", reason,
+                       reason=reason, restarts=self.restarts)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=1.0)
+        for channel in (self.requests, self.results):
+            channel.cancel_join_thread()
+            channel.close()
+        self._spawn()
+
+    def submit(self, op, frame):
+        """Copy a frame into a free slot and queue it; returns the request id"""
+        if not self.process.is_alive():
+            self._restart('worker exited')
+        if not self.free_slots:
+            raise RuntimeError("No free frame slot in shared ring")
+
+        area = self.key_sequence_area
+        if op == OP_SEQUENCE and area:
+            # Only the locked ROI is needed for sequence reading
+            x, y, w, h = area
+            frame = frame[y:y+h, x:x+w]
+            area = (0, 0, frame.shape[1], frame.shape[0])
+
+        slot = self.free_slots.pop()
+        try:
+            shape = self.ring.write(slot, frame)
+        except Exception:
+            self.free_slots.append(slot)
+            raise
+
+        request_id = self.next_request_id
+        self.next_request_id += 1
+        self.in_flight[request_id] = slot
+        self.requests.put((request_id, op, slot, shape, area, self.scale_lock))
+        return request_id
+
+    def collect(self, request_id, timeout=None):
+        """Wait for the (value, area, details) result of a submitted request"""
+        timeout = self.RESULT_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + (timeout if self.ready else self.STARTUP_TIMEOUT)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._restart('timeout')
+                raise TimeoutError(f"Detector worker did not answer request {request_id}")
+            try:
+                result_id, slot, value, area, details = self.results.get(timeout=min(remaining, self.POLL_INTERVAL))
+            except queue.Empty:
+                if not self.process.is_alive():
+                    self._restart('worker exited')
+                    raise RuntimeError(f"Detector worker exited before answering request {request_id}")
+                continue
+            if result_id == READY:
+                self.ready = True
+                deadline = time.monotonic() + timeout
+                continue
+            if self.in_flight.pop(result_id, None) is None:
+                continue    # Not ours (anymore); its slot was already reclaimed
+            self.free_slots.append(slot)
+            if result_id == request_id:
+                return value, area, details
+
+    def _local(self, error):
+        """In-process fallback for an oversized frame, synced with the remote settings"""
+        if self.local_detector is None:
+            logger.warning('detector_frame_oversized',
+                           "⚠️ %s - detecting oversized frames in-process (raise DETECTOR_MAX_FRAME_SIZE)",
+                           error, slot_bytes=self.ring.slot_bytes)
+            self.local_detector = KeyDetector(self.templates)
+        local = self.local_detector
+        local.key_sequence_area = self.key_sequence_area
+        local.scale_lock = self.scale_lock
+        return local
+
+    def auto_detect_minigame_area(self, screen):
+        self.last_acquisition = None
+        try:
+            found, area, acquisition = self.collect(self.submit(OP_AREA, screen))
+        except ValueError as e:
+            local = self._local(e)
+            found = local.auto_detect_minigame_area(screen)
+            area, acquisition = local.key_sequence_area, local.last_acquisition
+        except (RuntimeError, TimeoutError):
+            return False
+        if found:
+            self.key_sequence_area = area
+            self.last_acquisition = acquisition
+        return bool(found)
+
+    def detect_key_sequence(self, image):
+        self.last_detections = []
+        if not self.key_sequence_area:
+            return []
+        try:
+            sequence, _, detections = self.collect(self.submit(OP_SEQUENCE, image))
+        except ValueError as e:
+            local = self._local(e)
+            sequence, detections = local.detect_key_sequence(image), local.last_detections
+        except (RuntimeError, TimeoutError):
+            return []
+        self.last_detections = detections or []
+        return sequence or []
+
+    def get_detection_area(self):
+        return self.key_sequence_area
+
+    def close(self):
+        """Stop the worker process and release the shared memory"""
+        if self.process is not None and self.process.is_alive():
+            self.requests.put((-1, OP_STOP, 0, (0,), None, None))
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.ring.close()
+
+    def __del__(self):
+        if getattr(self, 'process', None) is not None:
+            self.close()
+
+
+def benchmark_round_trip(templates, frames, repeats=3):
+    """
+    Compare per-frame detection time in-process against the worker process.
+
+    Returns a dict of mean milliseconds per frame for each mode and the
+    round-trip overhead added by the shared memory transport.
+    """
+    local = KeyDetector(templates)
+    remote = RemoteKeyDetector(templates)
+    try:
+        local.auto_detect_minigame_area(frames[0])
+        remote.auto_detect_minigame_area(frames[0])
+
+        def run(detector):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for frame in frames:
+                    detector.detect_key_sequence(frame)
+            return (time.perf_counter() - start) * 1000 / (repeats * len(frames))
+
+        local_ms = run(local)
+        remote_ms = run(remote)
+    finally:
+        remote.close()
+
+    return {
+        'frames': len(frames) * repeats,
+        'in_process_ms': local_ms,
+        'out_of_process_ms': remote_ms,
+        'overhead_ms': remote_ms - local_ms,
+    }
+
+
+if __name__ == '__main__':
+    import cv2
+    import sys
+    from launcher_template_manager import TemplateManager
+
+    manager = TemplateManager()
+    manager.auto_load_templates()
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python launcher_detector_process.py frame1.png [frame2.png ...]")
+        sys.exit(1)
+
+    frames = [cv2.imread(path) for path in paths]
+    stats = benchmark_round_trip(manager.get_templates(), frames)
+    for name, value in stats.items():
+        print(f"{name:>20}: {value:.3f}" if isinstance(value, float) else f"{name:>20}: {value}")
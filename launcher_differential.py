@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# differential.py - Differential Harness for Detection Paths
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# ⚖️ FiveM Fishing Bot - Reference vs. Optimized Detection
+# Description: Feeds the same recorded and synthetic frames to the reference KeyDetector
+#              and to every candidate path, and reports divergences in sequence, area or
+#              confidence beyond a tolerance
+# Usage: python launcher_differential.py [--frames-dir captures/] [--candidates pool nms_flags]
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from launcher_bench_common import InlineExecutor, machine_info
+from launcher_key_detector import KeyDetector
+from launcher_synthetic_frames import CONDITIONS, RESOLUTIONS, FrameRenderer
+
+AREA_TOLERANCE = 2          # Pixels per area coordinate
+CONFIDENCE_TOLERANCE = 1e-4
+MAX_EXAMPLES = 20           # Divergences kept per candidate in the report
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+@dataclass
+class Frame:
+    """One input frame; `area` is a known prompt box (synthetic) or None (recorded)"""
+    source: str
+    image: Any
+    area: Optional[Tuple[int, int, int, int]] = None
+
+
+# ─── Candidate detection paths ─────────────────────────────────────────────────────────
+
+def _variant(nms=None, intelligent_filter=None):
+    """KeyDetector subclass with replaced post-processing steps"""
+    overrides = {}
+    if nms is not None:
+        overrides['_apply_nms'] = lambda self, matches, overlap_threshold=0.3: nms(matches, overlap_threshold)
+    if intelligent_filter is not None:
+        overrides['_intelligent_filter'] = lambda self, detected_keys: intelligent_filter(detected_keys)
+    return type('KeyDetectorVariant', (KeyDetector,), overrides)
+
+
+def _inprocess(cls=KeyDetector, pool: bool = False):
+    def factory(templates):
+        executor = ThreadPoolExecutor(max_workers=4) if pool else InlineExecutor()
+        return cls(templates, executor=executor), lambda: executor.shutdown(wait=False)
+    return factory
+
+
+def _process(templates):
+    from launcher_detector_process import RemoteKeyDetector
+    detector = RemoteKeyDetector(templates)
+    return detector, detector.close
+
+
+def _primitive(name: str):
+    def factory(templates):
+        import launcher_bench_primitives as primitives
+        cls = {
+            'nms_flags': lambda: _variant(nms=primitives.nms_flags),
+            'nms_numpy': lambda: _variant(nms=primitives.nms_numpy),
+            'filter_sweep': lambda: _variant(intelligent_filter=primitives.filter_sweep),
+        }[name]()
+        return _inprocess(cls)(templates)
+    return factory
+
+
+# name -> factory(templates) returning (detector, close); new engines register here
+CANDIDATES: Dict[str, Callable[[Dict[str, Any]], Tuple[Any, Callable[[], None]]]] = {
+    'pool': _inprocess(pool=True),
+    'process': _process,
+    'nms_flags': _primitive('nms_flags'),
+    'nms_numpy': _primitive('nms_numpy'),
+    'filter_sweep': _primitive('filter_sweep'),
+}
+
+
+def register_candidate(name: str, factory: Callable[[Dict[str, Any]], Tuple[Any, Callable[[], None]]]) -> None:
+    CANDIDATES[name] = factory
+
+
+# ─── Frame sources ─────────────────────────────────────────────────────────────────────
+
+def synthetic_frames(templates: Dict[str, Any], resolutions: Sequence[str], conditions: Sequence[str],
+                     count: int, seed: int) -> Iterator[Frame]:
+    for resolution in resolutions:
+        width, height = RESOLUTIONS[resolution]
+        for condition_name in conditions:
+            renderer = FrameRenderer(templates, seed=seed)
+            for i in range(count):
+                sample = renderer.render(width, height, CONDITIONS[condition_name])
+                yield Frame(f"synthetic/{resolution}/{condition_name}/{i}", sample.image, sample.area)
+
+
+def recorded_frames(directory: str) -> Iterator[Frame]:
+    """Every image under `directory` (BGR, as captured)"""
+    import cv2
+    for root, _, files in sorted(os.walk(directory)):
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, name)
+                image = cv2.imread(path, cv2.IMREAD_COLOR)
+                if image is not None:
+                    yield Frame(os.path.relpath(path, directory), image)
+
+
+# ─── Comparison ────────────────────────────────────────────────────────────────────────
+
+def acquire(detector, image) -> Dict[str, Any]:
+    """Acquire the prompt area from scratch"""
+    detector.key_sequence_area = None
+    found = bool(detector.auto_detect_minigame_area(image))
+    area = detector.get_detection_area() if found else None
+    acquisition = getattr(detector, 'last_acquisition', None) if found else None
+    return {
+        'found': found,
+        'area': tuple(int(v) for v in area) if area else None,
+        'area_confidence': acquisition.get('confidence') if acquisition else None,
+    }
+
+
+def read(detector, image, area: Optional[Tuple[int, int, int, int]]) -> Dict[str, Any]:
+    """Read the key sequence inside `area`"""
+    detector.key_sequence_area = area
+    sequence = list(detector.detect_key_sequence(image)) if area else []
+    detections = getattr(detector, 'last_detections', None)
+    return {
+        'sequence': sequence,
+        'key_confidences': [float(d['confidence']) for d in detections] if detections is not None else None,
+    }
+
+
+def diverges(reference: Dict[str, Any], candidate: Dict[str, Any], area_tolerance: int,
+             confidence_tolerance: float) -> List[str]:
+    """Names of the fields where the candidate differs beyond tolerance"""
+    fields = []
+    if reference['found'] != candidate['found']:
+        fields.append('found')
+    elif reference['area'] and candidate['area'] and any(
+            abs(a - b) > area_tolerance for a, b in zip(reference['area'], candidate['area'])):
+        fields.append('area')
+
+    if reference['sequence'] != candidate['sequence']:
+        fields.append('sequence')
+    else:
+        pairs = []
+        if reference['area_confidence'] is not None and candidate['area_confidence'] is not None:
+            pairs.append((reference['area_confidence'], candidate['area_confidence']))
+        if reference['key_confidences'] is not None and candidate['key_confidences'] is not None:
+            pairs.extend(zip(reference['key_confidences'], candidate['key_confidences']))
+        if any(abs(a - b) > confidence_tolerance for a, b in pairs):
+            fields.append('confidence')
+    return fields
+
+
+def run_differential(templates: Dict[str, Any], frames: Iterator[Frame], candidates: Sequence[str],
+                     area_tolerance: int = AREA_TOLERANCE, confidence_tolerance: float = CONFIDENCE_TOLERANCE,
+                     progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    reference, close_reference = _inprocess()(templates)
+    detectors = {}
+    # confidence_compared counts frames where the candidate exposed confidences to compare
+    results = {name: {'frames': 0, 'divergent_frames': 0, 'confidence_compared': 0, 'fields': {}, 'examples': []}
+               for name in candidates}
+    total = 0
+    try:
+        for name in candidates:
+            detectors[name] = CANDIDATES[name](templates)
+
+        for frame in frames:
+            total += 1
+            expected = acquire(reference, frame.image)
+            # Sequence reads use the reference area so only the read itself is compared;
+            # fall back to the known prompt box when the reference fails to acquire
+            area = expected['area'] or frame.area
+            expected.update(read(reference, frame.image, area))
+
+            for name, (detector, _) in detectors.items():
+                actual = acquire(detector, frame.image)
+                actual.update(read(detector, frame.image, area))
+                fields = diverges(expected, actual, area_tolerance, confidence_tolerance)
+                result = results[name]
+                result['frames'] += 1
+                if actual['key_confidences'] is not None or actual['area_confidence'] is not None:
+                    result['confidence_compared'] += 1
+                if not fields:
+                    continue
+                result['divergent_frames'] += 1
+                for field_name in fields:
+                    result['fields'][field_name] = result['fields'].get(field_name, 0) + 1
+                if len(result['examples']) < MAX_EXAMPLES:
+                    result['examples'].append({'frame': frame.source, 'fields': fields,
+                                               'reference': expected, 'candidate': actual})
+                if progress:
+                    progress(f"⚠️ {name}: {frame.source} differs in {', '.join(fields)}")
+    finally:
+        close_reference()
+        for _, close in detectors.values():
+            close()
+
+    return {
+        'benchmark': 'differential',
+        'generated_at': time.time(),
+        'machine': machine_info(),
+        'parameters': {'area_tolerance': area_tolerance, 'confidence_tolerance': confidence_tolerance},
+        'frames': total,
+        'candidates': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check detection paths against the reference KeyDetector")
+    parser.add_argument('--candidates', nargs='+', default=list(CANDIDATES), choices=list(CANDIDATES))
+    parser.add_argument('--frames-dir', help="directory of recorded frames (PNG/JPG/BMP)")
+    parser.add_argument('--synthetic', type=int, default=10, help="synthetic frames per case (0 = none)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--resolutions', nargs='+', default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument('--conditions', nargs='+', default=list(CONDITIONS), choices=list(CONDITIONS))
+    parser.add_argument('--area-tolerance', type=int, default=AREA_TOLERANCE)
+    parser.add_argument('--confidence-tolerance', type=float, default=CONFIDENCE_TOLERANCE)
+    parser.add_argument('--out', default='differential.json', help="JSON report file")
+    args = parser.parse_args(argv)
+
+    from launcher_template_manager import TemplateManager
+    manager = TemplateManager()
+    if not manager.auto_load_templates():
+        print("Templates (assets/W.png, A.png, S.png, D.png) not found", file=sys.stderr)
+        return 2
+    templates = manager.get_templates()
+
+    def frames() -> Iterator[Frame]:
+        if args.frames_dir:
+            yield from recorded_frames(args.frames_dir)
+        if args.synthetic:
+            yield from synthetic_frames(templates, args.resolutions, args.conditions, args.synthetic, args.seed)
+
+    report = run_differential(templates, frames(), args.candidates, args.area_tolerance,
+                              args.confidence_tolerance, progress=print)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    diverged = False
+    for name, result in report['candidates'].items():
+        status = '✅' if not result['divergent_frames'] else '❌'
+        diverged = diverged or bool(result['divergent_frames'])
+        print(f"{status} {name:<14} {result['divergent_frames']}/{result['frames']} frames differ {result['fields']}")
+    print(f"Report written to {args.out}")
+    return 1 if diverged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+# evaluate.py - Parallel Offline Evaluator for Recorded Datasets
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 📊 FiveM Fishing Bot - Offline Evaluation
+# Description: Runs KeyDetector over recorded frame datasets on a process pool and reports
+#              per-frame sequences, confidences and timings plus aggregate accuracy and
+#              throughput
+# Usage: python launcher_evaluate.py recordings/ [--workers 8] [--frames-out frames.jsonl]
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from launcher_bench_common import InlineExecutor, latency_summary
+from launcher_config import BotConfig
+
+CHUNK_FRAMES = 256          # Frames per task; large enough to amortise task overhead
+MAX_CACHED_DETECTORS = 8    # Settings combinations kept per worker
+IN_FLIGHT_PER_WORKER = 2    # Queued tasks per worker; bounds results held in memory
+
+# Worker process state (set by _init_worker)
+_templates: Dict[str, Any] = {}
+_detectors: Dict[Tuple, Any] = {}
+_defaults: Dict[str, Any] = {}
+
+
+def find_datasets(paths: Sequence[str]) -> List[str]:
+    """Every dataset directory (containing the manifest) at or below `paths`"""
+    from launcher_frame_dataset import MANIFEST
+    found = []
+    for path in paths:
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            if MANIFEST in files:
+                found.append(root)
+                dirs[:] = []            # Chunks live flat inside a dataset
+    return found
+
+
+def parse_label(label: str) -> Optional[List[str]]:
+    """Key list from a label ('W A S D' or compact 'WASD'; [] = no prompt), None if unlabeled"""
+    from launcher_frame_dataset import UNLABELED
+    label = label.strip()
+    if label == UNLABELED:
+        return None
+    return label.split() if ' ' in label else list(label)
+
+
+def load_labels(path: str) -> Dict[Tuple[str, int], str]:
+    """
+    Ground-truth labels as JSON lines of {"session", "index", "label"}
+    ("" = no prompt). Entries without a label or marked unlabeled are
+    skipped; a detector's own 'sequence' is never taken as a label.
+    """
+    from launcher_frame_dataset import UNLABELED
+    labels = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                label = entry.get('label')
+                if label is None or label.strip() == UNLABELED:
+                    continue
+                labels[(os.path.normpath(entry['session']), int(entry['index']))] = label
+    return labels
+
+
+def _init_worker(templates: Dict[str, Any]) -> None:
+    global _templates
+    _templates = templates
+    try:
+        import cv2
+        # One OpenCV thread per process: the pool already uses every core
+        cv2.setNumThreads(1)
+    except Exception:
+        pass
+
+
+def apply_settings(settings: Optional[Dict[str, Any]]) -> None:
+    """
+    Set BotConfig overrides (name -> value) for this process; settings
+    overridden by an earlier call and absent now revert to their defaults.
+    """
+    for name, value in _defaults.items():
+        setattr(BotConfig, name, value)
+    for name, value in (settings or {}).items():
+        _defaults.setdefault(name, getattr(BotConfig, name))
+        setattr(BotConfig, name, value)
+
+
+def detector_for(settings: Optional[Dict[str, Any]]):
+    """Inline KeyDetector for a settings combination, cached per worker"""
+    from launcher_key_detector import KeyDetector
+    key = tuple(sorted((settings or {}).items()))
+    detector = _detectors.get(key)
+    if detector is None:
+        if len(_detectors) >= MAX_CACHED_DETECTORS:
+            _detectors.clear()
+        apply_settings(settings)
+        detector = _detectors[key] = KeyDetector(_templates, executor=InlineExecutor())
+    return detector
+
+
+def evaluate_frame(detector, dataset, i: int) -> Dict[str, Any]:
+    """
+    Acquire the area from scratch and read the sequence on frame i.
+
+    Detection runs on the screen-sized frame, as in the bot, so CLAHE
+    tiles and the brightness statistics behind the adaptive threshold
+    match production; the area is in screen coordinates. Outside the
+    recorded ROI the frame is black unless the session was recorded with
+    FRAME_RECORDING_FULL_FRAMES.
+    """
+    record = dataset[i][1]
+    image = dataset.full_frame(i)
+
+    detector.key_sequence_area = None
+    t0 = time.perf_counter()
+    found = detector.auto_detect_minigame_area(image)
+    t1 = time.perf_counter()
+    sequence = detector.detect_key_sequence(image) if found else []
+    t2 = time.perf_counter()
+
+    area = detector.get_detection_area() if found else None
+    acquisition = detector.last_acquisition if found else None
+    return {
+        'session': dataset.directory,
+        'index': i,
+        'timestamp': float(record['timestamp']),
+        'label': dataset.label(i),
+        'found': bool(found),
+        'area': [int(v) for v in area] if area else None,
+        'area_confidence': acquisition.get('confidence') if acquisition else None,
+        'sequence': list(sequence),
+        'confidences': [float(d['confidence']) for d in detector.last_detections],
+        'acquire_ms': 1000.0 * (t1 - t0),
+        'read_ms': 1000.0 * (t2 - t1),
+    }
+
+
+def evaluate_range(directory: str, start: int, stop: int,
+                   settings: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Evaluate frames [start, stop) of one dataset; runs in a worker"""
+    from launcher_frame_dataset import FrameDataset
+    detector = detector_for(settings)
+    apply_settings(settings)            # Values read at call time (e.g. MIN_DISTANCE)
+    dataset = FrameDataset(directory)
+    return [evaluate_frame(detector, dataset, i) for i in range(start, stop)]
+
+
+def plan_tasks(datasets: Sequence[str], chunk_frames: int = CHUNK_FRAMES,
+               limit: Optional[int] = None) -> List[Tuple[str, int, int]]:
+    """(dataset, start, stop) ranges; `limit` caps the frames taken per dataset"""
+    from launcher_frame_dataset import FrameDataset
+    tasks = []
+    for directory in datasets:
+        total = len(FrameDataset(directory))
+        if limit is not None:
+            total = min(total, limit)
+        for start in range(0, total, chunk_frames):
+            tasks.append((directory, start, min(total, start + chunk_frames)))
+    return tasks
+
+
+def create_pool(templates: Dict[str, Any], workers: Optional[int] = None) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=mp.get_context('spawn'),
+                               initializer=_init_worker, initargs=(templates,))
+
+
+def run_bounded(pool: ProcessPoolExecutor, calls: Iterable[Tuple[Any, Callable, tuple]],
+                window: int) -> Iterator[Tuple[Any, Any]]:
+    """
+    Submit (tag, fn, args) calls with at most `window` in flight and yield
+    (tag, result) as each finishes; a consumed future is dropped at once,
+    so results never pile up in memory.
+    """
+    calls = iter(calls)
+    pending: Dict[Any, Any] = {}
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < window:
+            call = next(calls, None)
+            if call is None:
+                exhausted = True
+                break
+            tag, fn, args = call
+            pending[pool.submit(fn, *args)] = tag
+        if not pending:
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future.result()
+
+
+def run_tasks(pool: ProcessPoolExecutor, tasks: Sequence[Tuple[str, int, int]],
+              settings: Optional[Dict[str, Any]] = None,
+              window: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Yield each task's per-frame results as soon as it finishes"""
+    window = window or IN_FLIGHT_PER_WORKER * (os.cpu_count() or 1)
+    calls = ((None, evaluate_range, (directory, start, stop, settings)) for directory, start, stop in tasks)
+    for _, results in run_bounded(pool, calls, window):
+        yield results
+
+
+class Aggregate:
+    """
+    Running accuracy and timing totals over per-frame results.
+
+    Every labeled frame is scored: a prompt frame is exact when the whole
+    sequence matches, a no-prompt frame when nothing is read - anything
+    read there is a false positive.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.found = 0
+        self.read = 0
+        self.labeled = 0
+        self.exact = 0
+        self.negatives = 0
+        self.false_positives = 0
+        self.keys_right = 0
+        self.keys_total = 0
+        self.acquire_times: List[float] = []
+        self.read_times: List[float] = []
+        self.sessions: Dict[str, Dict[str, int]] = {}
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.frames += 1
+        self.found += result['found']
+        self.read += bool(result['sequence'])
+        self.acquire_times.append(result['acquire_ms'] / 1000.0)
+        if result['found']:
+            self.read_times.append(result['read_ms'] / 1000.0)
+        session = self.sessions.setdefault(result['session'],
+                                           {'frames': 0, 'labeled': 0, 'exact': 0, 'false_positives': 0})
+        session['frames'] += 1
+
+        label = parse_label(result['label'])
+        if label is None:
+            return
+        self.labeled += 1
+        exact = result['sequence'] == label
+        self.exact += exact
+        session['labeled'] += 1
+        session['exact'] += exact
+        if label:
+            self.keys_total += len(label)
+            self.keys_right += sum(a == b for a, b in zip(result['sequence'], label))
+        else:
+            self.negatives += 1
+            self.false_positives += not exact
+            session['false_positives'] += not exact
+
+    def summary(self, wall: float, workers: int) -> Dict[str, Any]:
+        return {
+            'frames': self.frames,
+            'acquired_rate': self.found / self.frames if self.frames else 0.0,
+            'read_rate': self.read / self.frames if self.frames else 0.0,
+            'labeled_frames': self.labeled,
+            'accuracy': self.exact / self.labeled if self.labeled else None,
+            'key_accuracy': self.keys_right / self.keys_total if self.keys_total else None,
+            'no_prompt_frames': self.negatives,
+            'false_positives': self.false_positives,
+            'false_positive_rate': self.false_positives / self.negatives if self.negatives else None,
+            'acquire': latency_summary(self.acquire_times),
+            'read': latency_summary(self.read_times),
+            'wall_seconds': wall,
+            'workers': workers,
+            'throughput_fps': self.frames / wall if wall > 0 else 0.0,
+            'sessions': self.sessions,
+        }
+
+
+def evaluate(paths: Sequence[str], templates: Dict[str, Any], workers: Optional[int] = None,
+             chunk_frames: int = CHUNK_FRAMES, limit: Optional[int] = None,
+             settings: Optional[Dict[str, Any]] = None,
+             labels: Optional[Dict[Tuple[str, int], str]] = None,
+             on_frame: Optional[Callable[[Dict[str, Any]], None]] = None,
+             progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    datasets = find_datasets(paths)
+    tasks = plan_tasks(datasets, chunk_frames, limit)
+    workers = workers or os.cpu_count()
+    aggregate = Aggregate()
+    start = time.perf_counter()
+    with create_pool(templates, workers) as pool:
+        for done, results in enumerate(run_tasks(pool, tasks, settings, IN_FLIGHT_PER_WORKER * workers), 1):
+            for result in results:
+                if labels:
+                    result['label'] = labels.get((os.path.normpath(result['session']), result['index']),
+                                                 result['label'])
+                aggregate.add(result)
+                if on_frame:
+                    on_frame(result)
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(f"{done}/{len(tasks)} tasks, {aggregate.frames} frames, "
+                         f"{aggregate.frames / elapsed if elapsed else 0:.0f} fps")
+    report = aggregate.summary(time.perf_counter() - start, workers)
+    report.update({'datasets': datasets, 'settings': settings or {}})
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate KeyDetector on recorded frame datasets")
+    parser.add_argument('paths', nargs='+', help="dataset directories or folders containing them")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk', type=int, default=CHUNK_FRAMES, help="frames per task")
+    parser.add_argument('--limit', type=int, help="frames per dataset")
+    parser.add_argument('--labels', help="JSON lines of session/index/label overriding recorded labels "
+                                         "(\"\" = no prompt)")
+    parser.add_argument('--frames-out', help="write per-frame results as JSON lines")
+    parser.add_argument('--out', default='evaluation.json', help="summary JSON file")
+    args = parser.parse_args(argv)
+
+    from launcher_template_manager import TemplateManager
+    manager = TemplateManager()
+    if not manager.auto_load_templates():
+        print("Templates (assets/W.png, A.png, S.png, D.png) not found", file=sys.stderr)
+        return 2
+
+    frames_file = open(args.frames_out, 'w', encoding='utf-8') if args.frames_out else None
+    try:
+        on_frame = (lambda result: frames_file.write(json.dumps(result) + '\n')) if frames_file else None
+        report = evaluate(args.paths, manager.get_templates(), args.workers, args.chunk, args.limit,
+                          labels=load_labels(args.labels) if args.labels else None,
+                          on_frame=on_frame, progress=print)
+    finally:
+        if frames_file:
+            frames_file.close()
+
+    if not report['datasets']:
+        print("No datasets found", file=sys.stderr)
+        return 2
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    accuracy = report['accuracy']
+    print(f"{report['frames']} frames in {report['wall_seconds']:.1f}s "
+          f"({report['throughput_fps']:.0f} fps on {report['workers']} workers)")
+    print(f"acquired {100 * report['acquired_rate']:.1f}%  read {100 * report['read_rate']:.1f}%  "
+          f"accuracy {'n/a' if accuracy is None else f'{100 * accuracy:.1f}%'} "
+          f"({report['labeled_frames']} labeled)")
+    if report['no_prompt_frames']:
+        print(f"false positives {report['false_positives']}/{report['no_prompt_frames']} no-prompt frames")
+    print(f"Summary written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# execution_worker.py - Background Key Execution Worker
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional
+
+from launcher_metrics import metrics
+
+
+class ExecutionWorker:
+    """
+    Runs KeyExecutor.execute_key_sequence on a dedicated thread.
+
+    Commands go through a bounded queue and each submission returns a
+    Future, so the bot loop keeps capturing and detecting while focus
+    switching and key sending happen here.
+    """
+
+    def __init__(self, key_executor, max_pending: int = 1):
+        self.key_executor = key_executor
+        self.commands = queue.Queue(maxsize=max_pending)
+        self.in_flight = None
+        self._thread = threading.Thread(target=self._run, name="KeyExecutionWorker", daemon=True)
+        self._thread.start()
+
+    def submit(self, sequence, hwnd) -> Optional[Future]:
+        """Queue a sequence; returns None if the queue is full"""
+        future = Future()
+        try:
+            self.commands.put_nowait((list(sequence), hwnd, future, time.perf_counter()))
+        except queue.Full:
+            return None
+        return future
+
+    @property
+    def busy(self) -> bool:
+        """True while a command is queued or being executed"""
+        return self.in_flight is not None or not self.commands.empty()
+
+    def _run(self) -> None:
+        while True:
+            command = self.commands.get()
+            if command is None:
+                break
+
+            sequence, hwnd, future, submitted_at = command
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            self.in_flight = future
+            try:
+                result = self.key_executor.execute_key_sequence(sequence, hwnd)
+                # Submit-to-sent time, including the wait in the queue
+                metrics.record('execute.commit_latency', time.perf_counter() - submitted_at, submitted_at)
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self.in_flight = None
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel queued commands and stop the worker thread"""
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            if command is not None:
+                command[2].cancel()
+
+        try:
+            self.commands.put_nowait(None)
+        except queue.Full:
+            pass
+
+        if wait:
+            self._thread.join()
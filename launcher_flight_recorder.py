@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# flight_recorder.py - Ring Buffer of Recent Frames Dumped on Misreads
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 🛩️ FiveM Fishing Bot - Flight Recorder
+# Description: Keeps the last few seconds of downsampled frames, detections and state
+#              decisions in preallocated memory and writes them to disk in the
+#              background when validation or execution fails (or on demand)
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from launcher_config import BotConfig, data_path
+from launcher_logging import get_logger
+
+logger = get_logger('flight_recorder')
+
+
+class FlightRecorder:
+    """
+    Fixed-size ring of the most recent frames.
+
+    record() copies a strided (downsampled) view of the screen into a
+    preallocated slot and stores references to the current detections and
+    area; nothing is formatted or allocated per frame. dump() copies the
+    ring out under the lock and hands it to a writer thread, so a dump
+    never waits for the disk.
+    """
+
+    def __init__(self, slots: Optional[int] = None, stride: Optional[int] = None,
+                 directory: Optional[str] = None, min_dump_interval: Optional[float] = None,
+                 max_dumps: Optional[int] = None, clock: Callable[[], float] = time.time):
+        self.slots = slots or BotConfig.FLIGHT_RECORDER_FRAMES
+        self.stride = stride or BotConfig.FLIGHT_RECORDER_STRIDE
+        self.directory = directory or data_path(BotConfig.FLIGHT_RECORDER_DIR)
+        self.min_dump_interval = (BotConfig.FLIGHT_RECORDER_MIN_INTERVAL
+                                  if min_dump_interval is None else min_dump_interval)
+        self.max_dumps = BotConfig.FLIGHT_RECORDER_MAX_DUMPS if max_dumps is None else max_dumps
+        self.clock = clock
+        self.lock = threading.Lock()
+
+        self.frames: Optional[np.ndarray] = None          # Allocated on the first frame
+        self.times = np.zeros(self.slots, dtype=np.float64)
+        self.states: List[Optional[str]] = [None] * self.slots
+        self.detections: List[Any] = [None] * self.slots
+        self.areas: List[Any] = [None] * self.slots
+        self.head = 0
+        self.count = 0
+        self.last_screen = None                          # Weak reference, never pins a screenshot
+        self.last_dump_at = float('-inf')
+        self.dumps = 0
+
+    def record(self, screen: np.ndarray, now: float, state: str, detections: Any = None,
+               area: Any = None) -> None:
+        """Store one frame (repeated cached frames are skipped)"""
+        if self.last_screen is not None and self.last_screen() is screen:
+            return
+        self.last_screen = weakref.ref(screen)
+        small = screen[::self.stride, ::self.stride]
+        with self.lock:
+            if self.frames is None or self.frames.shape[1:] != small.shape:
+                self.frames = np.empty((self.slots,) + small.shape, dtype=small.dtype)
+                self.count = 0
+            slot = self.head
+            np.copyto(self.frames[slot], small)
+            self.times[slot] = now
+            self.states[slot] = state
+            self.detections[slot] = detections
+            self.areas[slot] = area
+            self.head = (slot + 1) % self.slots
+            self.count = min(self.count + 1, self.slots)
+
+    def dump(self, reason: str, context: Optional[Dict[str, Any]] = None, force: bool = False) -> Optional[str]:
+        """
+        Write the ring to disk in the background; returns the file stem or
+        None when nothing is recorded or (unless forced) the last dump was
+        too recent.
+        """
+        wall = self.clock()
+        with self.lock:
+            if not self.count or (not force and wall - self.last_dump_at < self.min_dump_interval):
+                return None
+            self.last_dump_at = wall
+            order = [(self.head - self.count + i) % self.slots for i in range(self.count)]
+            frames = self.frames[order]           # Fancy indexing copies
+            times = self.times[order]
+            records = [{
+                'time': float(self.times[i]),
+                'state': self.states[i],
+                'area': [int(v) for v in self.areas[i]] if self.areas[i] else None,
+                'detections': _describe_detections(self.detections[i]),
+            } for i in order]
+
+        self.dumps += 1
+        safe_reason = ''.join(c if c.isalnum() else '_' for c in reason)[:40]
+        stem = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(wall))}"
+                                            f"-{self.dumps:03d}-{safe_reason}")
+        summary = {
+            'reason': reason,
+            'dumped_at': wall,
+            'stride': self.stride,
+            'frames': records,
+            'context': context or {},
+        }
+        threading.Thread(target=self._write, args=(stem, frames, times, summary),
+                         name='FlightRecorderDump', daemon=True).start()
+        return stem
+
+    def _write(self, stem: str, frames: np.ndarray, times: np.ndarray, summary: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            np.savez_compressed(stem + '.npz', frames=frames, times=times)
+            with open(stem + '.json', 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, default=str)
+            self._prune()
+            logger.info('flight_recorder_dump', "🛩️ Flight recorder dumped %d frames (%s): %s",
+                        len(frames), summary['reason'], stem, reason=summary['reason'], path=stem)
+        except Exception as e:
+            logger.warning('flight_recorder_dump_failed', "⚠️ Flight recorder dump failed: %s", e)
+
+    def _prune(self) -> None:
+        """Keep only the newest `max_dumps` dumps"""
+        if not self.max_dumps:
+            return
+        stems = sorted({name.rsplit('.', 1)[0] for name in os.listdir(self.directory)
+                        if name.endswith(('.npz', '.json'))})
+        for stem in stems[:-self.max_dumps]:
+            for ext in ('.npz', '.json'):
+                try:
+                    os.remove(os.path.join(self.directory, stem + ext))
+                except OSError:
+                    pass
+
+
+def _describe_detections(detections: Any) -> Optional[List[Dict[str, Any]]]:
+    if not detections:
+        return None
+    return [{
+        'key': d.get('key'),
+        'x': int(d.get('x', 0)),
+        'y': int(d.get('y', 0)),
+        'confidence': float(d.get('confidence', 0.0)),
+        'scale': d.get('scale'),
+    } for d in detections]
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+# frame_dataset.py - Memory-Mapped Frame Datasets for Recorded Sessions
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 🎞️ FiveM Fishing Bot - Frame Recorder and Reader
+# Description: Appends ROI-cropped grayscale frames with timestamps to chunked .npy files
+#              from a background thread, and reads them back as zero-copy memmap views
+# Labels: ground truth only - '?' (UNLABELED) when nobody knows, '' for no prompt on screen,
+#         else the compact sequence ('WASD'); bot sessions are recorded unlabeled
+# Layout: <dataset>/dataset.json              manifest (chunks, counts, session metadata)
+#         <dataset>/chunk_00000.frames.npy    uint8 (chunk_frames, h, w)
+#         <dataset>/chunk_00000.index.npy     INDEX_DTYPE (chunk_frames,)
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import bisect
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from launcher_logging import get_logger
+
+FORMAT = 'fivem-frames'
+VERSION = 2                 # 1: '' meant "not labeled" (no ground truth was recorded)
+MANIFEST = 'dataset.json'
+
+UNLABELED = '?'             # No ground truth for the frame
+NO_PROMPT = ''              # Ground truth: no prompt on screen
+
+# Per-frame record: capture time, ROI position in the full frame, full frame size, label
+INDEX_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('x', '<i4'), ('y', '<i4'),
+    ('frame_width', '<i4'), ('frame_height', '<i4'),
+    ('label', 'S16'),
+])
+
+logger = get_logger('frame_dataset')
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image
+    import cv2
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+
+class _Chunk:
+    """
+    One frames/index file pair, preallocated and filled through memmaps.
+
+    A chunk closed before it is full (session end, ROI size change) is
+    truncated to the frames actually written.
+    """
+
+    def __init__(self, directory: str, number: int, shape: Tuple[int, int], capacity: int):
+        stem = f"chunk_{number:05d}"
+        self.directory = directory
+        self.frames_file = f"{stem}.frames.npy"
+        self.index_file = f"{stem}.index.npy"
+        self.shape = shape
+        self.capacity = capacity
+        self.count = 0
+        self.frames = open_memmap(os.path.join(directory, self.frames_file), mode='w+',
+                                  dtype=np.uint8, shape=(capacity,) + shape)
+        self.index = open_memmap(os.path.join(directory, self.index_file), mode='w+',
+                                 dtype=INDEX_DTYPE, shape=(capacity,))
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def append(self, gray: np.ndarray, record: tuple) -> None:
+        self.frames[self.count] = gray
+        self.index[self.count] = record
+        self.count += 1
+
+    def flush(self) -> None:
+        self.frames.flush()
+        self.index.flush()
+
+    def close(self) -> None:
+        self.flush()
+        # Drop the maps so the files can be opened (or moved) on Windows
+        self.frames = None
+        self.index = None
+        if self.count < self.capacity:
+            self._truncate()
+
+    def _truncate(self) -> None:
+        for name in (self.frames_file, self.index_file):
+            path = os.path.join(self.directory, name)
+            tmp_path = path[:-len('.npy')] + '.tmp.npy'
+            data = np.load(path, mmap_mode='r')
+            np.save(tmp_path, data[:self.count])
+            del data
+            os.replace(tmp_path, path)
+
+    def describe(self) -> Dict[str, Any]:
+        return {'frames': self.frames_file, 'index': self.index_file,
+                'shape': list(self.shape), 'count': self.count}
+
+
+class FrameRecorder:
+    """
+    Records a session into a frame dataset.
+
+    record() only enqueues the captured array (no copy, no conversion);
+    the writer thread crops the ROI, converts it to grayscale and copies
+    it into the current chunk. A new chunk starts when the current one is
+    full or the ROI size changes; partly filled chunks are cut down to
+    their frames when closed. When the writer falls behind, frames are
+    counted and dropped instead of blocking the capture loop; the queue is
+    short because every entry pins a whole screenshot.
+    """
+
+    def __init__(self, directory: str, chunk_frames: int = 256, queue_size: int = 8,
+                 flush_every: int = 64, metadata: Optional[Dict[str, Any]] = None):
+        self.directory = directory
+        self.chunk_frames = chunk_frames
+        self.flush_every = flush_every
+        self.metadata = dict(metadata or {})
+        self.created_at = time.time()
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.chunks: List[_Chunk] = []
+        self.current: Optional[_Chunk] = None
+        self.recorded = 0
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(target=self._run, name='FrameRecorder', daemon=True)
+        self.thread.start()
+
+    def record(self, frame: np.ndarray, timestamp: float,
+               roi: Optional[Tuple[int, int, int, int]] = None, label: str = UNLABELED,
+               block: bool = False) -> bool:
+        """
+        Queue a captured frame (the caller must not modify it afterwards).
+        `label` is ground truth (see the module header); `block` waits for
+        the writer instead of dropping, for offline writers.
+        """
+        try:
+            self.queue.put((frame, timestamp, roi, label), block=block)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the queued frames and the final manifest"""
+        if not self.thread.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                try:
+                    self._write(*item)
+                except Exception as e:
+                    logger.warning('record_error', "⚠️ Frame recording error: %s", e)
+        finally:
+            if self.current is not None:
+                self.current.close()
+            self._write_manifest()
+
+    def _write(self, frame: np.ndarray, timestamp: float, roi, label: str) -> None:
+        height, width = frame.shape[:2]
+        x, y = 0, 0
+        if roi:
+            x, y, w, h = roi
+            frame = frame[y:y + h, x:x + w]
+        gray = _to_gray(frame)
+
+        if self.current is None or self.current.full or self.current.shape != gray.shape:
+            if self.current is not None:
+                self.current.close()
+            self.current = _Chunk(self.directory, len(self.chunks), gray.shape, self.chunk_frames)
+            self.chunks.append(self.current)
+            self._write_manifest()
+
+        self.current.append(gray, (timestamp, x, y, width, height, label.encode('ascii', 'replace')[:16]))
+        self.recorded += 1
+        if self.recorded % self.flush_every == 0:
+            self.current.flush()
+            self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            'format': FORMAT,
+            'version': VERSION,
+            'created_at': self.created_at,
+            'metadata': self.metadata,
+            'dropped': self.dropped,
+            'chunks': [chunk.describe() for chunk in self.chunks],
+        }
+        path = os.path.join(self.directory, MANIFEST)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+class FrameDataset:
+    """
+    Read-only view of a recorded dataset.
+
+    Frames are zero-copy slices of the memory-mapped chunk files; only the
+    manifest is read up front, so opening a long session is instant.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format') != FORMAT:
+            raise ValueError(f"{directory} is not a frame dataset")
+        self.metadata = self.manifest.get('metadata', {})
+        self.version = self.manifest.get('version', 1)
+
+        self.chunks: List[Tuple[np.ndarray, np.ndarray]] = []
+        self.offsets: List[int] = []
+        total = 0
+        for chunk in self.manifest['chunks']:
+            if not chunk['count']:
+                continue
+            frames = np.load(os.path.join(directory, chunk['frames']), mmap_mode='r')
+            index = np.load(os.path.join(directory, chunk['index']), mmap_mode='r')
+            self.chunks.append((frames[:chunk['count']], index[:chunk['count']]))
+            self.offsets.append(total)
+            total += chunk['count']
+        self.length = total
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _locate(self, i: int) -> Tuple[int, int]:
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError(i)
+        number = bisect.bisect_right(self.offsets, i) - 1
+        return number, i - self.offsets[number]
+
+    def __getitem__(self, i: int) -> Tuple[np.ndarray, np.void]:
+        """(grayscale ROI view, index record) of frame i"""
+        number, j = self._locate(i)
+        frames, index = self.chunks[number]
+        return frames[j], index[j]
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.void]]:
+        for frames, index in self.chunks:
+            for j in range(len(frames)):
+                yield frames[j], index[j]
+
+    def label(self, i: int) -> str:
+        """Ground-truth label of frame i (UNLABELED, NO_PROMPT or a compact sequence)"""
+        return self._decode(self[i][1]['label'])
+
+    def labels(self) -> List[str]:
+        """Ground-truth labels of every frame"""
+        return [self._decode(label) for _, index in self.chunks for label in index['label']]
+
+    def _decode(self, raw: bytes) -> str:
+        label = raw.decode('ascii', 'replace')
+        if self.version < 2 and label == NO_PROMPT:
+            return UNLABELED
+        return label
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return np.concatenate([index['timestamp'] for _, index in self.chunks]) if self.chunks else np.empty(0)
+
+    def full_frame(self, i: int) -> np.ndarray:
+        """Frame i as a BGR screen-sized array with the ROI in place (a new array)"""
+        gray, record = self[i]
+        canvas = np.zeros((int(record['frame_height']), int(record['frame_width']), 3), dtype=np.uint8)
+        x, y = int(record['x']), int(record['y'])
+        h, w = gray.shape
+        canvas[y:y + h, x:x + w] = gray[:, :, None]
+        return canvas
+
+
+class ReplayWindowManager:
+    """
+    WindowManager stand-in that plays a dataset back as screen captures.
+
+    Each capture returns the next frame as a new screen-sized BGR array
+    (BotCore tells frames apart by identity); None once the dataset is
+    exhausted unless `loop` is set.
+    """
+
+    HWND = 1
+
+    def __init__(self, dataset: FrameDataset, loop: bool = False):
+        self.dataset = dataset
+        self.loop = loop
+        self.position = 0
+        self.fivem_window = self.HWND
+
+    def find_fivem_window(self):
+        return True
+
+    def get_window_handle(self):
+        return self.fivem_window
+
+    def get_profile_key(self):
+        return None
+
+    def capture_fivem_screen(self):
+        if self.position >= len(self.dataset):
+            if not self.loop or not len(self.dataset):
+                return None
+            self.position = 0
+        frame = self.dataset.full_frame(self.position)
+        self.position += 1
+        return frame
+
+    def release_capture_session(self):
+        pass
@@ -14,6 +14,7 @@ class GameDetectionGUI:
         self.on_game_detected = on_game_detected_callback
         self.is_detecting = True
         self.detection_thread = None
+        self.detected_hwnds = []
         
         # Create main window
         self.root = tk.Tk()
@@ -135,6 +136,9 @@ class GameDetectionGUI:
                     selected_window = fivem_windows[0]
                     hwnd = selected_window['hwnd']
                     
+                    # Keep every window handle for multi-window mode
+                    self.detected_hwnds = [window['hwnd'] for window in fivem_windows]
+                    
                     # Update UI in main thread
                     self.root.after(0, self.on_game_found, hwnd, selected_window)
                     break
@@ -152,8 +156,11 @@ class GameDetectionGUI:
         self.progress.stop()
         
         # Update status
+        extra = ""
+        if BotConfig.MULTI_INSTANCE and len(self.detected_hwnds) > 1:
+            extra = f"\n+{len(self.detected_hwnds) - 1} more window(s)"
         self.status_label.config(
-            text=f"✅ FiveM game detected!\n{window_info['title']} ({window_info['size']})",
+            text=f"✅ FiveM game detected!\n{window_info['title']} ({window_info['size']}){extra}",
             fg='#00ff88'
         )
         
@@ -170,7 +177,10 @@ class GameDetectionGUI:
             self.root.withdraw()
             
             # Call the callback to launch main bot
-            self.on_game_detected(hwnd)
+            if BotConfig.MULTI_INSTANCE and len(self.detected_hwnds) > 1:
+                self.on_game_detected(hwnd, self.detected_hwnds)
+            else:
+                self.on_game_detected(hwnd)
             
             # Close this window
             self.root.quit()
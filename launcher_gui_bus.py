@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# gui_bus.py - Thread-Safe Batched GUI Update Bus
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+_LATEST = object()  # Placeholder for a coalesced event; its args live in `latest`
+
+
+class GuiUpdateBus:
+    """
+    Bounded, non-blocking queue of GUI updates.
+
+    Any thread may post(); only the Tk thread drains, in batches. Kinds in
+    COALESCED keep a single slot holding their newest arguments, so a burst
+    of status or stats updates costs one widget update. When the queue is
+    full the oldest event is dropped instead of blocking the poster.
+    """
+
+    COALESCED = frozenset(('status', 'stats'))
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.events: Deque[Tuple[str, Any]] = deque()
+        self.latest: Dict[str, tuple] = {}
+        self.posted = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def post(self, kind: str, *args) -> None:
+        with self.lock:
+            self.posted += 1
+            if kind in self.COALESCED:
+                if kind in self.latest:
+                    self.coalesced += 1
+                    self.latest[kind] = args
+                    return
+                self.latest[kind] = args
+                args = _LATEST
+
+            if len(self.events) >= self.maxsize:
+                old_kind, old_args = self.events.popleft()
+                if old_args is _LATEST:
+                    self.latest.pop(old_kind, None)
+                self.dropped += 1
+            self.events.append((kind, args))
+
+    def drain(self, limit: int = 64) -> List[Tuple[str, tuple]]:
+        """Remove and return up to `limit` events in posting order"""
+        batch = []
+        with self.lock:
+            while self.events and len(batch) < limit:
+                kind, args = self.events.popleft()
+                if args is _LATEST:
+                    args = self.latest.pop(kind)
+                batch.append((kind, args))
+        return batch
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                'posted': self.posted,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'pending': len(self.events),
+            }
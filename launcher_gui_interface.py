@@ -13,6 +13,9 @@ import sys
 import keyboard
 from typing import Callable
 from config import APP_CONFIG
+from launcher_config import BotConfig
+from launcher_perf_stats import format_stats
+from launcher_gui_bus import GuiUpdateBus
 import secrets
 
 class GUIInterface:
@@ -45,8 +48,18 @@ class GUIInterface:
         'heading': ('Segoe UI', 12, 'bold'),
         'body': ('Segoe UI', 10),
         'button': ('Segoe UI', 11, 'bold'),
+        'mono': ('Consolas', 9),
     }
     
+    # Update bus: how often the Tk thread drains it and how much per pass
+    BUS_POLL_MS = 50
+    BUS_BATCH_SIZE = 64
+    
+    @property
+    def stats_panel(self) -> bool:
+        """Whether the window shows the live performance panel"""
+        return BotConfig.PERF_PANEL_ENABLED
+    
     def __init__(self, toggle_callback: Callable):
         """
         Initialize the modern GUI interface
@@ -58,17 +71,30 @@ class GUIInterface:
         self.root = None
         self.status_label = None
         self.start_button = None
+        self.stats_label = None
         self.is_running = False
         
+        # Updates from other threads are applied on the Tk thread in batches
+        self.bus = GuiUpdateBus()
+        self.bus_handlers = {
+            'status': self._apply_status,
+            'stats': self._apply_stats,
+            'warning': messagebox.showwarning,
+            'info': messagebox.showinfo,
+            'error': messagebox.showerror,
+            'close': self._apply_close,
+        }
+        
         self._create_main_window()
         self._setup_hotkeys()
         self._configure_window_behavior()
+        self._schedule_bus_drain()
     
     def _create_main_window(self) -> None:
         """Create and configure the main window"""
         self.root = tk.Tk()
         self.root.title(secrets.token_bytes(16))
-        self.root.geometry("450x300")
+        self.root.geometry("450x430" if self.stats_panel else "450x300")
         self.root.resizable(False, False)
         self.root.configure(bg=self.COLORS['bg_primary'])
         icon_path = APP_CONFIG.get_icon_path()
@@ -99,6 +125,15 @@ class GUIInterface:
         except Exception:
             pass  # Hotkey setup failed, continue without it
     
+    def bind_flight_recorder(self, dump_callback: Callable) -> None:
+        """Register the manual flight recorder dump hotkey"""
+        if not BotConfig.FLIGHT_RECORDER_HOTKEY:
+            return
+        try:
+            keyboard.add_hotkey(BotConfig.FLIGHT_RECORDER_HOTKEY, dump_callback)
+        except Exception:
+            pass  # Automatic dumps still work
+    
     def _configure_window_behavior(self) -> None:
         """Configure window closing behavior"""
         self.root.protocol("WM_DELETE_WINDOW", self.exit_program)
@@ -123,6 +158,10 @@ class GUIInterface:
         # Control section
         self._create_control_section(main_frame)
         
+        # Performance section
+        if self.stats_panel:
+            self._create_stats_section(main_frame)
+        
         # Info section
         self._create_info_section(main_frame)
     
@@ -212,6 +251,22 @@ class GUIInterface:
         # Add hover effects
         self._add_button_hover_effects(self.start_button)
     
+    def _create_stats_section(self, parent: tk.Widget) -> None:
+        """Create the live performance panel"""
+        stats_card = tk.Frame(parent, bg=self.COLORS['bg_secondary'])
+        stats_card.pack(fill='x', pady=(0, 15))
+        
+        self.stats_label = tk.Label(
+            stats_card,
+            text="—",
+            font=self.FONTS['mono'],
+            fg=self.COLORS['text_secondary'],
+            bg=self.COLORS['bg_secondary'],
+            justify='left',
+            anchor='w'
+        )
+        self.stats_label.pack(fill='x', padx=12, pady=8)
+    
     def _create_info_section(self, parent: tk.Widget) -> None:
         """Create the information section"""
         info_frame = tk.Frame(parent, bg=self.COLORS['bg_primary'])
@@ -260,38 +315,26 @@ class GUIInterface:
         }
         return color_map.get(color, color)
     
+    # ─── Thread-safe entry points (post to the update bus) ───────────────────────────
+    
     def update_status(self, is_running: bool) -> None:
         """
-        Update the bot status display
+        Update the bot status display (safe to call from any thread)
         
         Args:
             is_running: Current bot running state
         """
         self.is_running = is_running
+        self.bus.post('status', is_running)
+    
+    def publish_stats(self, stats: dict) -> None:
+        """
+        Queue a performance snapshot (safe to call from any thread)
         
-        if is_running:
-            # Running state
-            self.status_label.config(
-                text="● กำลังบอท",
-                fg=self.COLORS['success']
-            )
-            self.start_button.config(
-                text="🛑 หยุดบอท",
-                bg=self.COLORS['danger']
-            )
-        else:
-            # Stopped state
-            self.status_label.config(
-                text="● หยุดทำงาน",
-                fg=self.COLORS['danger']
-            )
-            self.start_button.config(
-                text="🚀 กำลังบอท",
-                bg=self.COLORS['success']
-            )
-        
-        # Update button hover effects
-        self._add_button_hover_effects(self.start_button)
+        Args:
+            stats: Snapshot from PerfStatsCollector
+        """
+        self.bus.post('stats', stats)
     
     def log_message(self, message: str) -> None:
         """
@@ -312,7 +355,7 @@ class GUIInterface:
             title: Dialog title
             message: Warning message
         """
-        messagebox.showwarning(title, message)
+        self.bus.post('warning', title, message)
     
     def show_info(self, title: str, message: str) -> None:
         """
@@ -322,7 +365,7 @@ class GUIInterface:
             title: Dialog title
             message: Information message
         """
-        messagebox.showinfo(title, message)
+        self.bus.post('info', title, message)
     
     def show_error(self, title: str, message: str) -> None:
         """
@@ -332,7 +375,61 @@ class GUIInterface:
             title: Dialog title
             message: Error message
         """
-        messagebox.showerror(title, message)
+        self.bus.post('error', title, message)
+    
+    # ─── Tk thread: drain the bus and apply updates ──────────────────────────────────
+    
+    def _schedule_bus_drain(self) -> None:
+        """Drain the update bus from the Tk thread"""
+        self.root.after(self.BUS_POLL_MS, self._drain_bus)
+    
+    def _drain_bus(self) -> None:
+        """Apply one batch of queued updates, then reschedule"""
+        for kind, args in self.bus.drain(self.BUS_BATCH_SIZE):
+            try:
+                self.bus_handlers[kind](*args)
+            except Exception as e:
+                print(f"GUI update error ({kind}): {str(e)}")
+            if kind == 'close':
+                return
+        self._schedule_bus_drain()
+    
+    def _apply_status(self, is_running: bool) -> None:
+        if is_running:
+            # Running state
+            self.status_label.config(
+                text="● กำลังบอท",
+                fg=self.COLORS['success']
+            )
+            self.start_button.config(
+                text="🛑 หยุดบอท",
+                bg=self.COLORS['danger']
+            )
+        else:
+            # Stopped state
+            self.status_label.config(
+                text="● หยุดทำงาน",
+                fg=self.COLORS['danger']
+            )
+            self.start_button.config(
+                text="🚀 กำลังบอท",
+                bg=self.COLORS['success']
+            )
+        
+        # Update button hover effects
+        self._add_button_hover_effects(self.start_button)
+    
+    def _apply_stats(self, stats: dict) -> None:
+        """Render a snapshot; the widget is only touched when the text changes"""
+        if self.stats_label is None:
+            return
+        text = format_stats(stats)
+        if text != self.stats_label.cget('text'):
+            self.stats_label.config(text=text)
+    
+    def _apply_close(self) -> None:
+        if self.root:
+            self.root.quit()
     
     def run(self) -> None:
         """Start the GUI main loop"""
@@ -345,9 +442,8 @@ class GUIInterface:
             self.exit_program()
     
     def close(self) -> None:
-        """Close the GUI window"""
-        if self.root:
-            self.root.quit()
+        """Close the GUI window (safe to call from any thread)"""
+        self.bus.post('close')
     
     def exit_program(self) -> None:
         """Exit the program gracefully"""
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# headless.py - Headless Entry Point (no Tk)
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 🖥️ FiveM Fishing Bot - Console Runner
+# Description: Runs the same bot core with console or JSON-lines output, F6 / signal
+#              start-stop and without importing tkinter at all
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from launcher_config import BotConfig, load_tuning_profile
+
+
+class ConsoleInterface:
+    """
+    Drop-in replacement for GUIInterface that writes to the console.
+
+    Implements the methods FiveMFishingBot calls on its GUI; run() blocks
+    the main thread until close() or a termination signal.
+    """
+
+    def __init__(self, toggle_callback: Callable, structured: bool = False, stream=None):
+        self.toggle_callback = toggle_callback
+        self.structured = structured
+        self.stream = stream or sys.stdout
+        # Stats records only when metrics were enabled explicitly (--metrics)
+        self.stats_panel = structured and BotConfig.METRICS_ENABLED
+        self.is_running = False
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self._setup_hotkeys()
+        self._setup_signals()
+
+    def _setup_hotkeys(self) -> None:
+        """Setup global F6 hotkey (optional)"""
+        try:
+            import keyboard
+            keyboard.add_hotkey('f6', self.toggle_callback)
+        except Exception:
+            pass  # Hotkey setup failed, signals still work
+
+    def bind_flight_recorder(self, dump_callback: Callable) -> None:
+        """Register the manual flight recorder dump hotkey (optional)"""
+        if not BotConfig.FLIGHT_RECORDER_HOTKEY:
+            return
+        try:
+            import keyboard
+            keyboard.add_hotkey(BotConfig.FLIGHT_RECORDER_HOTKEY, dump_callback)
+        except Exception:
+            pass  # Automatic dumps still work
+
+    def _setup_signals(self) -> None:
+        """SIGINT/SIGTERM exit; SIGUSR1 (POSIX) or SIGBREAK (Windows) toggles"""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGINT, lambda signum, frame: self.close())
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.close())
+        toggle_signal = getattr(signal, 'SIGUSR1', None) or getattr(signal, 'SIGBREAK', None)
+        if toggle_signal is not None:
+            signal.signal(toggle_signal, lambda signum, frame: self.toggle_callback())
+
+    def _emit(self, level: str, message: str, **fields) -> None:
+        with self.lock:
+            if self.structured:
+                record = {'ts': time.time(), 'level': level, 'message': message}
+                record.update(fields)
+                self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                self.stream.write(f"{time.strftime('%H:%M:%S')} [{level}] {message}\n")
+            self.stream.flush()
+
+    def update_status(self, is_running: bool) -> None:
+        self.is_running = is_running
+        self._emit('status', "running" if is_running else "stopped", running=is_running)
+
+    def log_message(self, message: str) -> None:
+        self._emit('info', message)
+
+    def publish_stats(self, stats: dict) -> None:
+        """Performance snapshots are only emitted as JSON-lines records"""
+        if self.structured:
+            self._emit('stats', stats['state'], stats=stats)
+
+    def show_warning(self, title: str, message: str) -> None:
+        self._emit('warning', message, title=title)
+
+    def show_info(self, title: str, message: str) -> None:
+        self._emit('info', message, title=title)
+
+    def show_error(self, title: str, message: str) -> None:
+        self._emit('error', message, title=title)
+
+    def run(self) -> None:
+        """Block until close() is called"""
+        while not self.stop_event.wait(0.5):
+            pass
+        try:
+            import keyboard
+            keyboard.unhook_all()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        self.stop_event.set()
+
+
+def _current_rss_mb() -> float:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+def _startup_probe(mode: str) -> None:
+    """Build the bot with the given front end and print startup cost as JSON"""
+    start = time.perf_counter()
+    from launcher_main import FiveMFishingBot
+    if mode == 'gui':
+        bot = FiveMFishingBot()
+    else:
+        bot = FiveMFishingBot(gui_factory=lambda toggle: ConsoleInterface(toggle, stream=open(os.devnull, 'w')))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'mode': mode,
+        'startup_seconds': elapsed,
+        'rss_mb': _current_rss_mb(),
+        'tkinter_loaded': 'tkinter' in sys.modules,
+    }))
+    bot.execution_worker.shutdown()
+
+
+def measure_startup() -> dict:
+    """Compare startup time and resident memory of the GUI and headless paths"""
+    results = {}
+    for mode in ('headless', 'gui'):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--startup-probe', mode],
+            capture_output=True, text=True, timeout=60
+        )
+        lines = [line for line in output.stdout.splitlines() if line.startswith('{')]
+        results[mode] = json.loads(lines[-1]) if lines else {'error': output.stderr.strip()}
+    return results
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="FiveM fishing bot without a GUI")
+    parser.add_argument('--json', action='store_true', help="emit JSON-lines log records")
+    parser.add_argument('--debug', action='store_true', help="enable DEBUG_MODE logging")
+    parser.add_argument('--autostart', action='store_true', help="start the bot immediately")
+    parser.add_argument('--metrics', action='store_true',
+                        help="record per-stage latency histograms (exported on stop)")
+    parser.add_argument('--trace', action='store_true',
+                        help="also record spans for a Chrome trace-event file")
+    parser.add_argument('--record', nargs='?', const='', metavar='DIR',
+                        help="record captured frames to a dataset (default: data folder)")
+    parser.add_argument('--tuning-profile', metavar='FILE',
+                        help="detection settings written by launcher_tune.py (default: data folder)")
+    parser.add_argument('--measure-startup', action='store_true',
+                        help="compare startup time and memory with the GUI path")
+    parser.add_argument('--startup-probe', choices=('gui', 'headless'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.startup_probe:
+        _startup_probe(args.startup_probe)
+        return 0
+
+    if args.measure_startup:
+        for mode, stats in measure_startup().items():
+            print(f"{mode:>9}: {json.dumps(stats)}")
+        return 0
+
+    if args.debug:
+        BotConfig.DEBUG_MODE = True
+    try:
+        tuned = load_tuning_profile(args.tuning_profile)
+    except ValueError as e:
+        print(f"Tuning profile ignored: {e}", file=sys.stderr)
+        if args.tuning_profile:
+            return 2
+        tuned = None
+    if tuned:
+        print(f"Tuning profile applied: {json.dumps(tuned)}")
+    elif args.tuning_profile:
+        print(f"Tuning profile {args.tuning_profile} not found", file=sys.stderr)
+        return 2
+    if args.record is not None:
+        BotConfig.FRAME_RECORDING_ENABLED = True
+        BotConfig.FRAME_RECORDING_DIR = args.record or None
+    if args.metrics or args.trace:
+        from launcher_metrics import metrics
+        BotConfig.METRICS_ENABLED = True
+        metrics.configure(enabled=True, trace=args.trace)
+
+    # Same license check as main.py, without the Tk splash
+    from hardware_id import HardwareIDGenerator
+    from license_api import LicenseAPIClient
+    with LicenseAPIClient() as client:
+        response = client.verify_license(HardwareIDGenerator.get_hardware_id())
+    if not response.success:
+        print(f"License check failed: {response.message}", file=sys.stderr)
+        return 1
+
+    from launcher_main import FiveMFishingBot
+    bot = FiveMFishingBot(gui_factory=lambda toggle: ConsoleInterface(toggle, structured=args.json))
+    if args.autostart:
+        bot.toggle_bot()
+    bot.run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
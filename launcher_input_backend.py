@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+# input_backend.py - Key Input Backends with Precompiled Key Plans
+import abc
+import ctypes
+import time
+from ctypes import wintypes
+from typing import Dict, List, Optional, Tuple
+
+from launcher_config import BotConfig
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_SCANCODE = 0x0008
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ('wVk', wintypes.WORD),
+        ('wScan', wintypes.WORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', wintypes.LONG),
+        ('dy', wintypes.LONG),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ('uMsg', wintypes.DWORD),
+        ('wParamL', wintypes.WORD),
+        ('wParamH', wintypes.WORD),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [('ki', KEYBDINPUT), ('mi', MOUSEINPUT), ('hi', HARDWAREINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [('type', wintypes.DWORD), ('union', _INPUTUNION)]
+
+
+class KeyPlan:
+    """
+    A key sequence compiled once into backend-ready input events.
+
+    `events` is the portable form: (key, vk_code, scan_code, is_down).
+    `payload` holds whatever a backend prebuilds from the events in
+    `_build_payload`; batched backends keep one entry per native call
+    (see InputBackend.batch_phases).
+    """
+
+    def __init__(self, keys: Tuple[str, ...], events: List[Tuple[str, int, int, bool]], payload=None):
+        self.keys = keys
+        self.events = events
+        self.payload = payload
+
+    def __len__(self):
+        return len(self.events)
+
+
+class InputBackend(abc.ABC):
+    """
+    Base class for key input backends.
+
+    A backend compiles sequences into KeyPlans (cached per sequence) and
+    either submits a whole plan itself (`batched`, in as few native calls
+    as `hold_time` allows) or exposes per-key key_down/key_up so
+    KeyScheduler can time each transition.
+    """
+
+    batched = False
+    requires_focus = True
+    hold_time = 0.0
+
+    def __init__(self):
+        self.plan_cache: Dict[Tuple[str, ...], KeyPlan] = {}
+        self.key_table = {
+            key: (vk_code, scan_code)
+            for key, (vk_code, scan_code) in BotConfig.VK_MAP.items()
+        }
+
+    def compile(self, keys) -> KeyPlan:
+        """Return the cached plan for a sequence, building it on first use"""
+        keys = tuple(key.lower() for key in keys)
+        plan = self.plan_cache.get(keys)
+        if plan is None:
+            events = []
+            for key in keys:
+                if key not in self.key_table:
+                    continue
+                vk_code, scan_code = self.key_table[key]
+                events.append((key, vk_code, scan_code, True))
+                events.append((key, vk_code, scan_code, False))
+            plan = KeyPlan(keys, events, self._build_payload(events))
+            self.plan_cache[keys] = plan
+        return plan
+
+    def _build_payload(self, events):
+        return None
+
+    def batch_phases(self, events):
+        """
+        Events grouped into native calls for batched submission: all in one
+        call without a hold; otherwise a call ends after every key down so
+        the key is held for `hold_time` before the next call releases it
+        (and presses the following key) - N+1 calls for N keys.
+        """
+        if self.hold_time <= 0:
+            return [list(events)] if events else []
+        phases = [[]]
+        for event in events:
+            phases[-1].append(event)
+            if event[3]:
+                phases.append([])
+        return [phase for phase in phases if phase]
+
+    def submit(self, plan: KeyPlan, hwnd) -> int:
+        """Send every event of a plan; returns the number of keys sent"""
+        sent = 0
+        for key, _, _, is_down in plan.events:
+            ok = self.key_down(hwnd, key) if is_down else self.key_up(hwnd, key)
+            if ok and not is_down:
+                sent += 1
+        return sent
+
+    @abc.abstractmethod
+    def key_down(self, hwnd, key) -> bool:
+        """Press `key` for `hwnd`; True if the event was accepted"""
+
+    @abc.abstractmethod
+    def key_up(self, hwnd, key) -> bool:
+        """Release `key` for `hwnd`; True if the event was accepted"""
+
+
+class PostMessageBackend(InputBackend):
+    """WM_KEYDOWN/WM_KEYUP posted directly to the target window (checked before every event)"""
+
+    def __init__(self, user32=None):
+        super().__init__()
+        self.user32 = user32 or ctypes.WinDLL('user32')
+        # lparams are fixed per key, build them once
+        self.messages = {
+            key: (vk_code, (scan_code << 16) | 1, (scan_code << 16) | 0xC0000001)
+            for key, (vk_code, scan_code) in self.key_table.items()
+        }
+
+    def key_down(self, hwnd, key) -> bool:
+        entry = self.messages.get(key.lower())
+        if entry is None or not self.user32.IsWindow(hwnd):
+            return False
+        vk_code, lparam_down, _ = entry
+        return self.user32.PostMessageW(hwnd, BotConfig.WM_KEYDOWN, vk_code, lparam_down) != 0
+
+    def key_up(self, hwnd, key) -> bool:
+        entry = self.messages.get(key.lower())
+        if entry is None or not self.user32.IsWindow(hwnd):
+            return False
+        vk_code, _, lparam_up = entry
+        return self.user32.PostMessageW(hwnd, BotConfig.WM_KEYUP, vk_code, lparam_up) != 0
+
+
+class SendInputBackend(InputBackend):
+    """
+    Scan-code keyboard input through SendInput.
+
+    In batched mode every plan carries prebuilt INPUT arrays, one per
+    hold phase (batch_phases), each sent in a single SendInput call with
+    `hold_time` between them; keys pressed and released in the same call
+    can be missed by the game, so the default hold is KEY_HOLD_TIME.
+    Otherwise single-event arrays are prebuilt for KeyScheduler's timed
+    key_down/key_up.
+    """
+
+    def __init__(self, batched: bool = True, user32=None, hold_time: Optional[float] = None,
+                 sleep=time.sleep):
+        super().__init__()
+        self.batched = batched
+        self.hold_time = BotConfig.KEY_HOLD_TIME if hold_time is None else hold_time
+        self.sleep = sleep
+        self.user32 = user32 or ctypes.WinDLL('user32')
+        self.input_size = ctypes.sizeof(INPUT)
+        self.single_events = {
+            (key, is_down): self._build_inputs([(key, vk_code, scan_code, is_down)])
+            for key, (vk_code, scan_code) in self.key_table.items()
+            for is_down in (True, False)
+        }
+
+    @staticmethod
+    def _build_inputs(events):
+        inputs = (INPUT * len(events))()
+        for i, (_, vk_code, scan_code, is_down) in enumerate(events):
+            flags = KEYEVENTF_SCANCODE if is_down else KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP
+            inputs[i].type = INPUT_KEYBOARD
+            inputs[i].union.ki = KEYBDINPUT(vk_code, scan_code, flags, 0, 0)
+        return inputs
+
+    def _build_payload(self, events):
+        if not self.batched:
+            return None
+        return [(self._build_inputs(phase), len(phase), sum(not is_down for *_, is_down in phase))
+                for phase in self.batch_phases(events)]
+
+    def submit(self, plan: KeyPlan, hwnd) -> int:
+        if not self.batched:
+            return super().submit(plan, hwnd)
+        sent = 0
+        for i, (inputs, count, releases) in enumerate(plan.payload):
+            if i:
+                self.sleep(self.hold_time)
+            # SendInput reports inserted events; a key counts once its release went in
+            if self.user32.SendInput(count, inputs, self.input_size) == count:
+                sent += releases
+        return sent
+
+    def key_down(self, hwnd, key) -> bool:
+        return self._send_single(key, True)
+
+    def key_up(self, hwnd, key) -> bool:
+        return self._send_single(key, False)
+
+    def _send_single(self, key, is_down) -> bool:
+        inputs = self.single_events.get((key.lower(), is_down))
+        if inputs is None:
+            return False
+        return self.user32.SendInput(1, inputs, self.input_size) == 1
+
+
+class RecordingBackend(InputBackend):
+    """
+    Backend that records instead of sending input.
+
+    `calls` counts native-equivalent calls - one per batch phase in batched
+    mode, exactly as SendInputBackend with the same `hold_time`, and one
+    per transition otherwise - and `submit_latencies` holds the wall time
+    of each submit.
+    """
+
+    requires_focus = False
+
+    def __init__(self, batched: bool = False, clock=time.perf_counter, hold_time: float = 0.0,
+                 sleep=time.sleep):
+        super().__init__()
+        self.batched = batched
+        self.hold_time = hold_time
+        self.sleep = sleep
+        self.clock = clock
+        self.calls = 0
+        self.events: List[Tuple[float, Optional[int], str, bool]] = []
+        self.submit_latencies: List[float] = []
+
+    def submit(self, plan: KeyPlan, hwnd) -> int:
+        start = self.clock()
+        if self.batched:
+            for i, phase in enumerate(plan.payload):
+                if i:
+                    self.sleep(self.hold_time)
+                self.calls += 1
+                now = self.clock()
+                for key, _, _, is_down in phase:
+                    self.events.append((now, hwnd, key, is_down))
+            sent = len(plan.events) // 2
+        else:
+            sent = super().submit(plan, hwnd)
+        self.submit_latencies.append(self.clock() - start)
+        return sent
+
+    def _build_payload(self, events):
+        return self.batch_phases(events) if self.batched else None
+
+    def key_down(self, hwnd, key) -> bool:
+        self.calls += 1
+        self.events.append((self.clock(), hwnd, key.lower(), True))
+        return key.lower() in self.key_table
+
+    def key_up(self, hwnd, key) -> bool:
+        self.calls += 1
+        self.events.append((self.clock(), hwnd, key.lower(), False))
+        return key.lower() in self.key_table
+
+    def reset(self):
+        self.calls = 0
+        self.events.clear()
+        self.submit_latencies.clear()
+
+
+def create_input_backend(name: Optional[str] = None) -> InputBackend:
+    """Create the backend named in BotConfig.INPUT_BACKEND"""
+    name = name or BotConfig.INPUT_BACKEND
+    if name == 'sendinput_batch':
+        return SendInputBackend(batched=True)
+    if name == 'sendinput':
+        return SendInputBackend(batched=False)
+    if name == 'recording':
+        return RecordingBackend()
+    return PostMessageBackend()
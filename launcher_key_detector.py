@@ -3,25 +3,36 @@
 import cv2
 import numpy as np
 from launcher_config import BotConfig
+from launcher_metrics import metrics
 from concurrent.futures import ThreadPoolExecutor
 
 class KeyDetector:
-    def __init__(self, templates):
+    def __init__(self, templates, executor=None, template_pyramids=None):
         
         self.templates = templates
         self.key_sequence_area = None
         self.sensitivity = BotConfig.SENSITIVITY
         
-        # Pre-compute template pyramids for multi-scale matching
-        self.template_pyramids = self._create_template_pyramids()
+        # Details of the last successful area acquisition (for detection profiles)
+        self.last_acquisition = None
         
-        # Thread pool for parallel processing
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Pyramid scale known from a detection profile (None searches every scale)
+        self.scale_lock = None
+        
+        # Filtered per-key detections behind the last sequence read
+        self.last_detections = []
+        
+        # Pre-compute template pyramids for multi-scale matching (may be shared)
+        self.template_pyramids = template_pyramids or self._create_template_pyramids()
+        
+        # Thread pool for parallel processing (may be shared between detectors)
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=4)
         
     def _create_template_pyramids(self):
         """Create template pyramids for multi-scale matching."""
         pyramids = {}
-        scales = [0.8, 1.0, 1.2]  # Support for scale variations
+        scales = BotConfig.TEMPLATE_SCALES  # Support for scale variations
         
         for key, template in self.templates.items():
             pyramids[key] = []
@@ -39,11 +50,12 @@ class KeyDetector:
     
     def auto_detect_minigame_area(self, screen):
         """Improve minigame area detection with adaptive algorithms."""
-        gray_full = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        
-        # Use CLAHE to enhance contrast
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        gray_full = clahe.apply(gray_full)
+        with metrics.span('detect.acquire.clahe'):
+            gray_full = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+            
+            # Use CLAHE to enhance contrast
+            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+            gray_full = clahe.apply(gray_full)
 
         # Define ROI with intelligent expansion
         if self.key_sequence_area:
@@ -63,11 +75,11 @@ class KeyDetector:
         
         # Dynamic threshold adjustment
         if std_brightness < 15:  # Low contrast
-            threshold = max(self.sensitivity - 0.15, 0.4)
+            threshold = max(self.sensitivity + BotConfig.LOW_CONTRAST_THRESHOLD_OFFSET, 0.4)
         elif mean_brightness < 60:  # Dark image
-            threshold = max(self.sensitivity - 0.1, 0.5)
+            threshold = max(self.sensitivity + BotConfig.DARK_THRESHOLD_OFFSET, 0.5)
         elif mean_brightness > 200:  # Bright image
-            threshold = min(self.sensitivity + 0.1, 0.9)
+            threshold = min(self.sensitivity + BotConfig.BRIGHT_THRESHOLD_OFFSET, 0.9)
         else:
             threshold = self.sensitivity
 
@@ -75,31 +87,33 @@ class KeyDetector:
         matches = []
         detected_keys = set()
         
-        # Process templates in parallel
-        futures = []
-        for key in self.templates.keys():
-            future = self.executor.submit(self._match_template_multiscale, gray, key, threshold)
-            futures.append((key, future))
-        
-        # Collect results
-        for key, future in futures:
-            key_matches = future.result()
-            if key_matches:
-                matches.extend(key_matches)
-                detected_keys.add(key)
-                
-                # Early exit if all keys detected
-                if len(detected_keys) == len(self.templates):
-                    break
+        with metrics.span('detect.acquire.match'):
+            # Process templates in parallel
+            futures = []
+            for key in self.templates.keys():
+                future = self.executor.submit(self._match_template_multiscale, gray, key, threshold)
+                futures.append((key, future))
+            
+            # Collect results
+            for key, future in futures:
+                key_matches = future.result()
+                if key_matches:
+                    matches.extend(key_matches)
+                    detected_keys.add(key)
+                    
+                    # Early exit if all keys detected
+                    if len(detected_keys) == len(self.templates):
+                        break
 
         if not matches:
             return False
 
         # Apply non-maximum suppression to remove overlapping detections
-        matches = self._apply_nms(matches)
+        with metrics.span('detect.acquire.nms'):
+            matches = self._apply_nms(matches)
         
         # Adjust matches with ROI offset
-        adjusted_matches = [(x + roi_offset[0], y + roi_offset[1], w, h, conf) for x, y, w, h, conf in matches]
+        adjusted_matches = [(x + roi_offset[0], y + roi_offset[1], w, h, conf) for x, y, w, h, conf, scale in matches]
 
         if not adjusted_matches:
             return False
@@ -124,13 +138,31 @@ class KeyDetector:
             min(screen.shape[0] - (y_min - margin), y_max - y_min + 2 * margin)
         )
         
+        # Remember how the area was found: best scale, slot boxes and threshold
+        best = matches[0]
+        self.last_acquisition = {
+            'area': self.key_sequence_area,
+            'scale': best[5],
+            'confidence': float(best[4]),
+            'slots': sorted((int(x), int(y), int(w), int(h)) for x, y, w, h, conf in adjusted_matches),
+            'threshold': float(threshold),
+        }
+        
         return True
     
+    def _pyramid(self, key):
+        """Pyramid levels to search for a key, restricted to `scale_lock` if set."""
+        levels = self.template_pyramids[key]
+        if self.scale_lock is None:
+            return levels
+        locked = [level for level in levels if abs(level[0] - self.scale_lock) < 1e-6]
+        return locked or levels
+    
     def _match_template_multiscale(self, gray, key, threshold):
         """Multi-scale template matching for a single key."""
         matches = []
         
-        for scale, template in self.template_pyramids[key]:
+        for scale, template in self._pyramid(key):
             h_t, w_t = template.shape
             
             # Skip if template is larger than search area
@@ -145,7 +177,7 @@ class KeyDetector:
             
             for y, x in zip(*locations):
                 confidence = res[y, x]
-                matches.append((x, y, w_t, h_t, confidence))
+                matches.append((x, y, w_t, h_t, confidence, scale))
         
         return matches
     
@@ -189,6 +221,7 @@ class KeyDetector:
     
     def detect_key_sequence(self, image):
         """Detect key sequence using improved algorithms."""
+        self.last_detections = []
         if not self.templates or not self.key_sequence_area:
             return []
         
@@ -196,29 +229,33 @@ class KeyDetector:
             x, y, w, h = self.key_sequence_area
             sequence_region = image[y:y+h, x:x+w]
             
-            # Preprocessing for better detection
-            gray_region = cv2.cvtColor(sequence_region, cv2.COLOR_BGR2GRAY)
-            
-            # Apply CLAHE for better contrast
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
-            gray_region = clahe.apply(gray_region)
-            
-            # Parallel template matching
-            futures = []
-            for key in self.templates.keys():
-                future = self.executor.submit(self._detect_single_key, gray_region, key)
-                futures.append((key, future))
-            
-            detected_keys = []
-            for key, future in futures:
-                key_detections = future.result()
-                detected_keys.extend(key_detections)
+            with metrics.span('detect.sequence.clahe'):
+                # Preprocessing for better detection
+                gray_region = cv2.cvtColor(sequence_region, cv2.COLOR_BGR2GRAY)
+                
+                # Apply CLAHE for better contrast
+                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
+                gray_region = clahe.apply(gray_region)
             
-            # Sort by x position (left to right)
-            detected_keys.sort(key=lambda k: k['x'])
+            with metrics.span('detect.sequence.match'):
+                # Parallel template matching
+                futures = []
+                for key in self.templates.keys():
+                    future = self.executor.submit(self._detect_single_key, gray_region, key)
+                    futures.append((key, future))
+                
+                detected_keys = []
+                for key, future in futures:
+                    key_detections = future.result()
+                    detected_keys.extend(key_detections)
             
-            # Apply intelligent filtering
-            filtered_keys = self._intelligent_filter(detected_keys)
+            with metrics.span('detect.sequence.filter'):
+                # Sort by x position (left to right)
+                detected_keys.sort(key=lambda k: k['x'])
+                
+                # Apply intelligent filtering
+                filtered_keys = self._intelligent_filter(detected_keys)
+                self.last_detections = filtered_keys
             
             # Extract sequence
             sequence = [key_info['key'] for key_info in filtered_keys]
@@ -231,7 +268,7 @@ class KeyDetector:
         """Detect a single key using multi-scale approach."""
         detections = []
         
-        for scale, template in self.template_pyramids[key]:
+        for scale, template in self._pyramid(key):
             h_t, w_t = template.shape
             
             if h_t > gray_region.shape[0] or w_t > gray_region.shape[1]:
@@ -287,5 +324,5 @@ class KeyDetector:
     
     def __del__(self):
         """Cleanup thread pool."""
-        if hasattr(self, 'executor'):
+        if hasattr(self, 'executor') and self.owns_executor:
             self.executor.shutdown(wait=False)
\ No newline at end of file
@@ -2,15 +2,34 @@
 # key_executor.py - Key Execution System (Fixed)
 import ctypes
 import time
-import random
-import win32gui
-import win32con
 from launcher_config import BotConfig
+from launcher_metrics import metrics
+from launcher_logging import get_logger
+from launcher_key_scheduler import KeyScheduler
+from launcher_input_backend import create_input_backend
+
+try:
+    import win32gui
+    import win32con
+except ImportError:
+    win32gui = None
+    win32con = None
+
+logger = get_logger('executor')
 
 class KeyExecutor:
-    def __init__(self):
+    def __init__(self, scheduler=None, backend=None):
         self.key_map = BotConfig.KEY_MAP
         self.reaction_delay = BotConfig.REACTION_DELAY
+        self.scheduler = scheduler or KeyScheduler(gap=self.reaction_delay)
+        self.backend = backend or create_input_backend()
+        self.last_schedule_report = None
+        
+        # Mock backends run without any window focus handling
+        self.focus_enabled = self.backend.requires_focus
+        if not self.focus_enabled:
+            self.user32 = None
+            return
         
         # Initialize user32 functions
         self.user32 = ctypes.WinDLL('user32')
@@ -51,7 +70,7 @@ class KeyExecutor:
             return self.user32.GetForegroundWindow() == hwnd
             
         except Exception as e:
-            print(f"Set foreground error: {e}")
+            logger.warning('focus_error', "Set foreground error: %s", e)
             return False
         finally:
             # Clean up thread attachment
@@ -60,6 +79,14 @@ class KeyExecutor:
             except:
                 pass
     
+    def _report_schedule(self, report):
+        """Feed planned-vs-actual key timing into metrics (shown in the stats panel)"""
+        metrics.record('execute.schedule_error.mean', report.mean_abs_error)
+        metrics.record('execute.schedule_error.max', report.max_abs_error)
+        logger.debug('schedule_report', "Key timing error: mean %.2fms, max %.2fms",
+                     1000 * report.mean_abs_error, 1000 * report.max_abs_error,
+                     mean_ms=1000 * report.mean_abs_error, max_ms=1000 * report.max_abs_error)
+
     def execute_key_sequence(self, sequence, hwnd):
         """this is bug for send key to background fakefocus"""
         if not sequence:
@@ -67,63 +94,37 @@ class KeyExecutor:
 
         original_hwnd = None
         try:
-            # Save original foreground window
-            original_hwnd = self.user32.GetForegroundWindow()
-            
-            # Force focus to target window
-            self.set_foreground_window(hwnd)
-            success_count = 0
+            if self.focus_enabled:
+                # Save original foreground window
+                original_hwnd = self.user32.GetForegroundWindow()
+                
+                # Force focus to target window (checked once per sequence)
+                with metrics.span('execute.focus'):
+                    self.set_foreground_window(hwnd)
 
-            for i, key in enumerate(sequence):
-                if key in self.key_map:
-                    # Check and maintain window focus before each key
-                    if self.user32.GetForegroundWindow() != hwnd:
-                        self.set_foreground_window(hwnd)
-                    
-                    # Execute key press
-                    mapped_key = self.key_map[key]
-                    key_success = self.send_key_to_window(hwnd, mapped_key)
-                    if key_success:
-                        success_count += 1
+            with metrics.span('execute.compile'):
+                plan = self.backend.compile([self.key_map[key] for key in sequence if key in self.key_map])
+            if not plan.events:
+                return False
 
-                    # Add reaction delay
-                    if i < len(sequence) - 1:
-                        time.sleep(self.reaction_delay)
+            with metrics.span('execute.send'):
+                if self.backend.batched:
+                    # Prebuilt payload, one native call per hold phase
+                    self.last_schedule_report = None
+                    keys_sent = self.backend.submit(plan, hwnd)
                 else:
-                    continue
-
-            time.sleep(0.1)
-            return success_count > 0
+                    # Timed transitions on one precomputed timeline
+                    report = self.scheduler.execute(plan.keys, self.backend, hwnd)
+                    self.last_schedule_report = report
+                    self._report_schedule(report)
+                    keys_sent = report.keys_sent
+            return keys_sent > 0
 
         except Exception as e:
-            print(f"Key execution error: {e}")
+            logger.warning('execution_error', "Key execution error: %s", e)
             return False
         finally:
-            # Restore original focus
-            if original_hwnd and win32gui.IsWindow(original_hwnd):
+            # Restore original focus once the sent input had time to be processed
+            if original_hwnd and original_hwnd != hwnd and win32gui.IsWindow(original_hwnd):
+                time.sleep(BotConfig.FOCUS_RESTORE_DELAY)
                 self.set_foreground_window(original_hwnd)
-
-    def send_key_to_window(self, hwnd, key):
-        """Enhanced key sending with thread attachment"""
-        try:
-            if not hwnd or not win32gui.IsWindow(hwnd):
-                return False
-
-            vk_code, scan_code = BotConfig.VK_MAP.get(key.lower(), (None, None))
-            if not vk_code:
-                return False
-
-            lparam_down = (scan_code << 16) | 1
-            lparam_up = (scan_code << 16) | 0xC0000001
-
-            # Method 1: PostMessage
-            result1 = self.user32.PostMessageW(hwnd, BotConfig.WM_KEYDOWN, vk_code, lparam_down)
-            time.sleep(0.01)
-            result2 = self.user32.PostMessageW(hwnd, BotConfig.WM_KEYUP, vk_code, lparam_up)
-
-            time.sleep(random.uniform(0.02, 0.05))
-            return (result1 != 0 and result2 != 0)
-
-        except Exception as e:
-            print(f"Send key error: {e}")
-            return False
\ No newline at end of file
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# key_scheduler.py - Deadline-Based Key Timeline Scheduler
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from launcher_config import BotConfig
+
+
+@dataclass
+class KeyEvent:
+    """One planned key transition, `at` seconds after the sequence start"""
+    at: float
+    key: str
+    is_down: bool
+
+
+@dataclass
+class ScheduleReport:
+    """Planned versus actual timing of one executed timeline"""
+    planned: List[float] = field(default_factory=list)
+    actual: List[float] = field(default_factory=list)
+    results: List[bool] = field(default_factory=list)
+    planned_duration: float = 0.0
+    actual_duration: float = 0.0
+
+    @property
+    def errors(self) -> List[float]:
+        """Per-event lateness (actual - planned) in seconds"""
+        return [a - p for p, a in zip(self.planned, self.actual)]
+
+    @property
+    def mean_abs_error(self) -> float:
+        errors = self.errors
+        return sum(abs(e) for e in errors) / len(errors) if errors else 0.0
+
+    @property
+    def max_abs_error(self) -> float:
+        return max((abs(e) for e in self.errors), default=0.0)
+
+    @property
+    def keys_sent(self) -> int:
+        """Number of keys whose down and up transitions both succeeded"""
+        return sum(1 for i in range(0, len(self.results) - 1, 2)
+                   if self.results[i] and self.results[i + 1])
+
+
+class JitterModel:
+    """Uniform random gap added after each key release"""
+
+    def __init__(self, low: float, high: float, seed: Optional[int] = None):
+        self.low = low
+        self.high = high
+        self.rng = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.high <= self.low:
+            return self.low
+        return self.rng.uniform(self.low, self.high)
+
+
+class KeyScheduler:
+    """
+    Plans a whole key sequence up front and replays it against a
+    monotonic clock.
+
+    Each key is pressed for `hold_time`, followed by a jittered gap plus
+    `gap` before the next key. Waiting uses a coarse sleep until
+    `spin_threshold` before the deadline, then spins, so OS sleep
+    granularity does not accumulate across the sequence.
+    """
+
+    def __init__(self,
+                 hold_time: Optional[float] = None,
+                 gap: Optional[float] = None,
+                 jitter: Optional[JitterModel] = None,
+                 tail: Optional[float] = None,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep,
+                 spin_threshold: float = 0.002):
+        self.hold_time = BotConfig.KEY_HOLD_TIME if hold_time is None else hold_time
+        self.gap = BotConfig.REACTION_DELAY if gap is None else gap
+        self.jitter = jitter if jitter is not None else JitterModel(*BotConfig.KEY_JITTER_RANGE)
+        self.tail = BotConfig.KEY_SEQUENCE_TAIL if tail is None else tail
+        self.clock = clock
+        self.sleep = sleep
+        self.spin_threshold = spin_threshold
+
+    def plan(self, keys) -> Tuple[List[KeyEvent], float]:
+        """Build the timeline for a key sequence; returns (events, total duration)"""
+        events = []
+        t = 0.0
+        for i, key in enumerate(keys):
+            events.append(KeyEvent(t, key, True))
+            t += self.hold_time
+            events.append(KeyEvent(t, key, False))
+            t += self.jitter.sample()
+            if i < len(keys) - 1:
+                t += self.gap
+        return events, t + self.tail
+
+    def run(self, events: List[KeyEvent], duration: float, sink, hwnd) -> ScheduleReport:
+        """Execute a planned timeline through an input sink"""
+        report = ScheduleReport(planned_duration=duration)
+        start = self.clock()
+
+        for event in events:
+            self._wait_until(start + event.at)
+            fired = self.clock() - start
+            if event.is_down:
+                ok = sink.key_down(hwnd, event.key)
+            else:
+                ok = sink.key_up(hwnd, event.key)
+            report.planned.append(event.at)
+            report.actual.append(fired)
+            report.results.append(bool(ok))
+
+        self._wait_until(start + duration)
+        report.actual_duration = self.clock() - start
+        return report
+
+    def execute(self, keys, sink, hwnd) -> ScheduleReport:
+        """Plan and run a key sequence"""
+        events, duration = self.plan(keys)
+        return self.run(events, duration, sink, hwnd)
+
+    def _wait_until(self, deadline: float) -> None:
+        remaining = deadline - self.clock()
+        if remaining > self.spin_threshold:
+            self.sleep(remaining - self.spin_threshold)
+        while self.clock() < deadline:
+            remaining = deadline - self.clock()
+            if self.spin_threshold <= 0:
+                self.sleep(remaining)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 # launcher.py - Main Entry Point with Game Detection
 import sys
+from launcher_config import BotConfig, data_path, load_tuning_profile
 from launcher_game_detection_gui import GameDetectionGUI
 from launcher_main import FiveMFishingBot
 
@@ -9,16 +10,34 @@ class FiveMFishingBotLauncher:
         self.fivem_hwnd = None
         self.main_bot = None
         
-    def on_game_detected(self, hwnd):
+    def on_game_detected(self, hwnd, hwnds=None):
         self.fivem_hwnd = hwnd
         
         self.main_bot = FiveMFishingBot(
             detected_hwnd=hwnd, 
+            detected_hwnds=hwnds,
         )
         
         self.main_bot.run()
     
+    def _apply_tuning_profile(self):
+        """Apply the tuned detection settings from the data folder, if any, and log them"""
+        from launcher_logging import get_logger, setup_logging
+        setup_logging()
+        logger = get_logger('launcher')
+        try:
+            tuned = load_tuning_profile()
+        except ValueError as e:
+            logger.warning('tuning_profile_invalid', "⚠️ Tuning profile ignored: %s", str(e))
+            return
+        if tuned:
+            path = data_path(BotConfig.TUNING_PROFILE_FILE)
+            logger.info('tuning_profile_applied', "🎛️ Tuning profile applied from %s: %s", path,
+                        ', '.join(f"{name}={value}" for name, value in tuned.items()),
+                        path=path, settings=tuned)
+    
     def run(self):
+        self._apply_tuning_profile()
         
         try:
             detection_gui = GameDetectionGUI(self.on_game_detected)
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# logging.py - Structured Asynchronous Logging
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 📝 FiveM Fishing Bot - Logging Subsystem
+# Description: Structured events with lazy %-formatting, an in-memory ring buffer and a
+#              background writer thread that flushes JSON lines to a rotating file
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import traceback
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from launcher_config import BotConfig, data_path
+
+LOGGER_NAME = 'fivem_bot'
+
+# Nothing is printed until setup_logging() attaches handlers
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+class EventLogger:
+    """
+    Structured front end over a stdlib logger.
+
+    Every call names an event and passes a %-style message with its
+    arguments; the message is only formatted on the writer thread (or
+    when read back from the ring buffer), and a disabled level costs one
+    cached isEnabledFor() check. Keyword arguments become record fields.
+    """
+
+    __slots__ = ('logger', 'fields')
+
+    def __init__(self, logger: logging.Logger, **fields):
+        self.logger = logger
+        self.fields = fields
+
+    def bind(self, **fields) -> 'EventLogger':
+        """Return a logger that adds `fields` to every record"""
+        return EventLogger(self.logger, **dict(self.fields, **fields))
+
+    def is_enabled(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level: int, event: str, msg: str, args: tuple, fields: Dict[str, Any]) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        if self.fields:
+            fields = dict(self.fields, **fields)
+        self.logger.log(level, msg, *args, extra={'event': event, 'fields': fields})
+
+    def debug(self, event: str, msg: str, *args, **fields) -> None:
+        self._log(logging.DEBUG, event, msg, args, fields)
+
+    def info(self, event: str, msg: str, *args, **fields) -> None:
+        self._log(logging.INFO, event, msg, args, fields)
+
+    def warning(self, event: str, msg: str, *args, **fields) -> None:
+        self._log(logging.WARNING, event, msg, args, fields)
+
+    def error(self, event: str, msg: str, *args, **fields) -> None:
+        self._log(logging.ERROR, event, msg, args, fields)
+
+    def exception(self, event: str, msg: str, *args, **fields) -> None:
+        """Error with the current traceback as a field (formatted now so the
+        ring buffer never keeps frames and their screenshots alive)"""
+        if self.logger.isEnabledFor(logging.ERROR):
+            fields['traceback'] = traceback.format_exc()
+            self._log(logging.ERROR, event, msg, args, fields)
+
+
+def _detach(record: logging.LogRecord) -> logging.LogRecord:
+    """
+    Drop live exceptions from a record before it is stored or queued.
+
+    An exception passed as a message argument, a field or exc_info keeps
+    its traceback - and every frame's locals, screenshots included -
+    alive for as long as the record is. Such records are formatted to
+    text on the spot; all others stay unformatted.
+    """
+    fields = getattr(record, 'fields', None)
+    args = record.args if isinstance(record.args, tuple) else ()
+    if (record.exc_info is None and not any(isinstance(a, BaseException) for a in args)
+            and not (fields and any(isinstance(v, BaseException) for v in fields.values()))):
+        return record
+    record.msg = record.getMessage()
+    record.args = None
+    if record.exc_info:
+        record.exc_text = ''.join(traceback.format_exception(*record.exc_info))
+        record.exc_info = None
+    if fields:
+        record.fields = {k: repr(v) if isinstance(v, BaseException) else v for k, v in fields.items()}
+    return record
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record: time, level, event, message and fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'event': getattr(record, 'event', None),
+            'message': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry['fields'] = fields
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last `capacity` records in memory (unformatted unless they carry an exception)"""
+
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # deque.append is atomic; skip the handler lock on the hot path
+        self.records.append(_detach(record))
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(_detach(record))
+
+    def recent(self, count: Optional[int] = None) -> List[logging.LogRecord]:
+        records = list(self.records)
+        return records if count is None else records[-count:]
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the writer thread without formatting or blocking.
+
+    Records are queued as-is (except those carrying exceptions, see
+    _detach), so message arguments must not be mutated after the call; when the queue is full the record is counted and
+    dropped rather than stalling the caller.
+    """
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return _detach(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _SinkHandler(logging.Handler):
+    """Forwards formatted messages to front-end callbacks (runs on the writer thread)"""
+
+    def __init__(self):
+        super().__init__()
+        self.callbacks: List[Callable[[str], None]] = []
+        self.setFormatter(logging.Formatter('%(message)s'))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        callbacks = self.callbacks
+        if not callbacks:
+            return
+        message = self.format(record)
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception:
+                pass
+
+
+class LogSystem:
+    """
+    Owns the bot's logging pipeline.
+
+    Calling thread: level check, ring buffer append, non-blocking enqueue.
+    Writer thread (QueueListener): formatting, rotating JSON-lines file
+    and front-end sinks such as the GUI or console log_message.
+    """
+
+    def __init__(self, path: Optional[str] = None, debug: Optional[bool] = None):
+        self.path = path or data_path(BotConfig.LOG_FILE)
+        self.logger = logging.getLogger(LOGGER_NAME)
+        self.logger.propagate = False
+        self.ring = RingBufferHandler(BotConfig.LOG_RING_CAPACITY)
+        self.queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=BotConfig.LOG_QUEUE_SIZE))
+        self.sinks = _SinkHandler()
+        self.file_handler = None
+        self.listener = None
+        self.set_debug(BotConfig.DEBUG_MODE if debug is None else debug)
+
+    def start(self) -> 'LogSystem':
+        if self.listener is not None:
+            return self
+        handlers = [self.sinks]
+        try:
+            self.file_handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=BotConfig.LOG_MAX_BYTES,
+                backupCount=BotConfig.LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+            )
+            self.file_handler.setFormatter(JsonLineFormatter())
+            handlers.insert(0, self.file_handler)
+        except OSError:
+            self.file_handler = None  # Keep logging to the ring buffer and sinks
+
+        self.listener = logging.handlers.QueueListener(self.queue_handler.queue, *handlers)
+        self.logger.addHandler(self.ring)
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+        return self
+
+    def stop(self) -> None:
+        """Flush queued records and stop the writer thread"""
+        if self.listener is None:
+            return
+        self.logger.removeHandler(self.queue_handler)
+        self.logger.removeHandler(self.ring)
+        self.listener.stop()
+        self.listener = None
+        if self.file_handler is not None:
+            self.file_handler.close()
+
+    def set_debug(self, enabled: bool) -> None:
+        self.logger.setLevel(logging.DEBUG if enabled else logging.INFO)
+
+    def add_sink(self, callback: Callable[[str], None]) -> None:
+        self.sinks.callbacks = self.sinks.callbacks + [callback]
+
+    def remove_sink(self, callback: Callable[[str], None]) -> None:
+        self.sinks.callbacks = [c for c in self.sinks.callbacks if c is not callback]
+
+    @property
+    def dropped(self) -> int:
+        return self.queue_handler.dropped
+
+    def recent(self, count: Optional[int] = None) -> List[str]:
+        """Formatted JSON lines for the most recent records in the ring buffer"""
+        formatter = JsonLineFormatter()
+        return [formatter.format(record) for record in self.ring.recent(count)]
+
+
+_system: Optional[LogSystem] = None
+_system_lock = threading.Lock()
+
+
+def setup_logging(path: Optional[str] = None, debug: Optional[bool] = None) -> LogSystem:
+    """Create and start the process-wide log system (idempotent)"""
+    global _system
+    with _system_lock:
+        if _system is None:
+            _system = LogSystem(path, debug)
+        elif debug is not None:
+            _system.set_debug(debug)
+        return _system.start()
+
+
+def get_log_system() -> Optional[LogSystem]:
+    return _system
+
+
+def get_logger(component: str, **fields) -> EventLogger:
+    """Structured logger for one component, e.g. get_logger('core', hwnd=hwnd)"""
+    return EventLogger(logging.getLogger(f"{LOGGER_NAME}.{component}"), **fields)
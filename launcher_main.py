@@ -11,15 +11,21 @@ import threading
 import time
 import sys
 import inspect
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
 
 # Core imports
-from launcher_config import BotConfig
+from launcher_config import BotConfig, data_path
 from launcher_window_manager import WindowManager
 from launcher_template_manager import TemplateManager
 from launcher_key_detector import KeyDetector
 from launcher_key_executor import KeyExecutor
-from launcher_gui_interface import GUIInterface
+from launcher_execution_worker import ExecutionWorker
+from launcher_bot_core import BotCore
+from launcher_async_runtime import AsyncBotRuntime
+from launcher_detection_profile import DetectionProfileStore
+from launcher_metrics import metrics
+from launcher_perf_stats import PerfStatsCollector
+from launcher_logging import setup_logging, get_logger
 
 
 class FiveMFishingBot:
@@ -33,22 +39,46 @@ class FiveMFishingBot:
     - Advanced key sequence detection and execution
     """
     
-    # Performance constants
+    # Performance constants (detection timings live in BotCore)
     SCREENSHOT_INTERVAL = 0.5        # Screenshot frequency (5 fps)
-    MAIN_LOOP_DELAY = 0.15          # Main loop delay (6.7 iterations/sec)
-    POST_EXECUTION_DELAY = 1.5       # Delay after successful execution
-    AREA_TEST_DURATION = 1.5         # Area testing duration
     FAILED_SCREENSHOT_DELAY = 0.8    # Delay after screenshot failure
     CRITICAL_FAILURE_DELAY = 1.0     # Delay after multiple failures
-    
-    def __init__(self, detected_hwnd: Optional[int] = None):
+    NO_SCREEN_DELAY = 0.5            # Delay when no screenshot is available
+    WINDOW_REACQUIRE_DELAY = 0.5     # Delay after re-finding the FiveM window
+    
+    def __init__(self, detected_hwnd: Optional[int] = None, detected_hwnds: Optional[List[int]] = None,
+                 gui_factory: Optional[Callable[[Callable], Any]] = None,
+                 window_manager: Optional[Any] = None, key_executor: Optional[Any] = None,
+                 execution_worker: Optional[Any] = None,
+                 clock: Optional[Callable[[], float]] = None,
+                 sleep: Optional[Callable[[float], None]] = None,
+                 flight_recorder: Optional[bool] = None):
         """
         Initialize the FiveM Fishing Bot
         
         Args:
             detected_hwnd: Pre-detected window handle (optional)
+            detected_hwnds: All detected window handles for multi-window mode (optional)
+            gui_factory: Builds the front end from the toggle callback (default: Tk GUIInterface)
+            window_manager: Window capture source (default: WindowManager)
+            key_executor: Key sender (default: KeyExecutor)
+            execution_worker: Runs key sequences off the loop (default: ExecutionWorker thread)
+            clock: Time source for the loop and bot core (default: wall/monotonic time)
+            sleep: Wait function for the loop (default: time.sleep)
+            flight_recorder: Keep the flight recorder (default: BotConfig.FLIGHT_RECORDER_ENABLED)
             _launcher_token: Security token from launcher
         """
+        self.gui_factory = gui_factory
+        self.detected_hwnds = list(detected_hwnds or [])
+        self.multi_runner = None
+        self.window_manager = window_manager
+        self.key_executor = key_executor
+        self.execution_worker = execution_worker
+        self.clock = clock or time.time
+        self.sleep = sleep or time.sleep
+        self.core_clock = clock or time.monotonic
+        self.flight_recorder_enabled = (BotConfig.FLIGHT_RECORDER_ENABLED
+                                        if flight_recorder is None else flight_recorder)
         
         # 🎯 Core components initialization
         self._initialize_components()
@@ -67,29 +97,82 @@ class FiveMFishingBot:
     
     def _initialize_components(self) -> None:
         """Initialize all core components"""
-        self.window_manager = WindowManager()
+        self.log_system = setup_logging()
+        self.logger = get_logger('bot')
+        self.window_manager = self.window_manager or WindowManager()
         self.template_manager = TemplateManager()
-        self.key_detector = None
-        self.key_executor = KeyExecutor()
-        self.gui = GUIInterface(self.toggle_bot)
+        self.key_executor = self.key_executor or KeyExecutor()
+        self.execution_worker = self.execution_worker or ExecutionWorker(self.key_executor)
+        if self.gui_factory is None:
+            # Imported lazily so headless runs never load tkinter
+            from launcher_gui_interface import GUIInterface
+            self.gui_factory = GUIInterface
+        self.gui = self.gui_factory(self.toggle_bot)
+        self.log_system.add_sink(self.gui.log_message)
+        self.core = BotCore(
+            self.execution_worker,
+            self.window_manager.get_window_handle,
+            clock=self.core_clock,
+            profile_store=DetectionProfileStore() if BotConfig.DETECTION_PROFILES_ENABLED else None,
+            profile_key_provider=self.window_manager.get_profile_key,
+            flight_recorder=self._create_flight_recorder(),
+        )
+        # Manual dumps go through the front end's hotkeys (harness front ends have none)
+        bind = getattr(self.gui, 'bind_flight_recorder', None)
+        if self.core.flight_recorder is not None and bind is not None:
+            bind(self.dump_flight_recorder)
+    
+    def _create_flight_recorder(self) -> Optional[Any]:
+        """Ring buffer of recent frames (None when disabled)"""
+        if not self.flight_recorder_enabled:
+            return None
+        from launcher_flight_recorder import FlightRecorder
+        return FlightRecorder()
+    
+    def dump_flight_recorder(self) -> Optional[str]:
+        """🛩️ Save the last few seconds of frames and decisions (hotkey)"""
+        path = self.core.dump_flight_recorder('manual', force=True)
+        if path:
+            self.logger.info('flight_recorder_manual', "🛩️ Flight recorder saved: %s", path, path=path)
+        return path
+    
+    @property
+    def key_detector(self) -> Any:
+        """Key detector used by the bot core"""
+        return self.core.key_detector
+    
+    @key_detector.setter
+    def key_detector(self, detector: Any) -> None:
+        self.core.key_detector = detector
     
     def _setup_window(self, detected_hwnd: Optional[int]) -> None:
         """Setup FiveM window if provided"""
         if detected_hwnd:
             self.window_manager.fivem_window = detected_hwnd
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message(f"🎯 Using detected FiveM window (Handle: {detected_hwnd})")
+            self.logger.debug('window_detected', "🎯 Using detected FiveM window (Handle: %s)", detected_hwnd,
+                              hwnd=detected_hwnd)
     
     def _initialize_bot_state(self) -> None:
         """Initialize bot operational state"""
         self.is_running = False
         self.bot_thread = None
+        self.async_runtime = AsyncBotRuntime(self, on_error=self._on_runtime_error)
     
     def _initialize_performance_tracking(self) -> None:
         """Initialize performance optimization variables"""
         self.last_screenshot_time = 0
         self.last_screenshot = None
         self.screenshot_failed_count = 0
+        self.capture_backoff = 0.0
+        self.frames_captured = 0
+        self.screen_requests = 0
+        self.cache_hits = 0
+        self.frame_recorder = None
+        # Spans are only switched on for a front end that displays them
+        self.perf_stats = None
+        if getattr(self.gui, 'stats_panel', False):
+            self.perf_stats = PerfStatsCollector(BotConfig.PERF_PANEL_INTERVAL)
+            metrics.configure(enabled=True)
     
     def _validate_call_stack(self) -> bool:
         """Validate that the call originated from launcher.py"""
@@ -121,28 +204,34 @@ class FiveMFishingBot:
         """Initialize FiveM window detection"""
         if not self.window_manager.get_window_handle():
             if self.window_manager.find_fivem_window():
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message("🪟 FiveM window found successfully")
+                self.logger.debug('window_found', "🪟 FiveM window found successfully")
             else:
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message("⚠️ FiveM window not found!")
+                self.logger.warning('window_missing', "⚠️ FiveM window not found!")
     
     def _initialize_templates(self) -> None:
         """Initialize template loading and key detection"""
         if self.template_manager.auto_load_templates():
             templates = self.template_manager.get_templates()
-            self.key_detector = KeyDetector(templates)
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message("📁 All templates loaded successfully!")
+            self.key_detector = self._create_key_detector(templates)
+            self.logger.debug('templates_loaded', "📁 All templates loaded successfully!")
         else:
             templates = self.template_manager.get_templates()
             if templates:
-                self.key_detector = KeyDetector(templates)
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message("📁 Partial templates loaded")
+                self.key_detector = self._create_key_detector(templates)
+                self.logger.warning('templates_partial', "📁 Partial templates loaded", count=len(templates))
             else:
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message("⚠️ Warning: No template files found!")
+                self.logger.warning('templates_missing', "⚠️ Warning: No template files found!")
+    
+    def _create_key_detector(self, templates: Dict[str, Any]) -> Any:
+        """Create the key detector (in-process or worker process)"""
+        if BotConfig.DETECTOR_OUT_OF_PROCESS:
+            try:
+                from launcher_detector_process import RemoteKeyDetector
+                return RemoteKeyDetector(templates)
+            except Exception as e:
+                self.logger.warning('detector_process_unavailable',
+                                    "⚠️ Detector process unavailable, using in-process detection: %s", e)
+        return KeyDetector(templates)
     
     def get_current_screen(self) -> Optional[Any]:
         """
@@ -151,10 +240,12 @@ class FiveMFishingBot:
         Returns:
             Screenshot data or None if capture failed
         """
-        current_time = time.time()
+        current_time = self.clock()
+        self.screen_requests += 1
         
         # Check if we need a new screenshot
         if self._should_use_cached_screenshot(current_time):
+            self.cache_hits += 1
             return self.last_screenshot
         
         # Capture new screenshot
@@ -182,18 +273,37 @@ class FiveMFishingBot:
         self.last_screenshot = screen
         self.last_screenshot_time = current_time
         self.screenshot_failed_count = 0
+        self.capture_backoff = 0.0
+        self.frames_captured += 1
+        recorder = self.frame_recorder
+        if recorder is not None:
+            self._record_frame(recorder, screen, current_time)
+    
+    def _record_frame(self, recorder: Any, screen: Any, current_time: float) -> None:
+        """Queue the locked area (plus margin) of a new capture for the session recording"""
+        area = self.key_detector.key_sequence_area if self.key_detector is not None else None
+        if area:
+            margin = BotConfig.FRAME_RECORDING_MARGIN
+            x, y, w, h = area
+            x0, y0 = max(0, x - margin), max(0, y - margin)
+            x1 = min(screen.shape[1], x + w + margin)
+            y1 = min(screen.shape[0], y + h + margin)
+            area = (x0, y0, x1 - x0, y1 - y0)
+        elif not BotConfig.FRAME_RECORDING_FULL_FRAMES:
+            return
+        # Recorded unlabeled: the bot's own reads would grade the detector on its output
+        recorder.record(screen, current_time, area)
     
     def _handle_failed_screenshot(self) -> None:
-        """Handle failed screenshot attempts"""
+        """Handle failed screenshot attempts (back-off is applied by the loop)"""
         self.screenshot_failed_count += 1
         
         if self.screenshot_failed_count >= 3:
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message("⚠️ Multiple screenshot failures detected, increasing delay...")
-            time.sleep(self.CRITICAL_FAILURE_DELAY)
+            self.logger.warning('capture_backoff', "⚠️ Multiple screenshot failures detected, increasing delay...")
+            self.capture_backoff = self.CRITICAL_FAILURE_DELAY
             self.screenshot_failed_count = 0
         else:
-            time.sleep(self.FAILED_SCREENSHOT_DELAY)
+            self.capture_backoff = self.FAILED_SCREENSHOT_DELAY
     
     def bot_loop(self) -> None:
         """
@@ -204,205 +314,62 @@ class FiveMFishingBot:
         - Optimized performance with minimal resource usage
         - Robust error handling and recovery
         - Dynamic sequence detection and execution
+        
+        All decisions are made by BotCore; this loop only feeds it frames
+        and waits for the delay it asks for.
         """
-        # Initialize loop variables
-        loop_state = self._initialize_loop_state()
-        if (BotConfig.DEBUG_MODE):
-            self.gui.log_message("🤖 Bot Started - Initializing intelligent detection...")
+        self.core.reset()
+        self.logger.info('loop_started', "🤖 Bot Started - Initializing intelligent detection...", runtime='thread')
         
         while self.is_running:
             try:
-                # Validate FiveM window connection
-                if not self._validate_fivem_connection():
+                delay = self._loop_iteration()
+                if delay is None:
                     break
-                
-                # Get optimized screen capture
-                screen = self.get_current_screen()
-                if screen is None:
-                    time.sleep(0.5)
-                    continue
-                
-                current_time = time.time()
-                
-                # Execute main detection logic
-                self._execute_detection_logic(screen, current_time, loop_state)
-                
-                # Optimized loop timing
-                time.sleep(self.MAIN_LOOP_DELAY)
+                self.sleep(delay)
                 
             except Exception as e:
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message(f"🚨 Bot error: {str(e)}")
-                time.sleep(1)
-    
-    def _initialize_loop_state(self) -> Dict[str, Any]:
-        """Initialize loop state variables"""
-        return {
-            'last_sequence_str': "",
-            'sequence_stable_start': None,
-            'consecutive_same_detections': 0,
-            'area_confirmed_good': False,
-            'area_test_start_time': None,
-            'test_success_count': 0
-        }
+                self.logger.exception('loop_error', "🚨 Bot error: %s", e)
+                self.sleep(1)
+    
+    def _loop_iteration(self) -> Optional[float]:
+        """Run one capture/detect step; returns the next delay or None to stop"""
+        # Validate FiveM window connection
+        connection_delay = self._validate_fivem_connection()
+        if connection_delay is None:
+            return None
+        
+        # Get optimized screen capture
+        with metrics.span('loop.capture'):
+            screen = self.get_current_screen()
+        if screen is None:
+            return max(self.capture_backoff, self.NO_SCREEN_DELAY)
+        
+        # Execute main detection logic
+        with metrics.span('loop.step'):
+            delay = self.core.step(screen)
+        self.publish_stats()
+        return max(delay, connection_delay, self.capture_backoff)
+    
+    def publish_stats(self) -> None:
+        """Hand a throttled performance snapshot to the GUI (thread-safe)"""
+        if self.perf_stats is None:
+            return
+        stats = self.perf_stats.maybe_collect(self)
+        if stats is not None:
+            self.gui.publish_stats(stats)
     
-    def _validate_fivem_connection(self) -> bool:
-        """Validate FiveM window connection"""
+    def _validate_fivem_connection(self) -> Optional[float]:
+        """Validate FiveM window connection; returns extra delay or None if lost"""
         if not self.window_manager.get_window_handle():
             if not self.window_manager.find_fivem_window():
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message("❌ FiveM window lost! Returning to launcher...")
+                self.logger.warning('window_lost', "❌ FiveM window lost! Returning to launcher...")
                 self.is_running = False
                 self.gui.close()
-                return False
+                return None
             else:
-                time.sleep(0.5)
-        return True
-    
-    def _execute_detection_logic(self, screen: Any, current_time: float, state: Dict[str, Any]) -> None:
-        """Execute main detection and execution logic"""
-        if not state['area_confirmed_good']:
-            self._handle_area_detection(screen, current_time, state)
-        else:
-            self._handle_sequence_detection(screen, current_time, state)
-    
-    def _handle_area_detection(self, screen: Any, current_time: float, state: Dict[str, Any]) -> None:
-        """Handle minigame area detection and validation"""
-        if not self.key_detector or not self.key_detector.get_detection_area():
-            if self.key_detector and self.key_detector.auto_detect_minigame_area(screen):
-                area = self.key_detector.get_detection_area()
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message(f"🎯 Found potential area: {area} - Initiating validation...")
-                state['area_test_start_time'] = current_time
-                state['test_success_count'] = 0
-        else:
-            self._test_detection_area(screen, current_time, state)
-    
-    def _test_detection_area(self, screen: Any, current_time: float, state: Dict[str, Any]) -> None:
-        """Test and validate detection area"""
-        if state['area_test_start_time'] is None:
-            state['area_test_start_time'] = current_time
-            state['test_success_count'] = 0
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message("🧪 Testing detection area reliability...")
-            return
-        
-        current_sequence = self.key_detector.detect_key_sequence(screen)
-        current_sequence_str = ' '.join(current_sequence)
-        
-        if current_sequence_str and len(current_sequence) >= 5:
-            state['test_success_count'] += 1
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message(f"🧪 Test reading: {current_sequence_str} (Success: {state['test_success_count']})")
-            
-            if len(current_sequence) >= BotConfig.TARGET_SEQUENCE_LENGTH:
-                if self._test_execution(current_sequence, current_sequence_str):
-                    state['area_confirmed_good'] = True
-                    state['area_test_start_time'] = None
-                    if (BotConfig.DEBUG_MODE):
-                        self.gui.log_message("✅ Area validation PASSED! (Execution successful)")
-                    time.sleep(1.0)
-                    return
-        
-        self._finalize_area_test(current_time, state)
-    
-    def _test_execution(self, sequence: list, sequence_str: str) -> bool:
-        """Test execute sequence for area validation"""
-        hwnd = self.window_manager.get_window_handle()
-        if self.key_executor.execute_key_sequence(sequence, hwnd):
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message(f"🎯 Validation execution successful: {sequence_str}")
-            return True
-        else:
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message("❌ Validation execution failed")
-            return False
-    
-    def _finalize_area_test(self, current_time: float, state: Dict[str, Any]) -> None:
-        """Finalize area testing process"""
-        test_duration = current_time - state['area_test_start_time']
-        if test_duration >= self.AREA_TEST_DURATION:
-            self.gui.log_message(f"📊 Area test completed: {state['test_success_count']} successful readings")
-            
-            if state['test_success_count'] >= 2:
-                state['area_confirmed_good'] = True
-                state['area_test_start_time'] = None
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message("✅ Area validation PASSED! Proceeding with automation.")
-            else:
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message(f"❌ Area validation FAILED ({state['test_success_count']} successful readings)")
-                self._reset_area_detection(state)
-    
-    def _reset_area_detection(self, state: Dict[str, Any]) -> None:
-        """Reset area detection for retry"""
-        if self.key_detector:
-            self.key_detector.key_sequence_area = None
-        state['area_test_start_time'] = None
-        state['test_success_count'] = 0
-        time.sleep(1.0)
-    
-    def _handle_sequence_detection(self, screen: Any, current_time: float, state: Dict[str, Any]) -> None:
-        """Handle main sequence detection and execution"""
-        current_sequence = self.key_detector.detect_key_sequence(screen)
-        current_sequence_str = ' '.join(current_sequence)
-        
-        if not current_sequence_str:
-            self._reset_sequence_state(state)
-            return
-        
-        if current_sequence_str == state['last_sequence_str']:
-            self._handle_stable_sequence(current_sequence, current_sequence_str, current_time, state)
-        else:
-            self._handle_new_sequence(current_sequence_str, state)
-    
-    def _handle_stable_sequence(self, sequence: list, sequence_str: str, current_time: float, state: Dict[str, Any]) -> None:
-        """Handle stable sequence detection"""
-        state['consecutive_same_detections'] += 1
-        
-        if (state['consecutive_same_detections'] >= BotConfig.MIN_CONSECUTIVE_DETECTIONS and
-            len(sequence) >= BotConfig.TARGET_SEQUENCE_LENGTH):
-            
-            if state['sequence_stable_start'] is None:
-                state['sequence_stable_start'] = current_time
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message(f"⏳ Sequence stabilizing: {sequence_str}")
-            elif (current_time - state['sequence_stable_start']) >= BotConfig.SEQUENCE_STABLE_TIME:
-                self._execute_stable_sequence(sequence, sequence_str, state)
-    
-    def _execute_stable_sequence(self, sequence: list, sequence_str: str, state: Dict[str, Any]) -> None:
-        """Execute validated stable sequence"""
-        hwnd = self.window_manager.get_window_handle()
-        if (BotConfig.DEBUG_MODE):
-            self.gui.log_message(f"🎯 Executing sequence: {sequence_str}")
-        
-        try:
-            success = self.key_executor.execute_key_sequence(sequence, hwnd)
-            if success:
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message(f"✅ Execution complete: {len(sequence)} keys executed successfully")
-                    self.gui.log_message("⏸️ Processing delay active...")
-                time.sleep(self.POST_EXECUTION_DELAY)
-            else:
-                if (BotConfig.DEBUG_MODE):
-                    self.gui.log_message("❌ Execution failed - Key executor returned False")
-        except Exception as e:
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message(f"❌ Execution error: {str(e)}")
-        
-        self._reset_sequence_state(state)
-    
-    def _handle_new_sequence(self, sequence_str: str, state: Dict[str, Any]) -> None:
-        """Handle new sequence detection"""
-        state['last_sequence_str'] = sequence_str
-        state['sequence_stable_start'] = None
-        state['consecutive_same_detections'] = 0
-    
-    def _reset_sequence_state(self, state: Dict[str, Any]) -> None:
-        """Reset sequence detection state"""
-        state['last_sequence_str'] = ""
-        state['sequence_stable_start'] = None
-        state['consecutive_same_detections'] = 0
+                return self.WINDOW_REACQUIRE_DELAY
+        return 0.0
     
     def toggle_bot(self) -> None:
         """
@@ -425,14 +392,39 @@ class FiveMFishingBot:
         
         # Reset performance tracking
         self._reset_performance_tracking()
+        if BotConfig.FRAME_RECORDING_ENABLED:
+            self._start_recording()
         
-        # Start bot thread
+        # Start bot thread (or asyncio runtime / one lane per window)
         self.is_running = True
         self.gui.update_status(True)
-        self.bot_thread = threading.Thread(target=self.bot_loop, daemon=True)
-        self.bot_thread.start()
-        if (BotConfig.DEBUG_MODE):
-            self.gui.log_message("🚀 Bot automation started successfully!")
+        if self._multi_instance_enabled():
+            self._start_multi_instance()
+        elif BotConfig.RUNTIME == 'asyncio':
+            self.async_runtime.start()
+        else:
+            self.bot_thread = threading.Thread(target=self.bot_loop, daemon=True)
+            self.bot_thread.start()
+        self.logger.info('bot_started', "🚀 Bot automation started successfully!")
+    
+    def _on_runtime_error(self, message: str) -> None:
+        """asyncio runtime could not start or crashed (any thread; goes through the GUI bus)"""
+        self.is_running = False
+        self.gui.update_status(False)
+        self.gui.show_error("Error", message)
+    
+    def _multi_instance_enabled(self) -> bool:
+        """Multi-window mode needs the flag and more than one detected window"""
+        return BotConfig.MULTI_INSTANCE and len(self.detected_hwnds) > 1
+    
+    def _start_multi_instance(self) -> None:
+        """Start one lane per detected FiveM window"""
+        from launcher_multi_instance import MultiInstanceRunner
+        if self.multi_runner is None:
+            self.multi_runner = MultiInstanceRunner(self.template_manager.get_templates())
+        self.multi_runner.start(self.detected_hwnds)
+        self.logger.info('multi_instance_started', "🪟 Multi-window mode: %d lanes started",
+                         len(self.detected_hwnds), lanes=len(self.detected_hwnds))
     
     def _validate_window_for_start(self) -> bool:
         """Validate FiveM window before starting"""
@@ -450,7 +442,7 @@ class FiveMFishingBot:
                 return False
             else:
                 templates = self.template_manager.get_templates()
-                self.key_detector = KeyDetector(templates)
+                self.key_detector = self._create_key_detector(templates)
         return True
     
     def _reset_performance_tracking(self) -> None:
@@ -458,13 +450,75 @@ class FiveMFishingBot:
         self.last_screenshot_time = 0
         self.last_screenshot = None
         self.screenshot_failed_count = 0
+        self.capture_backoff = 0.0
+        self.frames_captured = 0
+        self.screen_requests = 0
+        self.cache_hits = 0
+        if self.perf_stats is not None:
+            self.perf_stats.reset()
     
     def _stop_bot(self) -> None:
         """Stop bot automation"""
         self.is_running = False
+        if self.async_runtime.running:
+            self.async_runtime.stop()
+        if self.multi_runner is not None and self.multi_runner.lanes:
+            stats = self.multi_runner.stats()
+            self.multi_runner.stop()
+            self.logger.info('multi_instance_stats', "📊 %d windows: %.1f fps, %.0f catches/h",
+                             len(stats['lanes']), stats['fps'], stats['catches_per_hour'],
+                             fps=stats['fps'], catches_per_hour=stats['catches_per_hour'])
         self.gui.update_status(False)
-        if (BotConfig.DEBUG_MODE):
-            self.gui.log_message("🛑 Bot automation stopped")
+        stats = self.core.verifier.summary(self.core.clock())
+        self.logger.info('session_summary', "📊 Catches: %d (%.0f/h), cycle time saved: %.2fs/catch",
+                         stats['catches'], stats['catches_per_hour'], stats['saved_per_catch'], **stats)
+        for state, dwell in self.core.machine.dwell_stats().items():
+            if dwell['count']:
+                self.logger.debug('state_dwell', "⏱️ %s: %dx, mean %.3fs, max %.3fs",
+                                  state, dwell['count'], dwell['mean'], dwell['max'], state=state, **dwell)
+        self.logger.info('bot_stopped', "🛑 Bot automation stopped")
+        self._stop_recording()
+        if BotConfig.METRICS_ENABLED:
+            self.export_metrics()
+    
+    def _start_recording(self) -> None:
+        """Start writing captured frames to a new dataset"""
+        from launcher_frame_dataset import FrameRecorder
+        directory = BotConfig.FRAME_RECORDING_DIR or data_path('recordings', time.strftime('%Y%m%d-%H%M%S'))
+        metadata = {
+            'profile_key': self.window_manager.get_profile_key(),
+            'sensitivity': BotConfig.SENSITIVITY,
+            'full_frames': BotConfig.FRAME_RECORDING_FULL_FRAMES,
+        }
+        self.frame_recorder = FrameRecorder(directory, BotConfig.FRAME_RECORDING_CHUNK_FRAMES, metadata=metadata)
+        self.logger.info('recording_started', "🎞️ Recording frames to %s", directory, directory=directory)
+    
+    def _stop_recording(self) -> None:
+        """Flush and close the session recording"""
+        recorder, self.frame_recorder = self.frame_recorder, None
+        if recorder is None:
+            return
+        recorder.close()
+        self.logger.info('recording_stopped', "🎞️ Recorded %d frames (%d dropped)",
+                         recorder.recorded, recorder.dropped,
+                         recorded=recorder.recorded, dropped=recorder.dropped)
+    
+    def export_metrics(self, directory: Optional[str] = None) -> List[str]:
+        """
+        📈 Write per-stage latency histograms (and the trace when enabled)
+        
+        Returns:
+            Paths of the written files
+        """
+        try:
+            paths = metrics.export(directory or data_path())
+        except OSError as e:
+            self.logger.warning('metrics_export_failed', "⚠️ Metrics export failed: %s", e)
+            return []
+        for name, span in metrics.snapshot().items():
+            self.logger.debug('stage_latency', "📈 %s: p50 %.2fms, p95 %.2fms (%dx)",
+                              name, span['p50_ms'], span['p95_ms'], span['count'], stage=name, **span)
+        return paths
     
     def run(self) -> None:
         """
@@ -473,11 +527,20 @@ class FiveMFishingBot:
         try:
             self.gui.run()
         except Exception as e:
-            if (BotConfig.DEBUG_MODE):
-                self.gui.log_message(f"🚨 Unexpected error: {str(e)}")
-                print(f"Critical error: {str(e)}")
+            self.logger.exception('unexpected_error', "🚨 Unexpected error: %s", e)
+            print(f"Critical error: {str(e)}")
         finally:
             self.is_running = False
+            self.async_runtime.stop()
+            self.execution_worker.shutdown()
+            if self.multi_runner is not None:
+                self.multi_runner.shutdown()
+            # RemoteKeyDetector owns a worker process and shared memory
+            close = getattr(self.key_detector, 'close', None)
+            if close is not None:
+                close()
+            self.log_system.remove_sink(self.gui.log_message)
+            self.log_system.stop()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# memory_profile.py - Memory Profiling Harness for the Capture/Detect Loop
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 🧠 FiveM Fishing Bot - Memory Growth Check
+# Description: Drives the full bot loop over thousands of simulated frames under
+#              tracemalloc and reports steady-state memory per frame, top allocation
+#              sites and the leak slope, failing when the slope exceeds a threshold
+# Usage: python launcher_memory_profile.py --frames 5000 [--max-slope 64]
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from launcher_config import BotConfig
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+MAX_SLOPE = 64.0            # Allowed retained bytes per frame over the measured window
+TRACEBACK_DEPTH = 8
+
+
+def _rss() -> Optional[int]:
+    """Resident set size, which also sees native (OpenCV/GDI) memory tracemalloc cannot"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def leak_slope(points: Sequence[Tuple[int, int]]) -> float:
+    """Least-squares slope of traced bytes against frames (bytes per frame)"""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    if sxx == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+
+
+def top_sites(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    """Allocation sites with the largest growth between two snapshots"""
+    sites = []
+    for stat in after.compare_to(before, 'traceback')[:limit]:
+        frame = stat.traceback[-1]    # Most recent frame: where the block was allocated
+        sites.append({
+            'site': f"{frame.filename}:{frame.lineno}",
+            'size_diff': stat.size_diff,
+            'count_diff': stat.count_diff,
+            'size': stat.size,
+            'traceback': stat.traceback.format(),
+        })
+    return sites
+
+
+def profile_loop(frames: int = 5000, warmup: int = 500, checkpoint: int = 250, top: int = 10,
+                 **simulation_options) -> Dict[str, Any]:
+    """
+    Run a simulated session under tracemalloc.
+
+    The first `warmup` frames fill caches (templates, plans, histograms,
+    log buffers) untraced; the next `frames` are measured, with the traced
+    total sampled every `checkpoint` frames.
+    """
+    from launcher_simulator import Simulation
+
+    simulation = Simulation(**simulation_options)
+    game = simulation.game
+    try:
+        simulation.run(lambda sim: game.frames_served >= warmup)
+
+        gc.collect()
+        tracemalloc.start(TRACEBACK_DEPTH)
+        start_frames = game.frames_served
+        rss_start = _rss()
+        snapshot_start = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        points = [(0, 0)]
+        next_checkpoint = [checkpoint]
+
+        def measure(sim) -> bool:
+            done = game.frames_served - start_frames
+            if done >= next_checkpoint[0]:
+                points.append((done, tracemalloc.get_traced_memory()[0] - base))
+                next_checkpoint[0] += checkpoint
+            return done >= frames
+
+        try:
+            simulation.run(measure)
+            gc.collect()
+            measured = game.frames_served - start_frames
+            retained = tracemalloc.get_traced_memory()[0] - base
+            peak = tracemalloc.get_traced_memory()[1] - base
+            snapshot_end = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        rss_end = _rss()
+    finally:
+        simulation.close()
+
+    # The first quarter still settles (lazy allocations, first catches)
+    steady = [point for point in points if point[0] >= measured // 4] or points
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    return {
+        'frames': measured,
+        'warmup_frames': warmup,
+        'retained_bytes': retained,
+        'bytes_per_frame': retained / measured if measured else 0.0,
+        'leak_slope': leak_slope(steady),
+        'peak_working_set': peak,
+        'rss_start': rss_start,
+        'rss_end': rss_end,
+        'rss_per_frame': (rss_end - rss_start) / measured if rss_start is not None and measured else None,
+        'checkpoints': points,
+        'top_sites': top_sites(snapshot_start.filter_traces(filters), snapshot_end.filter_traces(filters), top),
+        'simulation': simulation.report(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the bot loop for memory growth")
+    parser.add_argument('--frames', type=int, default=5000, help="measured frames")
+    parser.add_argument('--warmup', type=int, default=500, help="untraced frames before measuring")
+    parser.add_argument('--checkpoint', type=int, default=250, help="frames between samples")
+    parser.add_argument('--top', type=int, default=10, help="allocation sites to report")
+    parser.add_argument('--resolution', default='1080p')
+    parser.add_argument('--condition', default='clean')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--max-slope', type=float, default=MAX_SLOPE, help="bytes per frame")
+    parser.add_argument('--out', help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    # The log ring buffer is bounded but large; a small one fills during warm-up
+    # instead of looking like steady growth in the measured window
+    ring_capacity, BotConfig.LOG_RING_CAPACITY = BotConfig.LOG_RING_CAPACITY, 50
+    try:
+        report = profile_loop(args.frames, args.warmup, args.checkpoint, args.top,
+                              resolution=args.resolution, condition=args.condition, seed=args.seed)
+    finally:
+        BotConfig.LOG_RING_CAPACITY = ring_capacity
+
+    print(f"{report['frames']} frames: {report['bytes_per_frame']:.1f} B/frame retained, "
+          f"leak slope {report['leak_slope']:.1f} B/frame, peak {report['peak_working_set'] / 1024:.0f} KiB")
+    if report['rss_per_frame'] is not None:
+        print(f"RSS {report['rss_start'] / 2 ** 20:.1f} -> {report['rss_end'] / 2 ** 20:.1f} MiB "
+              f"({report['rss_per_frame']:.1f} B/frame)")
+    print("Top allocation sites:")
+    for site in report['top_sites']:
+        print(f"  {site['size_diff']:+10d} B {site['count_diff']:+7d} blocks  {site['site']}")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if report['leak_slope'] > args.max_slope:
+        print(f"❌ Leak slope {report['leak_slope']:.1f} B/frame exceeds {args.max_slope:.1f}")
+        return 1
+    print(f"✅ Leak slope within {args.max_slope:.1f} B/frame")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
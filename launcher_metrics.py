@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+# metrics.py - Per-Stage Latency Instrumentation
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 📈 FiveM Fishing Bot - Span Timers, Histograms and Trace Export
+# Description: `with metrics.span('stage'):` around each pipeline stage; aggregated into
+#              log-bucketed histograms, exportable as JSON or a Chrome trace-event file
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from launcher_config import BotConfig
+
+
+def _bucket_bounds(low: float = 1e-5, high: float = 10.0, ratio: float = 1.25) -> List[float]:
+    """Geometric bucket upper bounds in seconds (10us .. 10s, ~25% wide)"""
+    bounds = []
+    bound = low
+    while bound < high:
+        bounds.append(bound)
+        bound *= ratio
+    bounds.append(high)
+    return bounds
+
+
+BUCKET_BOUNDS = _bucket_bounds()
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with approximate percentiles"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, duration)] += 1
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile, clipped to max"""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(max(bound, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_ms': 1000.0 * self.total / self.count if self.count else 0.0,
+            'min_ms': 1000.0 * self.min if self.count else 0.0,
+            'p50_ms': 1000.0 * self.percentile(50),
+            'p95_ms': 1000.0 * self.percentile(95),
+            'p99_ms': 1000.0 * self.percentile(99),
+            'max_ms': 1000.0 * self.max,
+            'total_ms': 1000.0 * self.total,
+        }
+
+
+class _NullSpan:
+    """Shared no-op span returned while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics: 'Metrics', name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.name, time.perf_counter() - self.start, self.start)
+        return False
+
+
+class Metrics:
+    """
+    Span timer registry.
+
+    While disabled, span() returns a shared no-op context manager and
+    record() returns immediately, so instrumented code pays one attribute
+    check per span. When tracing is on, the most recent spans are also
+    kept in a bounded buffer for Chrome trace export.
+    """
+
+    def __init__(self, enabled: bool = False, trace: bool = False, trace_capacity: int = 100000):
+        self.enabled = enabled
+        self.trace = trace
+        self.lock = threading.Lock()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.events: Deque[Tuple[str, float, float, int]] = deque(maxlen=trace_capacity)
+        self.origin = time.perf_counter()
+
+    def configure(self, enabled: Optional[bool] = None, trace: Optional[bool] = None) -> None:
+        if enabled is not None:
+            self.enabled = enabled
+        if trace is not None:
+            self.trace = trace
+
+    def span(self, name: str):
+        """Context manager timing the enclosed block under `name`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, duration: float, start: Optional[float] = None) -> None:
+        """Add one measured duration (seconds); `start` is a perf_counter value"""
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.add(duration)
+            if self.trace:
+                if start is None:
+                    start = time.perf_counter() - duration
+                self.events.append((name, start, duration, threading.get_ident()))
+
+    def reset(self) -> None:
+        with self.lock:
+            self.histograms.clear()
+            self.events.clear()
+            self.origin = time.perf_counter()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-span summary: count, mean, min, p50/p95/p99 and max in ms"""
+        with self.lock:
+            return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def export_json(self, path: str) -> str:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'generated_at': time.time(), 'spans': self.snapshot()}, f, indent=2)
+        return path
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Write recorded spans as Chrome trace events (chrome://tracing, Perfetto)"""
+        with self.lock:
+            events = list(self.events)
+            origin = self.origin
+        pid = os.getpid()
+        trace_events: List[Dict[str, Any]] = [{
+            'name': name,
+            'cat': name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': (start - origin) * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': tid,
+        } for name, start, duration, tid in events]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+    def export(self, directory: str, prefix: str = 'metrics') -> List[str]:
+        """Write JSON summary (and the trace when tracing) into `directory`"""
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        paths = [self.export_json(os.path.join(directory, f"{prefix}-{stamp}.json"))]
+        if self.trace:
+            paths.append(self.export_chrome_trace(os.path.join(directory, f"{prefix}-{stamp}.trace.json")))
+        return paths
+
+
+# Process-wide registry used by the bot loop, KeyDetector and KeyExecutor
+metrics = Metrics(BotConfig.METRICS_ENABLED, BotConfig.METRICS_TRACE, BotConfig.METRICS_TRACE_CAPACITY)
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# multi_instance.py - Drive Several FiveM Clients from One Process
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from launcher_config import BotConfig
+from launcher_window_manager import WindowManager
+from launcher_key_detector import KeyDetector
+from launcher_key_executor import KeyExecutor
+from launcher_execution_worker import ExecutionWorker
+from launcher_bot_core import BotCore
+from launcher_detection_profile import DetectionProfileStore
+from launcher_logging import get_logger
+
+FAILED_CAPTURE_DELAY = 0.8      # Delay after a lane fails to capture (doubles per failure)
+MAX_CAPTURE_BACKOFF = 8.0       # Longest delay between capture attempts
+LOST_WINDOW_TIMEOUT = 30.0      # A lane whose window is gone this long retires
+
+
+class AcquisitionGate:
+    """
+    Staggers full-frame area acquisitions across lanes.
+
+    At most `max_concurrent` acquisitions may run at once and consecutive
+    acquisitions start at least `min_spacing` seconds apart, so lanes that
+    lose their area at the same time do not all hit the CPU together.
+    """
+
+    def __init__(self, max_concurrent: int = 1, min_spacing: float = 0.1):
+        self.max_concurrent = max_concurrent
+        self.min_spacing = min_spacing
+        self.active = 0
+        self.last_start = float('-inf')
+        self.lock = threading.Lock()
+
+    def try_acquire(self, now: float) -> float:
+        """Returns 0 if the caller may acquire now, else how long to wait"""
+        with self.lock:
+            if self.active >= self.max_concurrent:
+                return self.min_spacing
+            wait = self.last_start + self.min_spacing - now
+            if wait > 0:
+                return wait
+            self.active += 1
+            self.last_start = now
+            return 0.0
+
+    def release(self) -> None:
+        with self.lock:
+            self.active = max(0, self.active - 1)
+
+
+class FocusLockedExecutor:
+    """Serialises key execution across lanes; foreground focus is global"""
+
+    def __init__(self, key_executor: KeyExecutor, focus_lock: threading.Lock):
+        self.key_executor = key_executor
+        self.focus_lock = focus_lock
+
+    def execute_key_sequence(self, sequence, hwnd):
+        with self.focus_lock:
+            return self.key_executor.execute_key_sequence(sequence, hwnd)
+
+
+class InstanceLane:
+    """
+    One FiveM window: own capture session, detector state and executor lane.
+
+    Failed captures back off exponentially. When the window itself is
+    gone the lane asks `refind` for an unclaimed FiveM window (e.g. a
+    restarted client) and retires after LOST_WINDOW_TIMEOUT without one.
+    """
+
+    def __init__(self, hwnd: int, templates: Dict[str, Any], template_pyramids,
+                 pool: ThreadPoolExecutor, gate: AcquisitionGate, focus_lock: threading.Lock,
+                 profile_store=None, refind: Optional[Callable[['InstanceLane'], Optional[int]]] = None):
+        self.hwnd = hwnd
+        self.refind = refind
+        self.logger = get_logger('lane', hwnd=hwnd)
+
+        self.window_manager = WindowManager()
+        self.window_manager.fivem_window = hwnd
+        self.key_detector = KeyDetector(templates, executor=pool, template_pyramids=template_pyramids)
+        self.execution_worker = ExecutionWorker(FocusLockedExecutor(KeyExecutor(), focus_lock))
+        self.core = BotCore(
+            self.execution_worker,
+            self.window_manager.get_window_handle,
+            key_detector=self.key_detector,
+            logger=get_logger('core', hwnd=hwnd),
+            acquisition_gate=gate,
+            profile_store=profile_store,
+            profile_key_provider=self.window_manager.get_profile_key,
+        )
+
+        self.is_running = False
+        self.retired = False
+        self.thread = None
+        self.frames = 0
+        self.started_at = None
+        self.capture_failures = 0
+        self.lost_since = None
+
+    def start(self) -> None:
+        self.is_running = True
+        self.retired = False
+        self.frames = 0
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name=f"lane-{self.hwnd}", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.is_running = False
+
+    def close(self) -> None:
+        self.stop()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2.0)
+        self.execution_worker.shutdown()
+        self.window_manager.release_capture_session()
+
+    def _run(self) -> None:
+        self.core.reset()
+        while self.is_running:
+            try:
+                screen = self.window_manager.capture_fivem_screen()
+                if screen is None:
+                    delay = self._capture_failed()
+                    if delay is None:
+                        break
+                    time.sleep(delay)
+                    continue
+                self.capture_failures = 0
+                self.frames += 1
+                time.sleep(self.core.step(screen))
+            except Exception as e:
+                self.logger.exception('lane_error', "[%s] 🚨 Lane error: %s", self.hwnd, e)
+                time.sleep(1)
+
+    def _capture_failed(self) -> Optional[float]:
+        """Back off, re-find a lost window or retire; returns the delay or None to stop"""
+        self.capture_failures += 1
+        delay = min(FAILED_CAPTURE_DELAY * 2 ** (self.capture_failures - 1), MAX_CAPTURE_BACKOFF)
+        if self.window_manager.is_window_alive():
+            self.lost_since = None
+            return delay
+
+        now = time.monotonic()
+        if self.lost_since is None:
+            self.lost_since = now
+            self.logger.warning('lane_window_lost', "[%s] ❌ Window lost", self.hwnd)
+        lost_hwnd = self.hwnd
+        hwnd = self.refind(self) if self.refind is not None else None
+        if hwnd:
+            self.logger.info('lane_window_reacquired', "[%s] 🪟 Continuing on window %s",
+                             lost_hwnd, hwnd, new_hwnd=hwnd)
+            self.window_manager.release_capture_session()
+            self.window_manager.fivem_window = self.hwnd = hwnd
+            self.core.reset()
+            self.capture_failures = 0
+            self.lost_since = None
+            return 0.0
+        if now - self.lost_since >= LOST_WINDOW_TIMEOUT:
+            self.logger.warning('lane_retired', "[%s] 💤 Window gone for %.0fs - lane retired",
+                                self.hwnd, now - self.lost_since)
+            self.is_running = False
+            self.retired = True
+            self.window_manager.release_capture_session()
+            return None
+        return delay
+
+    def stats(self) -> Dict[str, float]:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        verifier = self.core.verifier.summary(self.core.clock())
+        return {
+            'hwnd': self.hwnd,
+            'state': self.core.state.value,
+            'fps': self.frames / elapsed if elapsed > 0 else 0.0,
+            'catches': verifier['catches'],
+            'catches_per_hour': verifier['catches_per_hour'],
+        }
+
+
+class MultiInstanceRunner:
+    """
+    🎣 Runs one InstanceLane per FiveM window.
+
+    All lanes share the loaded templates and their pyramids, one template
+    matching pool sized to the machine's cores and one acquisition gate.
+    """
+
+    def __init__(self, templates: Dict[str, Any], max_workers: Optional[int] = None):
+        self.templates = templates
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 4,
+                                       thread_name_prefix="match")
+        # Build pyramids once for every lane
+        self.template_pyramids = KeyDetector(templates, executor=self.pool).template_pyramids
+        self.gate = AcquisitionGate(BotConfig.MULTI_INSTANCE_MAX_ACQUISITIONS,
+                                    BotConfig.MULTI_INSTANCE_ACQUISITION_SPACING)
+        self.focus_lock = threading.Lock()
+        self.profile_store = DetectionProfileStore() if BotConfig.DETECTION_PROFILES_ENABLED else None
+        self.lanes: List[InstanceLane] = []
+        self.lanes_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return any(lane.is_running for lane in self.lanes)
+
+    def start(self, hwnds: List[int]) -> None:
+        """Create and start a lane for each window handle"""
+        self.stop()
+        self.lanes = [
+            InstanceLane(hwnd, self.templates, self.template_pyramids, self.pool,
+                         self.gate, self.focus_lock, self.profile_store, refind=self._refind)
+            for hwnd in hwnds
+        ]
+        for lane in self.lanes:
+            lane.start()
+
+    def _refind(self, lane: InstanceLane) -> Optional[int]:
+        """A FiveM window no other running lane owns, or None"""
+        with self.lanes_lock:
+            claimed = {other.hwnd for other in self.lanes if other is not lane and other.is_running}
+            for hwnd in lane.window_manager.find_fivem_windows():
+                if hwnd not in claimed:
+                    # Claimed before the lock is released so two lanes never share a window
+                    lane.hwnd = hwnd
+                    return hwnd
+        return None
+
+    def stop(self, wait: bool = False) -> None:
+        """
+        Signal every lane, then join them; in the background unless `wait`
+        (a lane may be in the middle of a capture or key sequence, which
+        must not block the UI thread).
+        """
+        lanes, self.lanes = self.lanes, []
+        for lane in lanes:
+            lane.stop()
+        if not lanes:
+            return
+        if wait:
+            self._close_lanes(lanes)
+        else:
+            threading.Thread(target=self._close_lanes, args=(lanes,), name="lane-close", daemon=True).start()
+
+    @staticmethod
+    def _close_lanes(lanes: List[InstanceLane]) -> None:
+        for lane in lanes:
+            lane.close()
+
+    def shutdown(self) -> None:
+        self.stop(wait=True)
+        self.pool.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-lane and aggregate frames per second and catches per hour"""
+        lanes = [lane.stats() for lane in self.lanes]
+        return {
+            'lanes': lanes,
+            'fps': sum(lane['fps'] for lane in lanes),
+            'catches_per_hour': sum(lane['catches_per_hour'] for lane in lanes),
+        }
+
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# perf_stats.py - Throttled Performance Snapshots for the Stats Panel
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from launcher_metrics import metrics
+
+# Stages shown in the panel: (label, span name)
+PANEL_STAGES = (
+    ('capture', 'loop.capture'),
+    ('clahe', 'detect.sequence.clahe'),
+    ('match', 'detect.sequence.match'),
+    ('filter', 'detect.sequence.filter'),
+    ('send', 'execute.send'),
+)
+
+
+class PerfStatsCollector:
+    """
+    Builds a small stats snapshot from the bot at most once per `interval`.
+
+    Rates (fps, hit rates, CPU) are computed over the window since the
+    previous snapshot; latencies come from the metrics histograms.
+    """
+
+    def __init__(self, interval: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self.last_at = self.clock()
+        self.last_cpu = time.process_time()
+        self.last_counts = (0, 0, 0, 0, 0)
+
+    def maybe_collect(self, bot) -> Optional[Dict[str, Any]]:
+        """Return a snapshot if `interval` has elapsed, else None"""
+        now = self.clock()
+        elapsed = now - self.last_at
+        if elapsed < self.interval:
+            return None
+
+        cpu = time.process_time()
+        core = bot.core
+        counts = (bot.frames_captured, bot.screen_requests, bot.cache_hits,
+                  core.frames_observed, core.frames_gated)
+        captured, requests, hits, observed, gated = (
+            current - previous for current, previous in zip(counts, self.last_counts))
+        cpu_percent = 100.0 * (cpu - self.last_cpu) / elapsed if elapsed > 0 else 0.0
+        self.last_at, self.last_cpu, self.last_counts = now, cpu, counts
+
+        spans = metrics.snapshot()
+        stages = {}
+        for label, name in PANEL_STAGES:
+            span = spans.get(name)
+            if span:
+                stages[label] = (span['p50_ms'], span['p95_ms'])
+        commit = spans.get('execute.commit_latency')
+        schedule_mean = spans.get('execute.schedule_error.mean')
+        schedule_max = spans.get('execute.schedule_error.max')
+        verifier = core.verifier.summary(core.clock())
+
+        return {
+            'state': core.state.value,
+            'fps': captured / elapsed,
+            'cache_hit_rate': hits / requests if requests else 0.0,
+            'frame_gate_hit_rate': gated / observed if observed else 0.0,
+            'stages': stages,
+            'commit_ms': commit['p50_ms'] if commit else 0.0,
+            # Key timing error of the scheduler: typical mean and worst-case max per sequence
+            'schedule_error_ms': ((schedule_mean['p50_ms'], schedule_max['p95_ms'])
+                                  if schedule_mean and schedule_max else None),
+            'catches_per_hour': verifier['catches_per_hour'],
+            'cpu_percent': cpu_percent,
+            'cpu_count': os.cpu_count() or 1,
+        }
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """Render a snapshot as the fixed-width text shown in the panel"""
+    lines = [
+        f"{stats['state']:<10} {stats['fps']:5.1f} fps   CPU {stats['cpu_percent']:5.1f}%",
+        f"cache {100 * stats['cache_hit_rate']:3.0f}%   gate {100 * stats['frame_gate_hit_rate']:3.0f}%   "
+        f"commit {stats['commit_ms']:6.1f}ms",
+    ]
+    for label, (p50, p95) in stats['stages'].items():
+        lines.append(f"{label:<8} p50 {p50:7.2f}ms  p95 {p95:7.2f}ms")
+    if stats.get('schedule_error_ms'):
+        mean_ms, max_ms = stats['schedule_error_ms']
+        lines.append(f"key timing err {mean_ms:5.2f}ms  max {max_ms:5.2f}ms")
+    lines.append(f"catches/h {stats['catches_per_hour']:6.0f}")
+    return "\n".join(lines)
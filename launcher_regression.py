@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+# regression.py - Performance Regression Baselines
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 📉 FiveM Fishing Bot - Baseline Store and Comparison Report
+# Description: Runs the detector, executor and simulator benchmarks, stores the results
+#              as a JSON baseline per machine profile and flags significant regressions
+# Usage: python launcher_regression.py record      (save a baseline on this machine)
+#        python launcher_regression.py compare     (exit 1 on regressions)
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from launcher_config import data_path
+
+BASELINE_DIR = 'baselines'
+ALPHA = 0.01                # One-sided Mann-Whitney significance level
+MIN_EFFECT = 0.05           # Ignore median shifts smaller than this (relative)
+SCALAR_TOLERANCE = 0.10     # Allowed relative change for single-value metrics
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_NO_BASELINE = 2
+
+
+# ─── Machine profiles and the baseline store ───────────────────────────────────────────
+
+def machine_profile(info: Dict[str, Any]) -> str:
+    """Stable name for a hardware/software class, e.g. 'windows-amd64-8c-1a2b3c4d'"""
+    import platform
+    identity = json.dumps([info.get(k) for k in ('system', 'processor', 'cpu_count', 'python', 'opencv')])
+    digest = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:8]
+    name = f"{platform.system()}-{platform.machine()}-{info.get('cpu_count')}c-{digest}"
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name).lower()
+
+
+class BaselineStore:
+    """One JSON file per machine profile under `directory`"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or data_path(BASELINE_DIR)
+
+    def path(self, profile: str) -> str:
+        return os.path.join(self.directory, f"{profile}.json")
+
+    def load(self, profile: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(profile), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, profile: str, report: Dict[str, Any]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(profile)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+# ─── Statistics ────────────────────────────────────────────────────────────────────────
+
+def mann_whitney_greater(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """
+    One-sided p-value that `current` tends to be larger than `baseline`.
+
+    Normal approximation of the Mann-Whitney U test with tie correction;
+    fine for the sample sizes the benchmarks produce (20+ per side).
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+
+    pooled = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2.0 + 1.0        # Average rank for the tie group
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        # Every value identical in both runs
+        return 1.0
+    z = (u - n1 * n2 / 2.0 - 0.5) / math.sqrt(variance)   # Continuity correction
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def _sample_metric(samples: Sequence[float], better: str, unit: str, scale: float = 1.0) -> Dict[str, Any]:
+    return {'better': better, 'unit': unit, 'samples': [scale * s for s in samples]}
+
+
+def _scalar_metric(value: float, better: str, unit: str, tolerance: float = 0.0) -> Dict[str, Any]:
+    """`tolerance` is an absolute allowance on top of SCALAR_TOLERANCE (for rates near 0)"""
+    return {'better': better, 'unit': unit, 'value': value, 'tolerance': tolerance}
+
+
+def compare_metric(name: str, baseline: Dict[str, Any], current: Dict[str, Any],
+                   alpha: float = ALPHA, min_effect: float = MIN_EFFECT,
+                   scalar_tolerance: float = SCALAR_TOLERANCE) -> Dict[str, Any]:
+    """Compare one metric; status is 'ok', 'regression' or 'improved'"""
+    higher_is_better = current['better'] == 'higher'
+    row = {'metric': name, 'unit': current['unit'], 'better': current['better'], 'p_value': None}
+
+    if 'samples' in current:
+        old = statistics.median(baseline['samples'])
+        new = statistics.median(current['samples'])
+        if higher_is_better:
+            p_worse = mann_whitney_greater(baseline['samples'], current['samples'])
+            p_better = mann_whitney_greater(current['samples'], baseline['samples'])
+        else:
+            p_worse = mann_whitney_greater(current['samples'], baseline['samples'])
+            p_better = mann_whitney_greater(baseline['samples'], current['samples'])
+        change = (new - old) / old if old else 0.0
+        worse_effect = -change if higher_is_better else change
+        row.update(baseline=old, current=new, change=change, p_value=p_worse)
+        if p_worse < alpha and worse_effect > min_effect:
+            row['status'] = 'regression'
+        elif p_better < alpha and -worse_effect > min_effect:
+            row['status'] = 'improved'
+        else:
+            row['status'] = 'ok'
+        return row
+
+    old, new = baseline['value'], current['value']
+    allowance = scalar_tolerance * abs(old) + current.get('tolerance', 0.0)
+    delta = old - new if higher_is_better else new - old     # Positive = worse
+    row.update(baseline=old, current=new, change=(new - old) / old if old else 0.0)
+    if delta > allowance:
+        row['status'] = 'regression'
+    elif -delta > allowance:
+        row['status'] = 'improved'
+    else:
+        row['status'] = 'ok'
+    return row
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], **thresholds) -> List[Dict[str, Any]]:
+    rows = []
+    for name, metric in current['metrics'].items():
+        old = baseline['metrics'].get(name)
+        if old is None:
+            rows.append({'metric': name, 'unit': metric['unit'], 'status': 'new'})
+            continue
+        rows.append(compare_metric(name, old, metric, **thresholds))
+    for name in baseline['metrics']:
+        if name not in current['metrics']:
+            rows.append({'metric': name, 'unit': baseline['metrics'][name]['unit'], 'status': 'missing'})
+    return rows
+
+
+# ─── Benchmarks ────────────────────────────────────────────────────────────────────────
+
+def _allocation_peaks(fn: Callable[[], Any], repeats: int) -> List[float]:
+    """Peak traced bytes above the starting level for each call of `fn`"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(repeats):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def bench_detector(templates: Dict[str, Any], resolutions: Sequence[str], conditions: Sequence[str],
+                   frames: int, seed: int, alloc_frames: int) -> Dict[str, Dict[str, Any]]:
+    from launcher_bench_detector import build_detector, run_case
+    from launcher_synthetic_frames import CONDITIONS, RESOLUTIONS, FrameRenderer
+
+    results = {}
+    # Inline detection: thread-pool scheduling noise would swamp small regressions
+    detector, close = build_detector('inprocess', 'inline', templates)
+    try:
+        for resolution in resolutions:
+            width, height = RESOLUTIONS[resolution]
+            for condition_name in conditions:
+                condition = CONDITIONS[condition_name]
+                prefix = f"detector.{resolution}.{condition_name}"
+                run_case(detector, FrameRenderer(templates, seed=seed), width, height, condition, 3)  # Warm-up
+                stats = run_case(detector, FrameRenderer(templates, seed=seed), width, height, condition,
+                                 frames, keep_samples=True)
+                for stage in ('acquire', 'sequence'):
+                    results[f"{prefix}.{stage}_latency"] = _sample_metric(
+                        stats[stage]['samples'], 'lower', 'ms', 1000.0)
+                    results[f"{prefix}.{stage}_fps"] = _scalar_metric(stats[stage]['fps'], 'higher', 'fps')
+
+                sample = FrameRenderer(templates, seed=seed).render(width, height, condition)
+
+                def acquire():
+                    detector.key_sequence_area = None
+                    detector.auto_detect_minigame_area(sample.image)
+
+                results[f"{prefix}.acquire_alloc_peak"] = _sample_metric(
+                    _allocation_peaks(acquire, alloc_frames), 'lower', 'KiB', 1 / 1024.0)
+    finally:
+        close()
+    return results
+
+
+def bench_executor(calls: int, seed: int, alloc_calls: int) -> Dict[str, Dict[str, Any]]:
+    from launcher_config import BotConfig
+    from launcher_input_backend import RecordingBackend
+    from launcher_key_executor import KeyExecutor
+    from launcher_key_scheduler import KeyScheduler
+    from launcher_simulator import VirtualClock
+
+    rng = random.Random(seed)
+    sequences = [[rng.choice('WASD') for _ in range(5)] for _ in range(calls)]
+    results = {}
+    for mode, batched in (('scheduled', False), ('batched', True)):
+        # Virtual time: only the executor's own overhead is measured, not the key timings
+        clock = VirtualClock(charge_compute=False)
+        backend = RecordingBackend(batched=batched, hold_time=BotConfig.KEY_HOLD_TIME, sleep=clock.sleep)
+        executor = KeyExecutor(scheduler=KeyScheduler(clock=clock.now, sleep=clock.sleep, spin_threshold=0),
+                               backend=backend)
+        for sequence in sequences[:10]:
+            executor.execute_key_sequence(sequence, 1)
+
+        durations = []
+        for sequence in sequences:
+            backend.reset()
+            start = time.perf_counter()
+            executor.execute_key_sequence(sequence, 1)
+            durations.append(time.perf_counter() - start)
+
+        results[f"executor.{mode}.latency"] = _sample_metric(durations, 'lower', 'us', 1e6)
+        results[f"executor.{mode}.sequences_per_second"] = _scalar_metric(
+            len(durations) / sum(durations), 'higher', '1/s')
+
+        cycle = iter(sequences * (alloc_calls // len(sequences) + 1))
+
+        def execute():
+            backend.reset()
+            executor.execute_key_sequence(next(cycle), 1)
+
+        results[f"executor.{mode}.alloc_peak"] = _sample_metric(
+            _allocation_peaks(execute, alloc_calls), 'lower', 'B')
+    return results
+
+
+def bench_simulator(duration: float, seed: int) -> Dict[str, Dict[str, Any]]:
+    from launcher_simulator import run_simulation
+
+    report = run_simulation(duration=duration, seed=seed)
+    return {
+        'simulator.catch_latency': _sample_metric(report['catch_latencies'], 'lower', 'ms', 1000.0),
+        'simulator.catches_per_hour': _scalar_metric(report['catches_per_hour'], 'higher', '1/h'),
+        'simulator.miss_rate': _scalar_metric(report['miss_rate'], 'lower', 'ratio', tolerance=0.02),
+    }
+
+
+def run_benchmarks(frames: int = 40, executor_calls: int = 500, sim_duration: float = 600.0,
+                   seed: int = 1234, resolutions: Sequence[str] = ('1080p',),
+                   conditions: Sequence[str] = ('clean', 'noisy'),
+                   progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    from launcher_bench_common import machine_info
+    from launcher_template_manager import TemplateManager
+
+    manager = TemplateManager()
+    manager.auto_load_templates()
+    templates = manager.get_templates()
+    if not templates:
+        raise RuntimeError("Templates (assets/W.png, A.png, S.png, D.png) not found")
+
+    report_progress = progress or (lambda message: None)
+    metrics: Dict[str, Dict[str, Any]] = {}
+    report_progress("Running detector benchmark...")
+    metrics.update(bench_detector(templates, resolutions, conditions, frames, seed, alloc_frames=10))
+    report_progress("Running executor benchmark...")
+    metrics.update(bench_executor(executor_calls, seed, alloc_calls=50))
+    report_progress("Running simulator benchmark...")
+    metrics.update(bench_simulator(sim_duration, seed))
+
+    info = machine_info()
+    return {
+        'benchmark': 'regression',
+        'generated_at': time.time(),
+        'profile': machine_profile(info),
+        'machine': info,
+        'parameters': {'frames': frames, 'executor_calls': executor_calls, 'sim_duration': sim_duration,
+                       'seed': seed, 'resolutions': list(resolutions), 'conditions': list(conditions)},
+        'metrics': metrics,
+    }
+
+
+# ─── Report ────────────────────────────────────────────────────────────────────────────
+
+def format_rows(rows: List[Dict[str, Any]]) -> str:
+    markers = {'regression': '❌', 'improved': '✅', 'ok': '  ', 'new': '🆕', 'missing': '⚠️'}
+    lines = []
+    for row in rows:
+        status = row['status']
+        if 'current' not in row:
+            lines.append(f"{markers[status]} {row['metric']:<48} {status}")
+            continue
+        p_value = f"p={row['p_value']:.4f}" if row.get('p_value') is not None else 'scalar'
+        lines.append(f"{markers[status]} {row['metric']:<48} {row['baseline']:>11.3f} -> {row['current']:>11.3f} "
+                     f"{row['unit']:<5} {100 * row['change']:+6.1f}%  {p_value:<9} {status}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record or check performance baselines")
+    parser.add_argument('command', choices=('record', 'compare'))
+    parser.add_argument('--profile', help="baseline name (default: derived from this machine)")
+    parser.add_argument('--baseline-dir', help="directory holding <profile>.json baselines")
+    parser.add_argument('--frames', type=int, default=40, help="detector frames per case")
+    parser.add_argument('--executor-calls', type=int, default=500)
+    parser.add_argument('--sim-duration', type=float, default=600.0, help="simulated seconds")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--alpha', type=float, default=ALPHA)
+    parser.add_argument('--min-effect', type=float, default=MIN_EFFECT)
+    parser.add_argument('--scalar-tolerance', type=float, default=SCALAR_TOLERANCE)
+    parser.add_argument('--out', help="also write the current run (and comparison) as JSON")
+    args = parser.parse_args(argv)
+
+    store = BaselineStore(args.baseline_dir)
+    report = run_benchmarks(args.frames, args.executor_calls, args.sim_duration, args.seed, progress=print)
+    profile = args.profile or report['profile']
+
+    if args.command == 'record':
+        path = store.save(profile, report)
+        print(f"Baseline '{profile}' written to {path}")
+        return EXIT_OK
+
+    baseline = store.load(profile)
+    if baseline is None:
+        print(f"No baseline '{profile}' in {store.directory}; run 'record' first", file=sys.stderr)
+        return EXIT_NO_BASELINE
+
+    rows = compare_reports(baseline, report, alpha=args.alpha, min_effect=args.min_effect,
+                           scalar_tolerance=args.scalar_tolerance)
+    print(format_rows(rows))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(dict(report, comparison=rows, baseline_profile=profile), f, indent=2)
+
+    regressions = [row for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) against baseline '{profile}'")
+        return EXIT_REGRESSION
+    print(f"✅ No regressions against baseline '{profile}'")
+    return EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+# simulator.py - Minigame Simulator with a Virtual Clock
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 🎮 FiveM Fishing Bot - End-to-End Throughput Simulator
+# Description: Runs the real FiveMFishingBot loop against a fake window that shows timed
+#              prompts and a fake input sink that scores the keys, on a virtual clock
+# Usage: python launcher_simulator.py --duration 600 [--main-loop-delay 0.15 ...]
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from launcher_config import BotConfig
+from launcher_input_backend import InputBackend
+from launcher_key_executor import KeyExecutor
+from launcher_key_scheduler import KeyScheduler
+from launcher_synthetic_frames import CONDITIONS, RESOLUTIONS, FrameRenderer
+from launcher_bench_common import latency_summary
+
+
+class VirtualClock:
+    """
+    Simulated time that only moves when someone sleeps.
+
+    With `charge_compute` the real time spent between two sleeps (capture,
+    detection, key planning) is also added, so the simulated loop is as
+    slow as the real one minus the idle waits.
+    """
+
+    def __init__(self, start: float = 0.0, charge_compute: bool = True):
+        self.current = start
+        self.charge_compute = charge_compute
+        self.real_mark = time.perf_counter()
+        self.on_advance = None
+
+    def now(self) -> float:
+        return self.current
+
+    def sleep(self, seconds: float) -> None:
+        real_now = time.perf_counter()
+        if self.charge_compute:
+            self.current += real_now - self.real_mark
+        self.current += max(0.0, seconds)
+        self.real_mark = real_now
+        if self.on_advance is not None:
+            self.on_advance(self.current)
+
+
+@dataclass
+class MinigameRound:
+    """One prompt shown by the simulated game"""
+    shown_at: float
+    deadline: float
+    sequence: List[str]
+    image: Any
+    progress: int = 0
+    result: Optional[str] = None        # 'catch', 'wrong_key' or 'timeout'
+    finished_at: Optional[float] = None
+    key_down_at: Dict[str, float] = field(default_factory=dict)
+
+
+class SimulatedMinigame:
+    """
+    The fishing minigame: after an idle gap a prompt of keys appears, stays
+    until it is typed correctly, a wrong key is pressed or it times out,
+    then the next cast starts.
+    """
+
+    def __init__(self, renderer: FrameRenderer, width: int, height: int, condition,
+                 seed: int = 0, idle_range=(2.0, 5.0), prompt_timeout: float = 4.0,
+                 min_hold: float = 0.005):
+        self.renderer = renderer
+        self.width = width
+        self.height = height
+        self.condition = condition
+        self.random = random.Random(seed)
+        self.idle_range = idle_range
+        self.prompt_timeout = prompt_timeout
+        self.min_hold = min_hold
+
+        self.background = renderer.render_background(width, height, condition)
+        # Finished rounds are folded into counters so long runs stay flat in memory
+        self.results = {'catch': 0, 'wrong_key': 0, 'timeout': 0}
+        self.catch_latencies: List[float] = []
+        self.active: Optional[MinigameRound] = None
+        self.next_prompt_at = self.random.uniform(*idle_range)
+        self.stray_keys = 0
+        self.short_holds = 0
+        self.frames_served = 0
+
+    def update(self, now: float) -> None:
+        if self.active is not None and now >= self.active.deadline:
+            self._finish(self.active.deadline, 'timeout')
+        if self.active is None and now >= self.next_prompt_at:
+            sample = self.renderer.render(self.width, self.height, self.condition)
+            self.active = MinigameRound(now, now + self.prompt_timeout, sample.sequence, sample.image)
+
+    def _finish(self, now: float, result: str) -> None:
+        self.active.result = result
+        self.active.finished_at = now
+        self.results[result] += 1
+        if result == 'catch':
+            self.catch_latencies.append(now - self.active.shown_at)
+        self.active = None
+        self.next_prompt_at = now + self.random.uniform(*self.idle_range)
+
+    def frame(self, now: float):
+        """Screen contents at `now` (a fresh array, like a real capture)"""
+        self.update(now)
+        self.frames_served += 1
+        image = self.active.image if self.active is not None else self.background
+        return image.copy()
+
+    def key_event(self, now: float, key: str, is_down: bool) -> None:
+        self.update(now)
+        current = self.active
+        if current is None:
+            if is_down:
+                self.stray_keys += 1
+            return
+
+        key = key.upper()
+        if is_down:
+            current.key_down_at[key] = now
+            return
+
+        down_at = current.key_down_at.pop(key, None)
+        if down_at is not None and now - down_at < self.min_hold:
+            self.short_holds += 1
+        if key != current.sequence[current.progress]:
+            self._finish(now, 'wrong_key')
+            return
+        current.progress += 1
+        if current.progress == len(current.sequence):
+            self._finish(now, 'catch')
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        rounds = sum(self.results.values())
+        catches = self.results['catch']
+        return {
+            'rounds': rounds,
+            'catches': catches,
+            'catches_per_hour': catches * 3600.0 / duration if duration > 0 else 0.0,
+            'miss_rate': (rounds - catches) / rounds if rounds else 0.0,
+            'misses': {reason: self.results[reason] for reason in ('wrong_key', 'timeout')},
+            'catch_latency': latency_summary(self.catch_latencies),
+            'catch_latencies': list(self.catch_latencies),
+            'stray_keys': self.stray_keys,
+            'short_holds': self.short_holds,
+            'frames_served': self.frames_served,
+        }
+
+
+class SimulatedWindowManager:
+    """WindowManager stand-in that captures from the simulated game"""
+
+    HWND = 1
+
+    def __init__(self, game: SimulatedMinigame, clock: VirtualClock):
+        self.game = game
+        self.clock = clock
+        self.fivem_window = self.HWND
+
+    def find_fivem_window(self):
+        return True
+
+    def get_window_handle(self):
+        return self.fivem_window
+
+    def get_profile_key(self):
+        return None
+
+    def capture_fivem_screen(self):
+        return self.game.frame(self.clock.now())
+
+    def release_capture_session(self):
+        pass
+
+
+class SimulatedInputBackend(InputBackend):
+    """Input backend that types into the simulated game"""
+
+    requires_focus = False
+
+    def __init__(self, game: SimulatedMinigame, clock: VirtualClock):
+        super().__init__()
+        self.game = game
+        self.clock = clock
+
+    def key_down(self, hwnd, key) -> bool:
+        self.game.key_event(self.clock.now(), key, True)
+        return True
+
+    def key_up(self, hwnd, key) -> bool:
+        self.game.key_event(self.clock.now(), key, False)
+        return True
+
+
+class InlineExecutionWorker:
+    """ExecutionWorker stand-in that sends keys synchronously on submit"""
+
+    busy = False
+
+    def __init__(self, key_executor):
+        self.key_executor = key_executor
+
+    def submit(self, sequence, hwnd) -> Future:
+        future = Future()
+        try:
+            future.set_result(self.key_executor.execute_key_sequence(sequence, hwnd))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait: bool = False) -> None:
+        pass
+
+
+class _NullInterface:
+    """Front end that ignores everything (no Tk, hotkeys or signals)"""
+
+    def __init__(self, toggle_callback):
+        self.toggle_callback = toggle_callback
+
+    def update_status(self, is_running): pass
+    def publish_stats(self, stats): pass
+    def log_message(self, message): pass
+    def show_warning(self, title, message): pass
+    def show_info(self, title, message): pass
+    def show_error(self, title, message): pass
+    def run(self): pass
+    def close(self): pass
+
+
+class Simulation:
+    """
+    A FiveMFishingBot wired to a simulated minigame on a virtual clock.
+
+    run() may be called repeatedly (e.g. a warm-up phase, then a measured
+    one); close() releases the detector and the log writer.
+
+    Timing overrides apply to this process only (SEQUENCE_STABLE_TIME is
+    read from BotConfig by BotCore) and are undone by close(). The flight recorder is off unless
+    requested, so simulated failures never dump to the user data folder.
+    """
+
+    def __init__(self, resolution: str = '1080p', condition: str = 'clean', seed: int = 1234,
+                 main_loop_delay: Optional[float] = None, stable_time: Optional[float] = None,
+                 post_execution_delay: Optional[float] = None, hold_time: Optional[float] = None,
+                 key_gap: Optional[float] = None, idle_range=(2.0, 5.0), prompt_timeout: float = 4.0,
+                 charge_compute: bool = True, flight_recorder: bool = False):
+        from launcher_main import FiveMFishingBot
+        from launcher_template_manager import TemplateManager
+
+        manager = TemplateManager()
+        manager.auto_load_templates()
+        templates = manager.get_templates()
+        if not templates:
+            raise RuntimeError("Templates (assets/W.png, A.png, S.png, D.png) not found")
+
+        self.resolution = resolution
+        self.condition = condition
+        self.seed = seed
+        self.prompt_timeout = prompt_timeout
+        self.clock = VirtualClock(charge_compute=charge_compute)
+        width, height = RESOLUTIONS[resolution]
+        renderer = FrameRenderer(templates, seed=seed, position_jitter=False)
+        self.game = SimulatedMinigame(renderer, width, height, CONDITIONS[condition], seed=seed,
+                                      idle_range=idle_range, prompt_timeout=prompt_timeout)
+
+        self.scheduler = KeyScheduler(hold_time=hold_time, gap=key_gap, clock=self.clock.now,
+                                      sleep=self.clock.sleep, spin_threshold=0)
+        key_executor = KeyExecutor(scheduler=self.scheduler, backend=SimulatedInputBackend(self.game, self.clock))
+        self.bot = FiveMFishingBot(
+            detected_hwnd=SimulatedWindowManager.HWND,
+            gui_factory=_NullInterface,
+            window_manager=SimulatedWindowManager(self.game, self.clock),
+            key_executor=key_executor,
+            execution_worker=InlineExecutionWorker(key_executor),
+            clock=self.clock.now,
+            sleep=self.clock.sleep,
+            flight_recorder=flight_recorder,
+        )
+        if main_loop_delay is not None:
+            self.bot.core.MAIN_LOOP_DELAY = main_loop_delay
+        if post_execution_delay is not None:
+            self.bot.core.verifier.baseline_delay = post_execution_delay
+        # BotConfig values replaced for this simulation, restored by close()
+        self.config_saved: Dict[str, Any] = {}
+        if stable_time is not None:
+            self.config_saved['SEQUENCE_STABLE_TIME'] = BotConfig.SEQUENCE_STABLE_TIME
+            BotConfig.SEQUENCE_STABLE_TIME = stable_time
+        self.wall_seconds = 0.0
+
+    def run(self, should_stop: Callable[['Simulation'], bool]) -> None:
+        """Run the bot loop until `should_stop(self)` is true after a wait"""
+        bot = self.bot
+
+        def check(now: float) -> None:
+            if should_stop(self):
+                bot.is_running = False
+
+        self.clock.on_advance = check
+        wall_start = time.perf_counter()
+        bot.is_running = True
+        try:
+            bot.bot_loop()
+        finally:
+            bot.is_running = False
+            self.clock.on_advance = None
+            self.wall_seconds += time.perf_counter() - wall_start
+
+    def close(self) -> None:
+        close = getattr(self.bot.key_detector, 'close', None)
+        if close is not None:
+            close()
+        self.bot.log_system.stop()
+        for name, value in self.config_saved.items():
+            setattr(BotConfig, name, value)
+        self.config_saved.clear()
+
+    def report(self) -> Dict[str, Any]:
+        simulated = self.clock.now()
+        wall = self.wall_seconds
+        core = self.bot.core
+        report = self.game.summary(simulated)
+        report.update({
+            'simulated_seconds': simulated,
+            'wall_seconds': wall,
+            'speedup': simulated / wall if wall > 0 else 0.0,
+            'parameters': {
+                'resolution': self.resolution,
+                'condition': self.condition,
+                'seed': self.seed,
+                'main_loop_delay': core.MAIN_LOOP_DELAY,
+                'sequence_stable_time': BotConfig.SEQUENCE_STABLE_TIME,
+                'post_execution_delay': core.verifier.baseline_delay,
+                'hold_time': self.scheduler.hold_time,
+                'key_gap': self.scheduler.gap,
+                'prompt_timeout': self.prompt_timeout,
+            },
+            'dwell': core.machine.dwell_stats(),
+        })
+        return report
+
+
+def run_simulation(duration: float = 600.0, **options) -> Dict[str, Any]:
+    """Run one bot session of `duration` simulated seconds (options as for Simulation)"""
+    simulation = Simulation(**options)
+    try:
+        simulation.run(lambda sim: sim.clock.now() >= duration)
+    finally:
+        simulation.close()
+    return simulation.report()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the bot against a simulated minigame")
+    parser.add_argument('--duration', type=float, default=600.0, help="simulated seconds")
+    parser.add_argument('--resolution', default='1080p', choices=list(RESOLUTIONS))
+    parser.add_argument('--condition', default='clean', choices=list(CONDITIONS))
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--main-loop-delay', type=float)
+    parser.add_argument('--stable-time', type=float, help="SEQUENCE_STABLE_TIME")
+    parser.add_argument('--post-execution-delay', type=float)
+    parser.add_argument('--hold-time', type=float)
+    parser.add_argument('--key-gap', type=float)
+    parser.add_argument('--prompt-timeout', type=float, default=4.0)
+    parser.add_argument('--no-compute-charge', action='store_true',
+                        help="do not add real processing time to the virtual clock")
+    parser.add_argument('--out', help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_simulation(
+        duration=args.duration, resolution=args.resolution, condition=args.condition, seed=args.seed,
+        main_loop_delay=args.main_loop_delay, stable_time=args.stable_time,
+        post_execution_delay=args.post_execution_delay, hold_time=args.hold_time, key_gap=args.key_gap,
+        prompt_timeout=args.prompt_timeout, charge_compute=not args.no_compute_charge,
+    )
+    latency = report['catch_latency']
+    print(f"{report['simulated_seconds']:.0f}s simulated in {report['wall_seconds']:.1f}s "
+          f"({report['speedup']:.1f}x)")
+    print(f"catches/h {report['catches_per_hour']:.0f}  miss rate {100 * report['miss_rate']:.1f}% "
+          f"{report['misses']}")
+    print(f"catch latency p50 {latency['p50_ms']:.0f}ms  p99 {latency['p99_ms']:.0f}ms")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
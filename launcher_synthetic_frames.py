@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# synthetic_frames.py - Synthetic Minigame Frames from the Template Glyphs
+# Usage: python launcher_synthetic_frames.py datasets/synthetic-1080p [--condition dark --prompts 50]
+import argparse
+import random
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Common client resolutions (width, height)
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '1440p': (2560, 1440),
+    '4k': (3840, 2160),
+}
+
+
+@dataclass(frozen=True)
+class Condition:
+    """Rendering condition applied to a synthetic frame"""
+    name: str
+    brightness: int = 0        # Added to every pixel (cv2.convertScaleAbs beta)
+    contrast: float = 1.0      # Multiplies every pixel (alpha)
+    noise: float = 0.0         # Gaussian noise sigma
+    blur: int = 0              # Gaussian blur kernel size (odd, 0 = off)
+    ui_scale: float = 1.0      # Glyph scale relative to the templates
+
+
+CONDITIONS = {
+    condition.name: condition for condition in (
+        Condition('clean'),
+        Condition('dark', brightness=-60),
+        Condition('bright', brightness=60),
+        Condition('low_contrast', contrast=0.5, brightness=50),
+        Condition('noisy', noise=12.0),
+        Condition('blurred', blur=5),
+        Condition('small_ui', ui_scale=0.8),
+        Condition('large_ui', ui_scale=1.2),
+    )
+}
+
+
+@dataclass
+class SyntheticFrame:
+    """A rendered BGR frame with its ground truth"""
+    image: np.ndarray
+    sequence: List[str]
+    area: Tuple[int, int, int, int]      # Tight box around the glyph row (x, y, w, h)
+    slots: List[Tuple[int, int, int, int]]
+
+
+class FrameRenderer:
+    """
+    Renders minigame prompts: a row of template glyphs on a dark panel over
+    a textured background, then applies a Condition.
+
+    Deterministic for a given seed, so benchmark and evaluation runs are
+    comparable across machines.
+    """
+
+    def __init__(self, templates: Dict[str, np.ndarray], seed: int = 0, sequence_length: int = 5,
+                 position_jitter: bool = True):
+        self.templates = templates
+        self.keys = sorted(templates)
+        self.sequence_length = sequence_length
+        # Off: the prompt row always sits at the same place, as in the game
+        self.position_jitter = position_jitter
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)
+        self.scaled_cache = {}
+
+    def _glyph(self, key: str, scale: float) -> np.ndarray:
+        cache_key = (key, scale)
+        glyph = self.scaled_cache.get(cache_key)
+        if glyph is None:
+            template = self.templates[key]
+            if scale != 1.0:
+                h, w = template.shape
+                template = cv2.resize(template, (max(1, int(w * scale)), max(1, int(h * scale))),
+                                      interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC)
+            glyph = self.scaled_cache[cache_key] = cv2.cvtColor(template, cv2.COLOR_GRAY2BGR)
+        return glyph
+
+    def _background(self, width: int, height: int) -> np.ndarray:
+        # Vertical gradient plus low-frequency texture, tinted slightly blue
+        gradient = np.linspace(35, 95, height, dtype=np.float32)[:, None]
+        texture = self.rng.normal(0, 10, (height // 16 + 1, width // 16 + 1)).astype(np.float32)
+        texture = cv2.resize(texture, (width, height), interpolation=cv2.INTER_LINEAR)
+        gray = np.clip(gradient + texture, 0, 255)
+        return cv2.merge([gray * 1.1, gray, gray * 0.9]).clip(0, 255).astype(np.uint8)
+
+    def render_background(self, width: int, height: int, condition: Condition) -> np.ndarray:
+        """A frame with no prompt on screen"""
+        return self._apply_condition(self._background(width, height), condition)
+
+    def render(self, width: int, height: int, condition: Condition,
+               sequence: Optional[List[str]] = None) -> SyntheticFrame:
+        if sequence is None:
+            sequence = [self.random.choice(self.keys) for _ in range(self.sequence_length)]
+        frame = self._background(width, height)
+
+        glyphs = [self._glyph(key, condition.ui_scale) for key in sequence]
+        gap = max(8, int(glyphs[0].shape[1] * 0.4))
+        row_w = sum(g.shape[1] for g in glyphs) + gap * (len(glyphs) - 1)
+        row_h = max(g.shape[0] for g in glyphs)
+        x0 = (width - row_w) // 2
+        y0 = int(height * 0.72)
+        if self.position_jitter:
+            x0 += self.random.randint(-width // 20, width // 20)
+            y0 += self.random.randint(-height // 20, height // 20)
+
+        pad = gap
+        frame[max(0, y0 - pad):y0 + row_h + pad, max(0, x0 - pad):x0 + row_w + pad] = (28, 26, 24)
+
+        slots = []
+        x = x0
+        for glyph in glyphs:
+            h, w = glyph.shape[:2]
+            y = y0 + (row_h - h) // 2
+            frame[y:y + h, x:x + w] = glyph
+            slots.append((x, y, w, h))
+            x += w + gap
+
+        frame = self._apply_condition(frame, condition)
+        return SyntheticFrame(frame, list(sequence), (x0, y0, row_w, row_h), slots)
+
+    def _apply_condition(self, frame: np.ndarray, condition: Condition) -> np.ndarray:
+        if condition.contrast != 1.0 or condition.brightness:
+            frame = cv2.convertScaleAbs(frame, alpha=condition.contrast, beta=condition.brightness)
+        if condition.blur:
+            frame = cv2.GaussianBlur(frame, (condition.blur, condition.blur), 0)
+        if condition.noise:
+            noise = self.rng.normal(0, condition.noise, frame.shape).astype(np.int16)
+            frame = np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        return frame
+
+
+def area_covers(found: Optional[Tuple[int, int, int, int]], truth: Tuple[int, int, int, int],
+                tolerance: int = 4) -> bool:
+    """True if the detected area contains the ground-truth glyph row"""
+    if not found:
+        return False
+    fx, fy, fw, fh = found
+    tx, ty, tw, th = truth
+    return (fx <= tx + tolerance and fy <= ty + tolerance and
+            fx + fw >= tx + tw - tolerance and fy + fh >= ty + th - tolerance)
+
+
+def write_labeled_dataset(directory: str, templates: Dict[str, np.ndarray], resolution: str = '1080p',
+                          condition: str = 'clean', prompts: int = 20, seed: int = 0,
+                          prompt_frames: int = 12, idle_frames: int = 8, interval: float = 0.15,
+                          margin: int = 20) -> int:
+    """
+    Record a frame dataset with ground-truth labels from the renderer:
+    runs of `idle_frames` without a prompt (labeled NO_PROMPT) alternate
+    with `prompt_frames` showing one prompt (labeled with its sequence),
+    `interval` seconds apart. The ROI is fixed around the prompt row plus
+    `margin`, as in a bot recording. Returns the number of frames written.
+    """
+    from launcher_frame_dataset import NO_PROMPT, FrameRecorder
+
+    width, height = RESOLUTIONS[resolution]
+    renderer = FrameRenderer(templates, seed=seed, position_jitter=False)
+    x, y, w, h = renderer.render(width, height, CONDITIONS[condition]).area
+    roi = (max(0, x - margin), max(0, y - margin))
+    roi += (min(width, x + w + margin) - roi[0], min(height, y + h + margin) - roi[1])
+
+    recorder = FrameRecorder(directory, metadata={'source': 'synthetic', 'resolution': resolution,
+                                                  'condition': condition, 'seed': seed})
+    timestamp = 0.0
+    frames = 0
+    try:
+        for _ in range(prompts):
+            for _ in range(idle_frames):
+                recorder.record(renderer.render_background(width, height, CONDITIONS[condition]),
+                                timestamp, roi, NO_PROMPT, block=True)
+                timestamp += interval
+                frames += 1
+            sample = renderer.render(width, height, CONDITIONS[condition])
+            for _ in range(prompt_frames):
+                recorder.record(sample.image, timestamp, roi, ''.join(sample.sequence), block=True)
+                timestamp += interval
+                frames += 1
+    finally:
+        recorder.close()
+    return frames
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic frame dataset with ground-truth labels")
+    parser.add_argument('directory', help="dataset directory to create")
+    parser.add_argument('--resolution', default='1080p', choices=list(RESOLUTIONS))
+    parser.add_argument('--condition', default='clean', choices=list(CONDITIONS))
+    parser.add_argument('--prompts', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from launcher_template_manager import TemplateManager
+    manager = TemplateManager()
+    if not manager.auto_load_templates():
+        print("Templates (assets/W.png, A.png, S.png, D.png) not found", file=sys.stderr)
+        return 2
+    frames = write_labeled_dataset(args.directory, manager.get_templates(), args.resolution,
+                                   args.condition, args.prompts, args.seed)
+    print(f"{frames} labeled frames written to {args.directory}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+# tune.py - Parallel Tuner for Detection Settings
+# ═══════════════════════════════════════════════════════════════════════════════════════
+# 🎛️ FiveM Fishing Bot - Detection Tuning
+# Description: Searches sensitivity, key spacing, commit timing, template scales and the
+#              adaptive threshold offsets over datasets with ground-truth labels on a process pool,
+#              scores each setting by commit accuracy, commit latency and CPU time, and
+#              writes the best one as a tuning profile (installed for startup with --install)
+# Usage: python launcher_tune.py recordings/ [--labels labels.jsonl] [--trials 32]
+# ═══════════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from launcher_config import BotConfig, data_path, validate_tuning_settings
+from launcher_evaluate import (CHUNK_FRAMES, IN_FLIGHT_PER_WORKER, apply_settings, create_pool, detector_for,
+                               find_datasets, load_labels, parse_label, run_bounded)
+
+PROFILE_FORMAT = 'fivem-detection-tuning'
+PROFILE_VERSION = 1
+
+# Settings that change what a frame reads: each combination is evaluated on the pool
+DETECTION_SPACE = {
+    'SENSITIVITY': (0.65, 0.7, 0.75, 0.8, 0.85, 0.9),
+    'MIN_DISTANCE': (12, 16, 20, 24, 30),
+    'TEMPLATE_SCALES': ((1.0,), (0.9, 1.0, 1.1), (0.8, 1.0, 1.2), (0.7, 0.85, 1.0, 1.15, 1.3)),
+    'LOW_CONTRAST_THRESHOLD_OFFSET': (-0.25, -0.2, -0.15, -0.1, -0.05),
+    'DARK_THRESHOLD_OFFSET': (-0.2, -0.15, -0.1, -0.05, 0.0),
+    'BRIGHT_THRESHOLD_OFFSET': (0.0, 0.05, 0.1, 0.15),
+}
+
+# Settings that only change when a read commits: replayed over the reads, full grid
+COMMIT_SPACE = {
+    'MIN_CONSECUTIVE_DETECTIONS': (1, 2, 3, 4, 5),
+    'SEQUENCE_STABLE_TIME': (0.1, 0.15, 0.2, 0.3, 0.4, 0.5),
+}
+
+LOOKAHEAD_FRAMES = 256      # Frames read past a range to finish a prompt that started in it
+WRONG_WEIGHT = 2.0          # A wrong or repeated commit costs as much as this many missed prompts
+LATENCY_WEIGHT = 0.1        # Score lost per second of mean commit latency
+CPU_WEIGHT = 0.002          # Score lost per ms of detection time per frame
+
+
+# ─── Search space ──────────────────────────────────────────────────────────────────────
+
+def sample_settings(trials: int, seed: int) -> List[Dict[str, Any]]:
+    """The current detection settings followed by distinct random draws"""
+    rng = random.Random(seed)
+    baseline = {name: getattr(BotConfig, name) for name in DETECTION_SPACE}
+    total = 1
+    for values in DETECTION_SPACE.values():
+        total *= len(values)
+
+    chosen = [baseline]
+    seen = {tuple(sorted(baseline.items()))}
+    while len(chosen) < min(trials, total):
+        settings = {name: rng.choice(values) for name, values in DETECTION_SPACE.items()}
+        key = tuple(sorted(settings.items()))
+        if key not in seen:
+            seen.add(key)
+            chosen.append(settings)
+    return chosen
+
+
+def commit_grid() -> List[Dict[str, Any]]:
+    """Every commit setting combination, including the current values"""
+    axes = {name: sorted(set(values) | {getattr(BotConfig, name)}) for name, values in COMMIT_SPACE.items()}
+    return [dict(zip(axes, combo)) for combo in itertools.product(*axes.values())]
+
+
+# ─── Commit replay ─────────────────────────────────────────────────────────────────────
+
+def replay_commits(frames: Sequence[Tuple[float, Tuple[str, ...], Optional[Tuple[str, ...]]]],
+                   min_consecutive: int, stable_time: float) -> Dict[str, Any]:
+    """
+    Run BotCore's ARMED/COMMITTING rule over (timestamp, read, label) frames.
+
+    Labels are ground truth: a prompt is a run of frames with the same
+    non-empty label, () means no prompt on screen and None means unlabeled.
+    Unlabeled frames are not scored; they end the current run and the
+    replay starts over after them, so only independently labeled intervals
+    count. After a commit the replay waits for an empty read (the prompt
+    clearing) before arming again, like the verifier. A commit with no
+    prompt on screen, or a second one for the same prompt, counts as `extra`.
+    """
+    result = {'prompts': 0, 'correct': 0, 'wrong': 0, 'extra': 0, 'latencies': []}
+    state = 'armed'
+    last: Tuple[str, ...] = ()
+    count = 0
+    since = 0.0
+    prompt = None               # [label, onset, committed]
+    previous_label: Tuple[str, ...] = ()
+
+    for timestamp, read, label in frames:
+        if label is None:
+            state, last, count = 'armed', (), 0
+            prompt, previous_label = None, None
+            continue
+        if label != previous_label:
+            previous_label = label
+            prompt = [label, timestamp, False] if label else None
+            result['prompts'] += bool(label)
+
+        if state == 'executed':
+            if not read:
+                state, last, count = 'armed', (), 0
+            continue
+
+        if state == 'armed':
+            if not read:
+                last, count = (), 0
+            elif read != last:
+                last, count = read, 0
+            else:
+                count += 1
+                if count >= min_consecutive and len(read) >= BotConfig.TARGET_SEQUENCE_LENGTH:
+                    state, since = 'committing', timestamp
+        elif read != last:
+            state, last, count = 'armed', read, 0
+        elif timestamp - since >= stable_time:
+            if prompt is None or prompt[2]:
+                result['extra'] += 1
+            else:
+                prompt[2] = True
+                if read == prompt[0]:
+                    result['correct'] += 1
+                    result['latencies'].append(timestamp - prompt[1])
+                else:
+                    result['wrong'] += 1
+            state = 'executed'
+    return result
+
+
+def _label_keys(label: str) -> Optional[Tuple[str, ...]]:
+    keys = parse_label(label)
+    return None if keys is None else tuple(keys)
+
+
+def tune_range(directory: str, start: int, stop: int, settings: Dict[str, Any], labels: List[str],
+               labels_from: int, grid: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Read frames [start, stop) of one dataset with `settings` and replay
+    every commit setting over the reads; runs in a worker.
+
+    Reads follow the bot: the area is acquired once per segment (the task
+    range, restarted whenever the recorded ROI moves), on the screen-sized
+    frame so the threshold offsets are fitted to the statistics the bot
+    sees; every later frame is only a locked-area detect_key_sequence.
+    `cpu_ms` counts the acquisition attempts plus the reads.
+
+    `labels` covers frames labels_from.. onwards. A prompt already running
+    at `start` belongs to the previous range and is skipped by the replay;
+    one still running at `stop` is followed into the lookahead frames.
+    """
+    from launcher_frame_dataset import FrameDataset
+    detector = detector_for(settings)
+    apply_settings(settings)
+    dataset = FrameDataset(directory)
+    end_limit = labels_from + len(labels)
+    keys = [_label_keys(label) for label in labels]
+
+    def label_at(i: int) -> Optional[Tuple[str, ...]]:
+        return keys[i - labels_from]
+
+    first = start
+    if start > labels_from:
+        running = label_at(start - 1)
+        while running and first < stop and label_at(first) == running:
+            first += 1
+    end = stop
+    tail = label_at(stop - 1) if first < stop else None
+    while tail and end < end_limit and label_at(end) == tail:
+        end += 1
+
+    stats = {'frames': 0, 'labeled': 0, 'exact': 0, 'acquisitions': 0, 'cpu_ms': 0.0}
+    frames = []
+    detector.key_sequence_area = None
+    segment = None
+    for i in range(start, end):
+        gray, record = dataset[i]
+        roi = (int(record['x']), int(record['y'])) + gray.shape
+        if roi != segment:
+            segment = roi
+            detector.key_sequence_area = None
+        image = dataset.full_frame(i)
+
+        t0 = time.perf_counter()
+        acquired = False
+        if not detector.key_sequence_area:
+            acquired = True
+            detector.auto_detect_minigame_area(image)
+        read = tuple(detector.detect_key_sequence(image)) if detector.key_sequence_area else ()
+        cpu_ms = 1000.0 * (time.perf_counter() - t0)
+
+        label = label_at(i)
+        if i < stop:
+            stats['frames'] += 1
+            stats['acquisitions'] += acquired
+            stats['cpu_ms'] += cpu_ms
+            if label is not None:
+                stats['labeled'] += 1
+                stats['exact'] += read == label
+        if i >= first:
+            frames.append((float(record['timestamp']), read, label))
+
+    commits = [replay_commits(frames, combo['MIN_CONSECUTIVE_DETECTIONS'], combo['SEQUENCE_STABLE_TIME'])
+               for combo in grid]
+    return {'stats': stats, 'commits': commits}
+
+
+# ─── Objective ─────────────────────────────────────────────────────────────────────────
+
+def score(stats: Dict[str, Any], commits: Dict[str, Any], wrong_weight: float = WRONG_WEIGHT,
+          latency_weight: float = LATENCY_WEIGHT, cpu_weight: float = CPU_WEIGHT) -> Dict[str, Any]:
+    """Metrics of one setting and its combined score (higher is better)"""
+    prompts = commits['prompts']
+    latencies = commits['latencies']
+    accuracy = ((commits['correct'] - wrong_weight * (commits['wrong'] + commits['extra'])) / prompts
+                if prompts else 0.0)
+    latency = sum(latencies) / len(latencies) if latencies else 0.0
+    cpu_ms = stats['cpu_ms'] / stats['frames'] if stats['frames'] else 0.0
+    ordered = sorted(latencies)
+    return {
+        'score': accuracy - latency_weight * latency - cpu_weight * cpu_ms,
+        'commit_accuracy': accuracy,
+        'prompts': prompts,
+        'correct': commits['correct'],
+        'wrong': commits['wrong'],
+        'extra': commits['extra'],
+        'missed': prompts - commits['correct'] - commits['wrong'],
+        'frame_accuracy': stats['exact'] / stats['labeled'] if stats['labeled'] else None,
+        'commit_latency_ms': 1000.0 * latency,
+        'commit_latency_p99_ms': 1000.0 * ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] if ordered else 0.0,
+        'cpu_ms_per_frame': cpu_ms,
+        'acquisitions': stats['acquisitions'],
+    }
+
+
+# ─── Search ────────────────────────────────────────────────────────────────────────────
+
+def dataset_labels(datasets: Sequence[str], overrides: Optional[Dict[Tuple[str, int], str]] = None) -> Dict[str, List[str]]:
+    """Per-dataset label strings from the recorded index, with overrides applied"""
+    from launcher_frame_dataset import FrameDataset
+    labels = {}
+    for directory in datasets:
+        dataset = FrameDataset(directory)
+        values = dataset.labels()
+        if overrides:
+            session = os.path.normpath(directory)
+            values = [overrides.get((session, i), value) for i, value in enumerate(values)]
+        labels[directory] = values
+    return labels
+
+
+def run_tuning(paths: Sequence[str], templates: Dict[str, Any], trials: int = 32, seed: int = 1234,
+               workers: Optional[int] = None, chunk_frames: int = CHUNK_FRAMES * 2,
+               label_overrides: Optional[Dict[Tuple[str, int], str]] = None,
+               weights: Optional[Dict[str, float]] = None,
+               progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    weights = weights or {'wrong_weight': WRONG_WEIGHT, 'latency_weight': LATENCY_WEIGHT, 'cpu_weight': CPU_WEIGHT}
+    datasets = find_datasets(paths)
+    labels = dataset_labels(datasets, label_overrides)
+    if not any(parse_label(label) for values in labels.values() for label in values):
+        raise ValueError("no frames labeled with a prompt (pass --labels or use a synthetic dataset)")
+
+    configs = sample_settings(trials, seed)
+    grid = commit_grid()
+    totals = [{'stats': {'frames': 0, 'labeled': 0, 'exact': 0, 'acquisitions': 0, 'cpu_ms': 0.0},
+               'commits': [{'prompts': 0, 'correct': 0, 'wrong': 0, 'extra': 0, 'latencies': []} for _ in grid]}
+              for _ in configs]
+
+    workers = workers or os.cpu_count()
+    start_time = time.perf_counter()
+    def calls():
+        # Config-major order keeps each worker on one cached detector for a while
+        for number, settings in enumerate(configs):
+            for directory in datasets:
+                values = labels[directory]
+                for start in range(0, len(values), chunk_frames):
+                    stop = min(len(values), start + chunk_frames)
+                    labels_from = max(0, start - 1)
+                    yield number, tune_range, (directory, start, stop, settings,
+                                               values[labels_from:min(len(values), stop + LOOKAHEAD_FRAMES)],
+                                               labels_from, grid)
+
+    task_count = len(configs) * sum((len(values) + chunk_frames - 1) // chunk_frames for values in labels.values())
+    with create_pool(templates, workers) as pool:
+        for done, (number, result) in enumerate(run_bounded(pool, calls(), IN_FLIGHT_PER_WORKER * workers), 1):
+            total = totals[number]
+            for name, value in result['stats'].items():
+                total['stats'][name] += value
+            for combined, part in zip(total['commits'], result['commits']):
+                for name in ('prompts', 'correct', 'wrong', 'extra'):
+                    combined[name] += part[name]
+                combined['latencies'].extend(part['latencies'])
+            if progress and (done % 50 == 0 or done == task_count):
+                progress(f"{done}/{task_count} tasks ({time.perf_counter() - start_time:.0f}s)")
+
+    results = []
+    for settings, total in zip(configs, totals):
+        for combo, commits in zip(grid, total['commits']):
+            results.append({'settings': dict(settings, **combo),
+                            'metrics': score(total['stats'], commits, **weights)})
+    current = {name: getattr(BotConfig, name) for name in list(DETECTION_SPACE) + list(COMMIT_SPACE)}
+    baseline = next(result for result in results if result['settings'] == current)
+    results.sort(key=lambda result: result['metrics']['score'], reverse=True)
+
+    from launcher_bench_common import machine_info
+    return {
+        'benchmark': 'tuning',
+        'generated_at': time.time(),
+        'machine': machine_info(),
+        'parameters': {'trials': len(configs), 'commit_settings': len(grid), 'seed': seed,
+                       'workers': workers, 'weights': weights, 'datasets': datasets,
+                       'frames': sum(len(values) for values in labels.values())},
+        'wall_seconds': time.perf_counter() - start_time,
+        'baseline': baseline,
+        'best': results[0],
+        'results': results,
+    }
+
+
+def write_profile(path: str, report: Dict[str, Any]) -> None:
+    """Write the best setting as a profile for launcher_config.load_tuning_profile"""
+    best = report['best']
+    settings = validate_tuning_settings(best['settings'])
+    profile = {
+        'format': PROFILE_FORMAT,
+        'version': PROFILE_VERSION,
+        'created_at': report['generated_at'],
+        'settings': {name: list(value) if isinstance(value, tuple) else value
+                     for name, value in settings.items()},
+        'metrics': best['metrics'],
+        'baseline_metrics': report['baseline']['metrics'],
+        'objective': report['parameters']['weights'],
+        'datasets': report['parameters']['datasets'],
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    m = result['metrics']
+    s = result['settings']
+    return (f"score {m['score']:+.3f}  acc {m['commit_accuracy']:+.3f}  "
+            f"lat {m['commit_latency_ms']:5.0f}ms  cpu {m['cpu_ms_per_frame']:5.1f}ms  | "
+            f"sens {s['SENSITIVITY']:.2f} dist {s['MIN_DISTANCE']} "
+            f"consec {s['MIN_CONSECUTIVE_DETECTIONS']} stable {s['SEQUENCE_STABLE_TIME']:.2f} "
+            f"scales {list(s['TEMPLATE_SCALES'])} offsets {s['LOW_CONTRAST_THRESHOLD_OFFSET']:+.2f}/"
+            f"{s['DARK_THRESHOLD_OFFSET']:+.2f}/{s['BRIGHT_THRESHOLD_OFFSET']:+.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tune detection settings on recorded frame datasets")
+    parser.add_argument('paths', nargs='+', help="dataset directories or folders containing them")
+    parser.add_argument('--labels', help="JSON lines of session/index/label overriding recorded labels")
+    parser.add_argument('--trials', type=int, default=32, help="detection settings to evaluate")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk', type=int, default=CHUNK_FRAMES * 2, help="frames per task")
+    parser.add_argument('--wrong-weight', type=float, default=WRONG_WEIGHT)
+    parser.add_argument('--latency-weight', type=float, default=LATENCY_WEIGHT, help="per second")
+    parser.add_argument('--cpu-weight', type=float, default=CPU_WEIGHT, help="per ms per frame")
+    parser.add_argument('--top', type=int, default=10, help="results to print")
+    parser.add_argument('--out', default='detection_tuning.json', help="profile file")
+    parser.add_argument('--install', action='store_true',
+                        help="write the profile to the data folder, where the bot loads it at startup")
+    parser.add_argument('--report', default='tuning_report.json', help="JSON file with every result")
+    args = parser.parse_args(argv)
+
+    from launcher_template_manager import TemplateManager
+    manager = TemplateManager()
+    if not manager.auto_load_templates():
+        print("Templates (assets/W.png, A.png, S.png, D.png) not found", file=sys.stderr)
+        return 2
+    if not find_datasets(args.paths):
+        print("No datasets found", file=sys.stderr)
+        return 2
+
+    weights = {'wrong_weight': args.wrong_weight, 'latency_weight': args.latency_weight,
+               'cpu_weight': args.cpu_weight}
+    try:
+        report = run_tuning(args.paths, manager.get_templates(), args.trials, args.seed, args.workers,
+                            args.chunk, load_labels(args.labels) if args.labels else None, weights,
+                            progress=print)
+    except ValueError as e:
+        print(f"Cannot tune: {e}", file=sys.stderr)
+        return 2
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    for rank, result in enumerate(report['results'][:args.top], 1):
+        print(f"{rank:>3}. {format_result(result)}")
+    print(f"  baseline {format_result(report['baseline'])}")
+
+    out = data_path(BotConfig.TUNING_PROFILE_FILE) if args.install else args.out
+    write_profile(out, report)
+    print(f"Best setting written to {out} (report: {args.report})")
+    if not args.install:
+        print("The bot does not load it until it is installed (--install or copy it to the data folder)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
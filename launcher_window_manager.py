@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
 # window_manager.py - Window Management
-import win32gui
-import win32ui
-import cv2
-import numpy as np
-from ctypes import windll
+try:
+    import win32gui
+except ImportError:
+    win32gui = None  # Simulator and harnesses import this module off Windows
 from launcher_config import BotConfig
+from launcher_capture_session import CaptureSession
+from launcher_detection_profile import DetectionProfileStore
 import time
 
 class WindowManager:
-    def __init__(self):
+    def __init__(self, capture_api=None):
         self.fivem_window = None
+        self.capture_api = capture_api
+        self.capture_session = None
         
     def find_fivem_window(self):
         """ค้นหาหน้าต่าง FiveM แบบแม่นยำ"""
@@ -31,6 +34,24 @@ class WindowManager:
         
         return False
     
+    def find_fivem_windows(self):
+        """คืน handle ของหน้าต่าง FiveM ที่มองเห็นได้ทั้งหมด"""
+        handles = []
+
+        def callback(hwnd, extra):
+            if win32gui.IsWindowVisible(hwnd) and BotConfig.FIVEM_WINDOW_TITLE in win32gui.GetWindowText(hwnd):
+                rect = win32gui.GetWindowRect(hwnd)
+                if rect[2] - rect[0] > 100 and rect[3] - rect[1] > 100:
+                    handles.append(hwnd)
+            return True
+
+        win32gui.EnumWindows(callback, None)
+        return handles
+    
+    def is_window_alive(self):
+        """หน้าต่างปัจจุบันยังอยู่หรือไม่"""
+        return bool(self.fivem_window) and bool(win32gui.IsWindow(self.fivem_window))
+    
     def capture_fivem_screen(self):
         """จับภาพหน้าจอ FiveM แม้อยู่เบื้องหลัง"""
         if not self.fivem_window:
@@ -38,46 +59,37 @@ class WindowManager:
             return None
             
         try:
-            hwnd = self.fivem_window
-            rect = win32gui.GetWindowRect(hwnd)
-            x, y, x2, y2 = rect
-            width = x2 - x
-            height = y2 - y
-            
-            # Create a memory device context (DC) for the screen capture
-            hwndDC = win32gui.GetWindowDC(hwnd)
-            mfcDC = win32ui.CreateDCFromHandle(hwndDC)
-            saveDC = mfcDC.CreateCompatibleDC()
-            
-            # Create a bitmap to hold the captured image
-            saveBitMap = win32ui.CreateBitmap()
-            saveBitMap.CreateCompatibleBitmap(mfcDC, width, height)
-            saveDC.SelectObject(saveBitMap)
-            
-            # Use PrintWindow to capture the window
-            result = windll.user32.PrintWindow(hwnd, saveDC.GetSafeHdc(), 3)
-            
-            if result == 1:
-                bmpstr = saveBitMap.GetBitmapBits(True)
-                
-                im = np.frombuffer(bmpstr, dtype='uint8')
-                im.shape = (height, width, 4)
-                
-                opencv_image = cv2.cvtColor(im, cv2.COLOR_BGRA2BGR)
-                
-                # Clean up resources
-                win32gui.DeleteObject(saveBitMap.GetHandle())
-                saveDC.DeleteDC()
-                mfcDC.DeleteDC()
-                win32gui.ReleaseDC(hwnd, hwndDC)
-                
+            session = self._get_capture_session()
+            opencv_image = session.capture()
+            if opencv_image is not None:
                 self.last_screenshot = opencv_image
-                return opencv_image
-            else:
-                return None
+            return opencv_image
                 
         except Exception as e:
+            # Drop GDI objects so the next frame starts from a clean context
+            self.release_capture_session()
+            return None
+    
+    def _get_capture_session(self):
+        """คืน capture session ของหน้าต่างปัจจุบัน (สร้างใหม่เมื่อ hwnd เปลี่ยน)"""
+        if self.capture_session is None or self.capture_session.hwnd != self.fivem_window:
+            self.release_capture_session()
+            self.capture_session = CaptureSession(self.fivem_window, api=self.capture_api)
+        return self.capture_session
+    
+    def release_capture_session(self):
+        """คืนทรัพยากร GDI ของ capture session"""
+        if self.capture_session is not None:
+            self.capture_session.close()
+            self.capture_session = None
+    
+    def get_profile_key(self):
+        """คืน key ของ detection profile (ชื่อหน้าต่าง + ขนาด client)"""
+        if not self.fivem_window:
             return None
+        title = win32gui.GetWindowText(self.fivem_window)
+        left, top, right, bottom = win32gui.GetClientRect(self.fivem_window)
+        return DetectionProfileStore.make_key(title, right - left, bottom - top)
     
     def get_window_handle(self):
         """ส่งคืน window handle"""
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# test_bot_core.py - BotCore state machine driven frame by frame on an injected clock
+from concurrent.futures import Future
+
+import pytest
+
+from launcher_bot_core import BotCore, BotState
+from launcher_config import BotConfig
+from launcher_completion_verifier import CompletionVerifier
+
+PROMPT = ['w', 'a', 's', 'd', 'w']
+AREA = (100, 200, 300, 60)
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+class FakeDetector:
+    """Detector whose reads come from `sequence`"""
+
+    def __init__(self, sequence=()):
+        self.sequence = list(sequence)
+        self.key_sequence_area = None
+        self.scale_lock = None
+        self.last_acquisition = None
+        self.last_detections = []
+        self.acquisitions = 0
+
+    def auto_detect_minigame_area(self, screen):
+        self.acquisitions += 1
+        self.key_sequence_area = AREA
+        return True
+
+    def detect_key_sequence(self, screen):
+        return list(self.sequence) if self.key_sequence_area else []
+
+    def get_detection_area(self):
+        return self.key_sequence_area
+
+
+class FakeWorker:
+    """Execution worker whose futures resolve to `result` when `auto_complete` is set"""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.auto_complete = True
+        self.submitted = []
+
+    def submit(self, sequence, hwnd):
+        future = Future()
+        if self.auto_complete:
+            future.set_result(self.result)
+        self.submitted.append((list(sequence), future))
+        return future
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_core(clock, detector, worker):
+    verifier = CompletionVerifier(timeout=1.0, clear_frames=2, max_retries=1)
+    return BotCore(worker, lambda: 1, key_detector=detector, clock=clock, verifier=verifier)
+
+
+def run(core, clock, frames, dt=0.15):
+    """Step `frames` times, advancing the clock by `dt` per frame"""
+    for _ in range(frames):
+        core.step(object(), clock.t)
+        clock.t += dt
+
+
+def test_validation_arms_after_a_verified_execution(clock):
+    detector = FakeDetector(PROMPT)
+    worker = FakeWorker()
+    core = make_core(clock, detector, worker)
+
+    run(core, clock, 2)
+    assert core.state == BotState.EXECUTING
+    assert worker.submitted[0][0] == PROMPT
+
+    run(core, clock, 1)
+    assert core.state == BotState.VERIFYING
+
+    detector.sequence = []
+    run(core, clock, 2)
+    assert core.state == BotState.ARMED
+    assert core.time_to_armed is not None
+    assert [t.target for t in core.machine.history] == [
+        BotState.VALIDATING, BotState.EXECUTING, BotState.VERIFYING, BotState.ARMED]
+
+
+def test_stable_sequence_is_committed_after_the_stability_window(clock):
+    detector = FakeDetector()
+    core = make_core(clock, detector, FakeWorker())
+    detector.key_sequence_area = AREA
+    core._arm(clock.t, "test")
+
+    detector.sequence = PROMPT
+    frames = 0
+    while core.state != BotState.EXECUTING:
+        run(core, clock, 1, dt=0.05)
+        frames += 1
+        assert frames < 50
+    committing = [t for t in core.machine.history if t.source == BotState.COMMITTING]
+    assert committing[-1].dwell >= BotConfig.SEQUENCE_STABLE_TIME
+    assert core.consecutive_same_detections >= BotConfig.MIN_CONSECUTIVE_DETECTIONS
+
+
+def test_changed_sequence_returns_from_committing_to_armed(clock):
+    detector = FakeDetector(PROMPT)
+    core = make_core(clock, detector, FakeWorker())
+    detector.key_sequence_area = AREA
+    core._arm(clock.t, "test")
+
+    while core.state != BotState.COMMITTING:
+        run(core, clock, 1, dt=0.01)
+    detector.sequence = ['a', 'a', 's', 'd', 'd']
+    run(core, clock, 1, dt=0.01)
+    assert core.state == BotState.ARMED
+    assert core.last_sequence_str == 'a a s d d'
+
+
+def test_failed_validation_executions_drop_the_area(clock):
+    detector = FakeDetector(PROMPT)
+    worker = FakeWorker(result=False)
+    core = make_core(clock, detector, worker)
+
+    frames = 0
+    while core.state != BotState.SEARCHING or frames == 0:
+        run(core, clock, 1, dt=0.01)
+        frames += 1
+        assert frames < 100
+
+    assert len(worker.submitted) == core.MAX_VALIDATION_FAILURES
+    assert detector.key_sequence_area is None
+    assert core.machine.history[-1].reason == "validation executions failed"
+
+
+def test_failed_executions_do_not_restart_the_validation_window(clock):
+    detector = FakeDetector(PROMPT)
+    worker = FakeWorker(result=False)
+    core = make_core(clock, detector, worker)
+    core.MAX_VALIDATION_FAILURES = 1000
+
+    run(core, clock, 1)
+    started = core.validation_started_at
+    while core.state in (BotState.VALIDATING, BotState.EXECUTING):
+        run(core, clock, 1)
+        assert clock.t < started + core.AREA_TEST_DURATION + 1.0
+
+    # Enough readings inside the window, so validation passes on time
+    assert core.state == BotState.ARMED
+
+
+def test_stuck_prompt_retries_then_searches_again(clock):
+    detector = FakeDetector(PROMPT)
+    worker = FakeWorker()
+    core = make_core(clock, detector, worker)
+    detector.key_sequence_area = AREA
+    core._submit_execution(PROMPT, ' '.join(PROMPT), clock.t, validation=False)
+
+    frames = 0
+    while core.state != BotState.SEARCHING:
+        run(core, clock, 1, dt=0.25)
+        frames += 1
+        assert frames < 100
+
+    assert len(worker.submitted) == 2
+    assert core.verifier.escalations == 1
+    assert detector.key_sequence_area is None
+
+
+def test_pending_execution_keeps_the_core_executing(clock):
+    detector = FakeDetector(PROMPT)
+    worker = FakeWorker()
+    worker.auto_complete = False
+    core = make_core(clock, detector, worker)
+    detector.key_sequence_area = AREA
+    core._submit_execution(PROMPT, ' '.join(PROMPT), clock.t, validation=False)
+
+    run(core, clock, 5)
+    assert core.state == BotState.EXECUTING
+
+    worker.submitted[0][1].set_result(True)
+    run(core, clock, 1)
+    assert core.state == BotState.VERIFYING
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# test_capture_session.py - CaptureSession and WindowManager against a fake win32 API
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('cv2')
+
+from launcher_capture_session import CaptureSession
+from launcher_window_manager import WindowManager
+
+HWND = 1
+
+
+class FakeBitmap:
+    def __init__(self, api):
+        self.api = api
+        self.size = None
+
+    def CreateCompatibleBitmap(self, dc, width, height):
+        if self.api.fail_bitmap:
+            raise RuntimeError("CreateCompatibleBitmap failed")
+        self.size = (width, height)
+
+    def GetBitmapBits(self, signed):
+        width, height = self.size
+        return bytes(width * height * 4)
+
+    def GetHandle(self):
+        return id(self)
+
+
+class FakeDC:
+    def __init__(self, api):
+        self.api = api
+        api.live_dcs += 1
+
+    def CreateCompatibleDC(self):
+        return FakeDC(self.api)
+
+    def SelectObject(self, obj):
+        pass
+
+    def GetSafeHdc(self):
+        return id(self)
+
+    def DeleteDC(self):
+        self.api.live_dcs -= 1
+
+
+class FakeCaptureApi:
+    """Win32CaptureApi stand-in that counts live GDI objects"""
+
+    def __init__(self, rect=(0, 0, 64, 48)):
+        self.rect = rect
+        self.fail_bitmap = False
+        self.fail_print = False
+        self.window_dcs = 0
+        self.live_dcs = 0
+        self.bitmaps = 0
+
+    @property
+    def live_objects(self):
+        return self.window_dcs + self.live_dcs + self.bitmaps
+
+    def get_window_rect(self, hwnd):
+        return self.rect
+
+    def get_window_dc(self, hwnd):
+        self.window_dcs += 1
+        return 100
+
+    def create_dc_from_handle(self, hdc):
+        return FakeDC(self)
+
+    def create_bitmap(self):
+        self.bitmaps += 1
+        return FakeBitmap(self)
+
+    def print_window(self, hwnd, hdc):
+        if self.fail_print:
+            raise OSError("PrintWindow failed")
+        return 1
+
+    def delete_object(self, handle):
+        self.bitmaps -= 1
+
+    def release_dc(self, hwnd, hdc):
+        self.window_dcs -= 1
+
+
+def test_session_is_reused_until_the_size_changes():
+    api = FakeCaptureApi()
+    session = CaptureSession(HWND, api=api)
+
+    for _ in range(3):
+        frame = session.capture()
+        assert frame.shape == (48, 64, 3)
+    assert session.allocations == 1
+    assert session.frames == 3
+    assert session.frame_allocations == 0
+
+    api.rect = (0, 0, 32, 16)
+    assert session.capture().shape == (16, 32, 3)
+    assert session.allocations == 2
+    assert session.frame_allocations == 1
+    assert api.live_objects == 4
+
+    session.close()
+    session.close()
+    assert api.live_objects == 0
+
+
+def test_failed_allocation_releases_everything():
+    api = FakeCaptureApi()
+    api.fail_bitmap = True
+    session = CaptureSession(HWND, api=api)
+
+    with pytest.raises(RuntimeError):
+        session.capture()
+    assert api.live_objects == 0
+    assert session.size is None
+
+    api.fail_bitmap = False
+    assert session.capture() is not None
+    assert session.allocations == 1
+
+
+def test_window_manager_keeps_one_session_and_drops_it_on_failure():
+    api = FakeCaptureApi()
+    manager = WindowManager(capture_api=api)
+    manager.fivem_window = HWND
+
+    manager.capture_fivem_screen()
+    session = manager.capture_session
+    manager.capture_fivem_screen()
+    assert manager.capture_session is session
+    assert session.allocations == 1
+
+    api.fail_print = True
+    assert manager.capture_fivem_screen() is None
+    assert manager.capture_session is None
+    assert api.live_objects == 0
+
+    api.fail_print = False
+    assert manager.capture_fivem_screen() is not None
+    manager.release_capture_session()
+    assert api.live_objects == 0
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# test_completion_verifier.py - CompletionVerifier outcomes and session summary
+import pytest
+
+from launcher_completion_verifier import (
+    CompletionVerifier, VERIFY_CHANGED, VERIFY_CLEARED, VERIFY_ESCALATE, VERIFY_PENDING, VERIFY_RETRY
+)
+
+PROMPT = 'w a s d w'
+NEXT_PROMPT = 'a a s d d'
+
+
+def make_verifier():
+    return CompletionVerifier(timeout=1.0, clear_frames=2, max_retries=1, baseline_delay=1.5)
+
+
+def test_cleared_after_enough_empty_frames():
+    verifier = make_verifier()
+    verifier.begin(PROMPT, 0.0)
+    verifier.mark_sent(0.1)
+
+    assert verifier.observe(PROMPT, 0.2) == VERIFY_PENDING
+    assert verifier.observe('', 0.3) == VERIFY_PENDING
+    # A flicker of the old prompt restarts the count
+    assert verifier.observe(PROMPT, 0.35) == VERIFY_PENDING
+    assert verifier.observe('', 0.4) == VERIFY_PENDING
+    assert verifier.observe('', 0.5) == VERIFY_CLEARED
+    assert not verifier.active
+    assert verifier.catches == 1
+
+
+def test_clear_before_keys_are_sent_stays_pending():
+    verifier = make_verifier()
+    verifier.begin(PROMPT, 0.0)
+
+    assert verifier.observe('', 0.1) == VERIFY_PENDING
+    assert verifier.observe('', 0.2) == VERIFY_PENDING
+    assert verifier.catches == 0
+
+    verifier.mark_sent(0.25)
+    assert verifier.observe('', 0.3) == VERIFY_CLEARED
+
+
+def test_new_full_prompt_counts_as_changed():
+    verifier = make_verifier()
+    verifier.begin(PROMPT, 0.0)
+    verifier.mark_sent(0.1)
+
+    # A partial read of something else is not a new prompt
+    assert verifier.observe('a a', 0.2) == VERIFY_PENDING
+    assert verifier.observe(NEXT_PROMPT, 0.3) == VERIFY_CHANGED
+
+
+def test_stuck_prompt_retries_then_escalates():
+    verifier = make_verifier()
+    verifier.begin(PROMPT, 0.0)
+    verifier.mark_sent(0.1)
+
+    assert verifier.observe(PROMPT, 1.0) == VERIFY_PENDING
+    assert verifier.observe(PROMPT, 1.1) == VERIFY_RETRY
+
+    verifier.begin(PROMPT, 1.2, retry=True)
+    verifier.mark_sent(1.3)
+    assert verifier.observe(PROMPT, 2.4) == VERIFY_ESCALATE
+    assert (verifier.total_retries, verifier.escalations) == (1, 1)
+
+    # A fresh prompt gets its retries back
+    verifier.begin(NEXT_PROMPT, 3.0)
+    verifier.mark_sent(3.1)
+    assert verifier.observe(NEXT_PROMPT, 4.2) == VERIFY_RETRY
+
+
+def test_cancel_and_inactive_observe():
+    verifier = make_verifier()
+    assert verifier.observe(PROMPT, 0.0) == VERIFY_CLEARED
+
+    verifier.begin(PROMPT, 0.0)
+    verifier.mark_sent(0.1)
+    verifier.cancel()
+    assert verifier.observe(PROMPT, 5.0) == VERIFY_CLEARED
+    assert verifier.catches == 0
+
+
+def test_summary_reports_rate_and_time_saved():
+    verifier = make_verifier()
+    for i in range(3):
+        start = 10.0 * i
+        verifier.begin(PROMPT, start)
+        verifier.mark_sent(start + 0.1)
+        verifier.observe('', start + 0.3)
+        assert verifier.observe('', start + 0.5) == VERIFY_CLEARED
+
+    summary = verifier.summary(36.0)
+    assert summary['catches'] == 3
+    assert summary['catches_per_hour'] == pytest.approx(300.0)
+    assert summary['mean_verify_time'] == pytest.approx(0.4)
+    assert summary['saved_per_catch'] == pytest.approx(1.1)
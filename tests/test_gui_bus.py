@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# test_gui_bus.py - GuiUpdateBus coalescing and drop policy
+from launcher_gui_bus import GuiUpdateBus
+
+
+def test_coalesced_kinds_keep_one_slot_with_the_newest_args():
+    bus = GuiUpdateBus()
+    bus.post('status', 'searching')
+    bus.post('log', 'first')
+    bus.post('status', 'armed')
+    bus.post('stats', {'fps': 5})
+    bus.post('status', 'executing')
+
+    # The status slot keeps its place in the queue but carries the newest value
+    assert bus.drain() == [('status', ('executing',)), ('log', ('first',)), ('stats', ({'fps': 5},))]
+    assert bus.stats() == {'posted': 5, 'coalesced': 2, 'dropped': 0, 'pending': 0}
+
+    bus.post('status', 'armed')
+    assert bus.drain() == [('status', ('armed',))]
+
+
+def test_full_queue_drops_the_oldest_event():
+    bus = GuiUpdateBus(maxsize=3)
+    for i in range(5):
+        bus.post('log', i)
+
+    assert bus.drain() == [('log', (2,)), ('log', (3,)), ('log', (4,))]
+    assert bus.stats()['dropped'] == 2
+
+
+def test_dropped_coalesced_slot_is_released():
+    bus = GuiUpdateBus(maxsize=2)
+    bus.post('status', 'old')
+    bus.post('log', 'a')
+    bus.post('log', 'b')        # Drops the status slot
+
+    # A new status is queued again instead of updating a slot that is gone
+    bus.post('status', 'new')
+    assert bus.drain() == [('log', ('b',)), ('status', ('new',))]
+    assert bus.stats()['dropped'] == 2
+
+
+def test_drain_respects_the_batch_limit_and_order():
+    bus = GuiUpdateBus()
+    for i in range(10):
+        bus.post('log', i)
+
+    assert [args for _, args in bus.drain(limit=4)] == [(0,), (1,), (2,), (3,)]
+    assert [args for _, args in bus.drain()] == [(i,) for i in range(4, 10)]
+    assert bus.drain() == []
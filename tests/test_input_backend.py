@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# test_input_backend.py - KeyPlan compilation and native call counts of the input backends
+import pytest
+
+from launcher_input_backend import RecordingBackend, SendInputBackend
+
+KEYS = ['w', 'a', 's', 'd', 'w']
+
+
+class FakeUser32:
+    """user32 stand-in recording every SendInput call"""
+
+    def __init__(self, fail_calls=()):
+        self.calls = []
+        self.fail_calls = set(fail_calls)
+
+    def SendInput(self, count, inputs, size):
+        index = len(self.calls)
+        self.calls.append([(inputs[i].union.ki.wScan, bool(inputs[i].union.ki.dwFlags & 0x0002))
+                           for i in range(count)])
+        return 0 if index in self.fail_calls else count
+
+
+def test_compile_caches_plans_and_skips_unknown_keys():
+    backend = RecordingBackend()
+
+    plan = backend.compile(['W', 'x', 'A'])
+
+    assert backend.compile(['w', 'X', 'a']) is plan
+    assert [(key, down) for key, _, _, down in plan.events] == [
+        ('w', True), ('w', False), ('a', True), ('a', False)]
+    assert len(plan) == 4
+
+
+def test_batch_phases_without_hold_is_a_single_call():
+    backend = RecordingBackend(batched=True)
+    plan = backend.compile(KEYS)
+
+    assert len(plan.payload) == 1
+    assert backend.submit(plan, hwnd=1) == len(KEYS)
+    assert backend.calls == 1
+
+
+def test_batch_phases_with_hold_split_after_every_press():
+    backend = RecordingBackend(batched=True, hold_time=0.01, sleep=lambda seconds: None)
+    plan = backend.compile(['w', 'a'])
+
+    phases = [[(key, down) for key, _, _, down in phase] for phase in plan.payload]
+    assert phases == [[('w', True)], [('w', False), ('a', True)], [('a', False)]]
+
+
+@pytest.mark.parametrize('hold_time', [0.0, 0.01])
+def test_recording_backend_counts_the_same_calls_as_sendinput(hold_time):
+    sleeps = []
+    user32 = FakeUser32()
+    native = SendInputBackend(batched=True, user32=user32, hold_time=hold_time, sleep=sleeps.append)
+    recording = RecordingBackend(batched=True, hold_time=hold_time, sleep=sleeps.append)
+
+    assert native.submit(native.compile(KEYS), hwnd=1) == len(KEYS)
+    assert recording.submit(recording.compile(KEYS), hwnd=1) == len(KEYS)
+
+    expected = 1 if hold_time == 0 else len(KEYS) + 1
+    assert len(user32.calls) == recording.calls == expected
+    # Holds only between calls, the same number for both backends
+    assert sleeps == [hold_time] * (2 * (expected - 1))
+    # Every transition goes out exactly once, in order
+    sent = [up for call in user32.calls for _, up in call]
+    assert sent == [False, True] * len(KEYS)
+
+
+def test_sendinput_counts_keys_whose_release_was_inserted():
+    # Call 1 carries the release of 'w' and the press of 'a'
+    user32 = FakeUser32(fail_calls={1})
+    backend = SendInputBackend(batched=True, user32=user32, hold_time=0.01, sleep=lambda seconds: None)
+
+    assert backend.submit(backend.compile(['w', 'a']), hwnd=1) == 1
+
+
+def test_scheduled_modes_make_one_call_per_transition():
+    user32 = FakeUser32()
+    native = SendInputBackend(batched=False, user32=user32)
+    recording = RecordingBackend()
+
+    assert native.compile(KEYS).payload is None
+    assert native.submit(native.compile(KEYS), hwnd=1) == len(KEYS)
+    assert recording.submit(recording.compile(KEYS), hwnd=1) == len(KEYS)
+    assert len(user32.calls) == recording.calls == 2 * len(KEYS)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# test_key_scheduler.py - KeyScheduler timeline planning and replay on a virtual clock
+import pytest
+
+from launcher_input_backend import RecordingBackend
+from launcher_key_scheduler import JitterModel, KeyScheduler
+
+
+class VirtualClock:
+    """Clock whose sleep() advances time instantly"""
+
+    def __init__(self):
+        self.t = 0.0
+        self.sleeps = []
+
+    def now(self):
+        return self.t
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.t += max(0.0, seconds)
+
+
+def make_scheduler(clock, **kwargs):
+    kwargs.setdefault('hold_time', 0.01)
+    kwargs.setdefault('gap', 0.01)
+    kwargs.setdefault('tail', 0.1)
+    return KeyScheduler(jitter=JitterModel(0.02, 0.02), clock=clock.now, sleep=clock.sleep,
+                        spin_threshold=0, **kwargs)
+
+
+def test_plan_builds_one_timeline_with_hold_jitter_and_gap():
+    scheduler = make_scheduler(VirtualClock())
+
+    events, duration = scheduler.plan(['w', 'a', 's'])
+
+    assert [(e.key, e.is_down) for e in events] == [
+        ('w', True), ('w', False), ('a', True), ('a', False), ('s', True), ('s', False)]
+    # Press, hold 10ms, release, jitter 20ms + gap 10ms before the next key
+    assert [e.at for e in events] == pytest.approx([0.0, 0.01, 0.04, 0.05, 0.08, 0.09])
+    # No gap after the last key, then the tail
+    assert duration == pytest.approx(0.09 + 0.02 + 0.1)
+
+
+def test_run_fires_every_event_on_its_deadline():
+    clock = VirtualClock()
+    scheduler = make_scheduler(clock)
+    backend = RecordingBackend(clock=clock.now)
+
+    report = scheduler.execute(['w', 'a', 's'], backend, hwnd=7)
+
+    assert report.planned == pytest.approx([0.0, 0.01, 0.04, 0.05, 0.08, 0.09])
+    assert report.actual == pytest.approx(report.planned)
+    assert report.mean_abs_error == pytest.approx(0.0)
+    assert report.max_abs_error == pytest.approx(0.0)
+    assert report.actual_duration == pytest.approx(report.planned_duration)
+    assert report.keys_sent == 3
+    assert [(t, key, down) for t, _, key, down in backend.events] == [
+        (pytest.approx(at), key, down)
+        for at, (key, down) in zip(report.planned, [('w', True), ('w', False), ('a', True),
+                                                    ('a', False), ('s', True), ('s', False)])]
+
+
+def test_late_events_are_reported_as_timing_error():
+    clock = VirtualClock()
+    scheduler = make_scheduler(clock)
+
+    class SlowSink(RecordingBackend):
+        def key_down(self, hwnd, key):
+            clock.t += 0.015    # Each press takes 15ms to go out, longer than the hold
+            return super().key_down(hwnd, key)
+
+    report = scheduler.execute(['w', 'a'], SlowSink(clock=clock.now), hwnd=None)
+
+    # Releases fire after the slow press, so they are 5ms late
+    assert report.errors == pytest.approx([0.0, 0.005, 0.0, 0.005])
+    assert report.mean_abs_error == pytest.approx(0.0025)
+    assert report.max_abs_error == pytest.approx(0.005)
+
+
+def test_keys_sent_counts_only_complete_presses():
+    clock = VirtualClock()
+    scheduler = make_scheduler(clock)
+
+    class DroppingSink(RecordingBackend):
+        def key_up(self, hwnd, key):
+            super().key_up(hwnd, key)
+            return key != 'a'
+
+    report = scheduler.execute(['w', 'a', 's'], DroppingSink(clock=clock.now), hwnd=None)
+
+    assert report.results == [True, True, True, False, True, True]
+    assert report.keys_sent == 2